@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AnalysisJob
+from .models import AnalysisJob, AnalysisEvent, PageOCRResult, ExtractionCache, SyllabusCache, SubjectClusterModel
 
 
 @admin.register(AnalysisJob)
@@ -7,3 +7,33 @@ class AnalysisJobAdmin(admin.ModelAdmin):
     list_display = ('paper', 'status', 'progress', 'questions_extracted', 'created_at')
     list_filter = ('status',)
     search_fields = ('paper__title',)
+
+
+@admin.register(AnalysisEvent)
+class AnalysisEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job', 'status', 'progress', 'created_at')
+    list_filter = ('status',)
+
+
+@admin.register(PageOCRResult)
+class PageOCRResultAdmin(admin.ModelAdmin):
+    list_display = ('file_hash', 'page_number', 'language', 'dpi', 'created_at')
+    search_fields = ('file_hash',)
+
+
+@admin.register(ExtractionCache)
+class ExtractionCacheAdmin(admin.ModelAdmin):
+    list_display = ('file_hash', 'extractor_version', 'page_count', 'hits', 'created_at')
+    list_filter = ('extractor_version',)
+    search_fields = ('file_hash',)
+
+
+@admin.register(SyllabusCache)
+class SyllabusCacheAdmin(admin.ModelAdmin):
+    list_display = ('file_hash', 'embedding_model', 'created_at')
+    search_fields = ('file_hash',)
+
+
+@admin.register(SubjectClusterModel)
+class SubjectClusterModelAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'n_clusters', 'dimensions', 'samples_seen', 'updated_at')
@@ -5,3 +5,12 @@ class AnalysisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.analysis'
     verbose_name = 'Analysis'
+    
+    def ready(self):
+        # Build the analysis pipeline once per Django-Q worker process
+        try:
+            from django_q.signals import post_spawn
+            from .registry import warm_up
+            post_spawn.connect(warm_up, dispatch_uid='analysis_pipeline_warm_up')
+        except ImportError:
+            pass
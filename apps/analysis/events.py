@@ -0,0 +1,176 @@
+"""
+Analysis progress events and the server-sent events stream built on them.
+
+The pipeline runs inside Django-Q workers, so events are persisted rather
+than kept in process memory. A single stream connection covers all of a
+subject's jobs, replacing per-job polling: while events arrive each tick
+is one indexed query, and idle ticks add a check for papers still active.
+"""
+import json
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.papers.models import Paper
+from .models import AnalysisEvent, AnalysisJob
+
+logger = logging.getLogger(__name__)
+
+# Stream tuning (seconds unless noted)
+STREAM_POLL_INTERVAL = getattr(settings, 'ANALYSIS_STREAM_POLL_INTERVAL', 1.0)
+STREAM_MAX_DURATION = getattr(settings, 'ANALYSIS_STREAM_MAX_DURATION', 25)
+STREAM_HEARTBEAT = getattr(settings, 'ANALYSIS_STREAM_HEARTBEAT', 10)
+STREAM_RETRY_MS = getattr(settings, 'ANALYSIS_STREAM_RETRY_MS', 3000)
+STREAM_BATCH_SIZE = 100
+
+# How long the final event of a finished job is kept for resuming clients
+EVENT_RETENTION = getattr(settings, 'ANALYSIS_EVENT_RETENTION', 3600)
+
+TERMINAL_STATUSES = (AnalysisJob.Status.COMPLETED, AnalysisJob.Status.FAILED)
+ACTIVE_PAPER_STATUSES = (Paper.ProcessingStatus.PENDING, Paper.ProcessingStatus.PROCESSING)
+
+
+def job_payload(job: AnalysisJob) -> Dict[str, Any]:
+    """Serialize the client-facing state of a job."""
+    return {
+        'job_id': str(job.id),
+        'paper_id': str(job.paper_id),
+        'paper_title': job.paper.title,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'progress': job.progress,
+        'questions_extracted': job.questions_extracted,
+        'questions_classified': job.questions_classified,
+        'duplicates_found': job.duplicates_found,
+        'error_message': job.error_message,
+    }
+
+
+def publish_job_event(job: AnalysisJob) -> Optional[AnalysisEvent]:
+    """
+    Record the current state of a job as an event.
+    Failures are logged and swallowed - progress reporting must never
+    break the analysis itself.
+    """
+    try:
+        event = AnalysisEvent.objects.create(
+            subject_id=job.paper.subject_id,
+            job=job,
+            status=job.status,
+            progress=job.progress,
+            payload=job_payload(job),
+        )
+        if job.is_finished:
+            prune_events(job, event)
+        return event
+    except Exception as e:
+        logger.warning(f"Could not publish progress event for job {job.id}: {e}")
+        return None
+
+
+def prune_events(job: AnalysisJob, final_event: AnalysisEvent) -> None:
+    """
+    Drop the progress events a finished job's final event supersedes,
+    and events of any job older than EVENT_RETENTION.
+    """
+    job.events.filter(id__lt=final_event.id).delete()
+    cutoff = timezone.now() - timedelta(seconds=EVENT_RETENTION)
+    AnalysisEvent.objects.filter(created_at__lt=cutoff).delete()
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format a single server-sent event frame."""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def _has_active_papers(subject) -> bool:
+    """Whether any paper of the subject is still waiting for or under analysis."""
+    return Paper.objects.filter(
+        subject=subject,
+        status__in=ACTIVE_PAPER_STATUSES
+    ).exists()
+
+
+def stream_subject_events(
+    subject,
+    last_event_id: Optional[int] = None,
+    poll_interval: float = STREAM_POLL_INTERVAL,
+    max_duration: float = STREAM_MAX_DURATION,
+    heartbeat: float = STREAM_HEARTBEAT,
+) -> Iterator[str]:
+    """
+    Yield SSE frames for every progress change of the subject's jobs.
+
+    A fresh connection first receives a snapshot of the active jobs; a
+    resumed one (Last-Event-ID) replays only the events it missed. The
+    stream ends with a ``done`` event once no paper is pending, or after
+    ``max_duration`` so the browser reconnects and resumes; a stream holds
+    a server worker for at most that long.
+
+    Each tick reads new events in one query; only a tick that finds none
+    also checks whether any paper is still active.
+    """
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+    if last_event_id is None:
+        last_event_id = AnalysisEvent.objects.filter(
+            subject=subject
+        ).aggregate(last=Max('id'))['last'] or 0
+
+        active_jobs = AnalysisJob.objects.filter(
+            paper__subject=subject
+        ).exclude(status__in=TERMINAL_STATUSES).select_related('paper')
+        for job in active_jobs:
+            yield format_sse('progress', job_payload(job), event_id=last_event_id)
+
+    started = time.monotonic()
+    last_sent = started
+
+    def new_events():
+        return list(
+            AnalysisEvent.objects.filter(
+                subject=subject,
+                id__gt=last_event_id
+            ).order_by('id')[:STREAM_BATCH_SIZE]
+        )
+
+    while time.monotonic() - started < max_duration:
+        events = new_events()
+        if not events and not _has_active_papers(subject):
+            # The pipeline publishes a job's final event before marking its
+            # paper finished, so any final event that landed since the read
+            # above is visible now
+            events = new_events()
+            active = False
+        else:
+            active = True
+
+        for event in events:
+            last_event_id = event.id
+            yield format_sse('progress', event.payload, event_id=event.id)
+
+        if len(events) == STREAM_BATCH_SIZE:
+            # More backlog waiting - drain it before sleeping
+            continue
+
+        now = time.monotonic()
+        if not active:
+            yield format_sse('done', {'subject_id': str(subject.pk)}, event_id=last_event_id)
+            return
+        elif events:
+            last_sent = now
+        elif now - last_sent >= heartbeat:
+            yield ": keep-alive\n\n"
+            last_sent = now
+
+        time.sleep(poll_interval)
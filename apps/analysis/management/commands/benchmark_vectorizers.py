@@ -0,0 +1,76 @@
+"""
+Management command comparing the hashing-vectorizer fallback with the
+sentence-transformers embeddings used by AIClassifier.
+Usage: python manage.py benchmark_vectorizers [--subject <uuid>] [--limit 2000]
+"""
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.questions.models import Question
+from apps.analysis.services.embedder import EmbeddingService, HashingEmbedder
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the hashing fallback against transformer embeddings (speed and agreement)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subject', help='Only use questions of this subject')
+        parser.add_argument('--limit', type=int, default=2000, help='Maximum number of questions')
+        parser.add_argument('--clusters', type=int, default=5, help='Number of clusters to compare')
+
+    def handle(self, *args, **options):
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import adjusted_rand_score
+
+        questions = Question.objects.all()
+        if options['subject']:
+            questions = questions.filter(subject_id=options['subject'])
+        texts = list(questions.values_list('text', flat=True)[:options['limit']])
+
+        n_clusters = options['clusters']
+        if len(texts) < n_clusters:
+            raise CommandError(f'Need at least {n_clusters} questions, found {len(texts)}')
+
+        self.stdout.write(f'Benchmarking on {len(texts)} questions')
+
+        hashed, hashing_seconds = self._time(HashingEmbedder().encode, texts)
+        self._report('hashing', len(texts), hashing_seconds, hashed.shape[1])
+        hashed_labels = KMeans(n_clusters=n_clusters, random_state=42, n_init=3).fit_predict(hashed)
+
+        if not EmbeddingService.is_available():
+            self.stdout.write(self.style.WARNING('sentence-transformers not installed - agreement not measured'))
+            return
+
+        service = EmbeddingService()
+        _, load_seconds = self._time(service._load_model)
+        embedded, model_seconds = self._time(service.encode, texts)
+        self.stdout.write(f'transformer model load: {load_seconds:.2f}s')
+        self._report('transformer', len(texts), model_seconds, embedded.shape[1])
+        model_labels = KMeans(n_clusters=n_clusters, random_state=42, n_init=3).fit_predict(embedded)
+
+        # Nearest-neighbour agreement: does each question's most similar
+        # other question stay the same under both representations?
+        hashed_nn = self._nearest_neighbours((hashed @ hashed.T).toarray())
+        normed = embedded / np.maximum(np.linalg.norm(embedded, axis=1, keepdims=True), 1e-12)
+        model_nn = self._nearest_neighbours(normed @ normed.T)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'speed-up: {model_seconds / max(hashing_seconds, 1e-9):.1f}x, '
+            f'cluster agreement (ARI): {adjusted_rand_score(model_labels, hashed_labels):.3f}, '
+            f'nearest-neighbour agreement: {np.mean(hashed_nn == model_nn):.1%}'
+        ))
+
+    def _time(self, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - started
+
+    def _report(self, name, count, seconds, dimensions):
+        rate = count / seconds if seconds else float('inf')
+        self.stdout.write(f'{name}: {seconds:.3f}s ({rate:,.0f} questions/s, {dimensions} dims)')
+
+    def _nearest_neighbours(self, similarities):
+        np.fill_diagonal(similarities, -np.inf)
+        return similarities.argmax(axis=1)
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0002_initial"),
+        ("subjects", "0004_add_university_type_and_public_access"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnalysisEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("extracting", "Extracting Questions"),
+                            ("classifying", "Classifying"),
+                            ("embedding", "Generating Embeddings"),
+                            ("detecting", "Detecting Duplicates"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("progress", models.PositiveIntegerField(default=0)),
+                ("payload", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="analysis.analysisjob",
+                    ),
+                ),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="analysis_events",
+                        to="subjects.subject",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Analysis Event",
+                "verbose_name_plural": "Analysis Events",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["subject", "id"], name="analysis_an_subject_cde29d_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:02
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0003_analysisevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageOCRResult",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("file_hash", models.CharField(max_length=64)),
+                ("page_number", models.PositiveIntegerField()),
+                ("language", models.CharField(default="eng", max_length=32)),
+                ("dpi", models.PositiveIntegerField()),
+                ("text", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Page OCR Result",
+                "verbose_name_plural": "Page OCR Results",
+                "ordering": ["file_hash", "page_number"],
+                "unique_together": {("file_hash", "page_number", "language")},
+            },
+        ),
+    ]
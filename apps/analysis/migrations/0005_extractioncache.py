@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:03
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0004_pageocrresult"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExtractionCache",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("file_hash", models.CharField(max_length=64)),
+                ("extractor_version", models.CharField(max_length=32)),
+                ("page_count", models.PositiveIntegerField(default=0)),
+                ("page_texts", models.JSONField(blank=True, default=list)),
+                ("blocks", models.JSONField(blank=True, default=list)),
+                ("questions", models.JSONField(blank=True, default=list)),
+                ("ocr_pages", models.JSONField(blank=True, default=list)),
+                ("hits", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Extraction Cache",
+                "verbose_name_plural": "Extraction Cache",
+                "ordering": ["-created_at"],
+                "unique_together": {("file_hash", "extractor_version")},
+            },
+        ),
+    ]
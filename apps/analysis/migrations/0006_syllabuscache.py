@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:07
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0005_extractioncache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyllabusCache",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("file_hash", models.CharField(max_length=64, unique=True)),
+                ("text", models.TextField(blank=True)),
+                ("units", models.JSONField(blank=True, default=list)),
+                ("embedding_model", models.CharField(blank=True, max_length=100)),
+                ("embeddings", models.JSONField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Syllabus Cache",
+                "verbose_name_plural": "Syllabus Cache",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:09
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0006_syllabuscache"),
+        ("subjects", "0005_module_syllabus_unit"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubjectClusterModel",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("n_clusters", models.PositiveIntegerField()),
+                ("dimensions", models.PositiveIntegerField()),
+                ("centroids", models.JSONField(default=list)),
+                ("state", models.BinaryField(blank=True, null=True)),
+                ("samples_seen", models.PositiveIntegerField(default=0)),
+                (
+                    "subject",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cluster_model",
+                        to="subjects.subject",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Subject Cluster Model",
+                "verbose_name_plural": "Subject Cluster Models",
+            },
+        ),
+    ]
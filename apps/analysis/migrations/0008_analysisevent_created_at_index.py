@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0007_subjectclustermodel"),
+        ("subjects", "0006_subject_data_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="analysisevent",
+            index=models.Index(
+                fields=["created_at"], name="analysis_an_created_b06813_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def clear_syllabus_cache(apps, schema_editor):
+    # Units parsed before unit headers were anchored to line starts may
+    # include spurious modules; they are parsed again on next ingest
+    apps.get_model("analysis", "SyllabusCache").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0008_analysisevent_created_at_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_syllabus_cache, migrations.RunPython.noop),
+    ]
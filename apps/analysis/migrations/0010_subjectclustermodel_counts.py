@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analysis", "0009_reparse_syllabus_units"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="subjectclustermodel",
+            name="state",
+        ),
+        migrations.AddField(
+            model_name="subjectclustermodel",
+            name="counts",
+            field=models.JSONField(
+                default=list, help_text="Samples assigned to each centroid"
+            ),
+        ),
+    ]
@@ -43,3 +43,156 @@ class AnalysisJob(BaseModel):
     
     def __str__(self):
         return f"Analysis: {self.paper.title} ({self.get_status_display()})"
+    
+    @property
+    def is_finished(self):
+        """Whether the job has reached a terminal state."""
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+    
+    def update_progress(self, status=None, progress=None, **fields):
+        """
+        Save a status/progress change and publish it as an AnalysisEvent
+        so SSE listeners see it without polling this row.
+        """
+        if status is not None:
+            self.status = status
+        if progress is not None:
+            self.progress = progress
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.save()
+        
+        from .events import publish_job_event
+        publish_job_event(self)
+
+
+class AnalysisEvent(models.Model):
+    """
+    Progress event emitted by the analysis pipeline.
+    The sequential id doubles as the SSE event id, so clients can
+    resume a stream with Last-Event-ID.
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    subject = models.ForeignKey(
+        'subjects.Subject',
+        on_delete=models.CASCADE,
+        related_name='analysis_events'
+    )
+    job = models.ForeignKey(
+        AnalysisJob,
+        on_delete=models.CASCADE,
+        related_name='events'
+    )
+    status = models.CharField(max_length=20, choices=AnalysisJob.Status.choices)
+    progress = models.PositiveIntegerField(default=0)
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Analysis Event'
+        verbose_name_plural = 'Analysis Events'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['subject', 'id']),
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Event {self.id}: {self.job_id} {self.status} {self.progress}%"
+
+
+class PageOCRResult(BaseModel):
+    """
+    OCR text of one page of a PDF, keyed by file content hash so the same
+    scan is never OCRed twice, whichever paper it was uploaded as.
+    """
+    
+    file_hash = models.CharField(max_length=64)
+    page_number = models.PositiveIntegerField()
+    language = models.CharField(max_length=32, default='eng')
+    dpi = models.PositiveIntegerField()
+    text = models.TextField(blank=True)
+    
+    class Meta:
+        verbose_name = 'Page OCR Result'
+        verbose_name_plural = 'Page OCR Results'
+        ordering = ['file_hash', 'page_number']
+        unique_together = ['file_hash', 'page_number', 'language']
+    
+    def __str__(self):
+        return f"OCR {self.file_hash[:12]} p{self.page_number} ({self.dpi} dpi)"
+
+
+class ExtractionCache(BaseModel):
+    """
+    Content-addressed extraction results shared by every upload of the same
+    file, whichever subject or user it belongs to. Questions are stored
+    without their image data, which is taken from the PDF on reuse.
+    """
+    
+    file_hash = models.CharField(max_length=64)
+    extractor_version = models.CharField(max_length=32)
+    page_count = models.PositiveIntegerField(default=0)
+    page_texts = models.JSONField(default=list, blank=True)
+    blocks = models.JSONField(default=list, blank=True)
+    questions = models.JSONField(default=list, blank=True)
+    ocr_pages = models.JSONField(default=list, blank=True)
+    hits = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Extraction Cache'
+        verbose_name_plural = 'Extraction Cache'
+        ordering = ['-created_at']
+        unique_together = ['file_hash', 'extractor_version']
+    
+    def __str__(self):
+        return f"Extraction {self.file_hash[:12]} ({self.extractor_version})"
+
+
+class SyllabusCache(BaseModel):
+    """
+    Parsed syllabus units and their embeddings, keyed by file content hash
+    so a syllabus shared by many subjects is parsed and embedded once.
+    """
+    
+    file_hash = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    units = models.JSONField(default=list, blank=True)
+    embedding_model = models.CharField(max_length=100, blank=True)
+    embeddings = models.JSONField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Syllabus Cache'
+        verbose_name_plural = 'Syllabus Cache'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Syllabus {self.file_hash[:12]} ({len(self.units)} units)"
+
+
+class SubjectClusterModel(BaseModel):
+    """
+    Persistent question clustering model of a subject.
+    Centroids and per-cluster sample counts are kept as JSON: enough for
+    nearest-centroid assignment and for updating the centroids with each
+    new paper's questions.
+    """
+    
+    subject = models.OneToOneField(
+        'subjects.Subject',
+        on_delete=models.CASCADE,
+        related_name='cluster_model'
+    )
+    n_clusters = models.PositiveIntegerField()
+    dimensions = models.PositiveIntegerField()
+    centroids = models.JSONField(default=list)
+    counts = models.JSONField(default=list, help_text='Samples assigned to each centroid')
+    samples_seen = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Subject Cluster Model'
+        verbose_name_plural = 'Subject Cluster Models'
+    
+    def __str__(self):
+        return f"Clusters for {self.subject} (k={self.n_clusters}, n={self.samples_seen})"
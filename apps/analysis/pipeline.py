@@ -2,15 +2,21 @@
 Enhanced analysis pipeline with dual classification system.
 """
 import logging
-from typing import Optional
+import re
+from bisect import bisect_right
+from typing import Optional, List, Dict, Any, Tuple
+from django.db.models import F
 from django.utils import timezone
-from django.conf import settings
 
+from apps.analytics.snapshot import safe_refresh_snapshot
+from apps.analytics.versioning import batch_version_bumps, bump_data_version
 from apps.papers.models import Paper
 from apps.questions.models import Question
-from .models import AnalysisJob
-from .services.pymupdf_extractor import PyMuPDFExtractor
+from apps.rules.stage import RuleStage
+from .models import AnalysisJob, ExtractionCache
+from .services.pymupdf_extractor import PyMuPDFExtractor, EXTRACTOR_VERSION, open_pdf
 from .services.extractor import QuestionExtractor
+from .services.ocr import OCREngine
 from .services.classifier import ModuleClassifier
 from .services.ai_classifier import AIClassifier
 from .services.embedder import EmbeddingService
@@ -32,6 +38,7 @@ class AnalysisPipeline:
         # Extractors
         self.pymupdf_extractor = PyMuPDFExtractor()  # Primary extractor
         self.fallback_extractor = QuestionExtractor()  # Fallback
+        self.ocr_engine = OCREngine()  # Scanned pages
         
         # Services
         self.embedder = EmbeddingService()
@@ -42,23 +49,32 @@ class AnalysisPipeline:
         # Classifiers
         self.module_classifier = ModuleClassifier(llm_client)  # For KTU
         self.ai_classifier = AIClassifier(llm_client, self.embedder)  # For Others
+        self.rule_stage = RuleStage()  # User-defined rules, applied last
         
         self.llm_client = llm_client
     
-    def analyze_paper(self, paper: Paper) -> AnalysisJob:
+    def analyze_paper(
+        self,
+        paper: Paper,
+        job: Optional[AnalysisJob] = None,
+        detect_duplicates: bool = True
+    ) -> AnalysisJob:
         """
         Run complete analysis on a paper with dual classification support.
         
         Args:
             paper: Paper instance to analyze
+            job: Existing queued job to report progress on (created if None)
+            detect_duplicates: Run subject-wide duplicate detection afterwards.
+                Batch runs disable this and do a single pass at the end.
             
         Returns:
             AnalysisJob with results
         """
         # Create analysis job
-        job = AnalysisJob.objects.create(paper=paper)
-        job.started_at = timezone.now()
-        job.save()
+        if job is None:
+            job = AnalysisJob.objects.create(paper=paper)
+        job.update_progress(started_at=timezone.now())
         
         try:
             subject = paper.subject
@@ -67,41 +83,20 @@ class AnalysisPipeline:
             logger.info(f"Starting analysis for {paper.title} - University: {subject.university_type if hasattr(subject, 'university_type') else 'KTU'}")
             
             # Step 1: Extract text, images, and questions using PyMuPDF
-            job.status = AnalysisJob.Status.EXTRACTING
-            job.progress = 10
-            job.save()
+            job.update_progress(AnalysisJob.Status.EXTRACTING, 10)
             
-            try:
-                questions_data, images = self.pymupdf_extractor.extract_questions_with_images(
-                    paper.file.path
-                )
-                
-                # Store extracted text
-                paper.raw_text = self.pymupdf_extractor.extract_text(paper.file.path)
-                paper.page_count = self.pymupdf_extractor.get_page_count(paper.file.path)
-                paper.save()
-                
-                logger.info(f"PyMuPDF: Extracted {len(questions_data)} questions and {len(images)} images")
-                
-            except Exception as e:
-                logger.error(f"PyMuPDF extraction failed, using fallback: {e}")
-                
-                # Fallback to pdfplumber
-                text = self.fallback_extractor.extract_text(paper.file.path)
-                paper.raw_text = text
-                paper.page_count = self.fallback_extractor.get_page_count(paper.file.path)
-                paper.save()
-                
-                questions_data = self.fallback_extractor.extract_questions(text)
-                images = []
+            questions_data, page_texts = self._extract_paper(paper)
+            
+            if page_texts is not None:
+                # Text is stored per page only; raw_text is no longer written
+                paper.page_count = len(page_texts)
+                paper.save(update_fields=['page_count', 'updated_at'])
+                paper.save_pages(page_texts)
             
-            job.questions_extracted = len(questions_data)
-            job.progress = 30
-            job.save()
+            job.update_progress(progress=30, questions_extracted=len(questions_data))
             
             # Step 2: Classify questions based on university type
-            job.status = AnalysisJob.Status.CLASSIFYING
-            job.save()
+            job.update_progress(AnalysisJob.Status.CLASSIFYING)
             
             modules = list(subject.modules.all())
             
@@ -117,53 +112,65 @@ class AnalysisPipeline:
                     questions_data, subject, syllabus_text
                 )
             
-            job.progress = 60
-            job.save()
+            # User rules override the automatic classification
+            self.rule_stage.apply(subject, classified_questions)
             
             # Step 3: Create question objects in database
-            job.status = AnalysisJob.Status.ANALYZING
-            job.save()
+            job.update_progress(progress=60, questions_classified=len(classified_questions))
             
             created_questions = []
-            for q_data in classified_questions:
-                # Find module
-                module = None
-                if 'module_number' in q_data:
-                    module = next(
-                        (m for m in modules if m.number == q_data['module_number']), 
-                        None
+            with batch_version_bumps():
+                for q_data in classified_questions:
+                    # Find module
+                    module = None
+                    if 'module_number' in q_data:
+                        module = next(
+                            (m for m in modules if m.number == q_data['module_number']), 
+                            None
+                        )
+                
+                    # Create question
+                    question = Question.objects.create(
+                        paper=paper,
+                        subject_id=paper.subject_id,
+                        question_number=q_data.get('question_number', ''),
+                        text=q_data['text'],
+                        marks=q_data.get('marks'),
+                        part=q_data.get('part', ''),
+                        module=module,
+                        images=q_data.get('images', []),
+                        question_type=q_data.get('question_type', ''),
+                        difficulty=q_data.get('difficulty', ''),
+                        bloom_level=q_data.get('bloom_level', ''),
+                        topics=q_data.get('topics', []),
+                        keywords=q_data.get('keywords', []),
+                        embedding=q_data.get('embedding')
                     )
                 
-                # Create question
-                question = Question.objects.create(
-                    paper=paper,
-                    question_number=q_data.get('question_number', ''),
-                    text=q_data['text'],
-                    marks=q_data.get('marks'),
-                    part=q_data.get('part', ''),
-                    module=module,
-                    images=q_data.get('images', []),
-                    question_type=q_data.get('question_type', ''),
-                    difficulty=q_data.get('difficulty', ''),
-                    bloom_level=q_data.get('bloom_level', ''),
-                    embedding=q_data.get('embedding')
+                    created_questions.append(question)
+            
+            job.update_progress(progress=80)
+            
+            # Step 4: Detect duplicates across the subject
+            if detect_duplicates:
+                job.update_progress(AnalysisJob.Status.DETECTING, 85)
+                job.update_progress(
+                    progress=90,
+                    duplicates_found=self.detect_duplicates(subject, [paper])
                 )
-                
-                created_questions.append(question)
             
-            job.progress = 90
-            job.save()
+            # Step 5: Complete the job, then the paper - progress streams end
+            # once no paper is active, so the final event must come first
+            job.update_progress(
+                AnalysisJob.Status.COMPLETED, 100, completed_at=timezone.now()
+            )
             
-            # Step 4: Mark paper as completed
             paper.status = Paper.ProcessingStatus.COMPLETED
             paper.processed_at = timezone.now()
             paper.save()
             
-            # Complete job
-            job.status = AnalysisJob.Status.COMPLETED
-            job.progress = 100
-            job.completed_at = timezone.now()
-            job.save()
+            # Question statistics for the dashboard
+            safe_refresh_snapshot(subject, clusters=False)
             
             logger.info(f"Analysis completed: {len(created_questions)} questions created")
             return job
@@ -172,10 +179,11 @@ class AnalysisPipeline:
             logger.error(f"Analysis failed: {e}", exc_info=True)
             
             # Mark as failed
-            job.status = AnalysisJob.Status.FAILED
-            job.error_message = str(e)
-            job.completed_at = timezone.now()
-            job.save()
+            job.update_progress(
+                AnalysisJob.Status.FAILED,
+                error_message=str(e),
+                completed_at=timezone.now()
+            )
             
             paper.status = Paper.ProcessingStatus.FAILED
             paper.processing_error = str(e)
@@ -183,6 +191,214 @@ class AnalysisPipeline:
             
             raise
     
+    def _extract_paper(self, paper: Paper) -> Tuple[List[Dict[str, Any]], Optional[List[str]]]:
+        """
+        Extract questions and per-page text, reusing the results of any
+        earlier upload of the same file (ExtractionCache) or the paper's
+        own stored pages.
+        
+        Returns:
+            Tuple of (questions, text per page); the page texts are None
+            when the paper's stored pages were reused as they are.
+        """
+        if paper.file_hash:
+            cached = ExtractionCache.objects.filter(
+                file_hash=paper.file_hash,
+                extractor_version=EXTRACTOR_VERSION
+            ).first()
+            if cached:
+                ExtractionCache.objects.filter(pk=cached.pk).update(hits=F('hits') + 1)
+                logger.info(f"Extraction cache hit for {paper.file_hash[:12]}")
+                # Image data is not cached; take it from this paper's own file
+                images = self.pymupdf_extractor.extract_images(paper.file.path)
+                questions_data = self.pymupdf_extractor.attach_images(cached.questions, images, cached.blocks)
+                return questions_data, cached.page_texts
+        
+        path = paper.file.path
+        
+        # Re-analysis: the page text is already stored, only parse it again
+        if paper.pages.exists():
+            images = self.pymupdf_extractor.extract_images(path)
+            questions_data = self.reextract_questions(paper, images)
+            logger.info(f"Re-parsed {len(questions_data)} questions from stored pages")
+            return questions_data, None
+        
+        try:
+            # Primary: PyMuPDF text blocks and images, and OCR for pages
+            # that have no text layer, all from one open document
+            with open_pdf(path) as doc:
+                text_blocks = self.pymupdf_extractor.extract_text_with_coordinates(path, doc)
+                images = self.pymupdf_extractor.extract_images(path, doc)
+                page_texts, ocr_pages = self.ocr_engine.extract_page_texts(path, paper.file_hash, doc)
+            
+            if ocr_pages:
+                logger.info(f"OCR: Recovered text for pages {ocr_pages}")
+                full_text = '\n'.join(page_texts)
+            else:
+                full_text = '\n'.join(block['text'] for block in text_blocks)
+            
+            questions_data = self.pymupdf_extractor.extract_questions_from_text(
+                full_text, images, text_blocks
+            )
+            logger.info(f"PyMuPDF: Extracted {len(questions_data)} questions and {len(images)} images")
+            
+        except Exception as e:
+            logger.error(f"PyMuPDF extraction failed, using fallback: {e}")
+            
+            # Fallback to pdfplumber (not cached - a later version may do better)
+            page_texts = self.fallback_extractor.extract_page_texts(path)
+            text = '\n'.join(text for text in page_texts if text)
+            return self.fallback_extractor.extract_questions(text), page_texts
+        
+        if paper.file_hash:
+            ExtractionCache.objects.get_or_create(
+                file_hash=paper.file_hash,
+                extractor_version=EXTRACTOR_VERSION,
+                defaults={
+                    'page_count': len(page_texts),
+                    'page_texts': page_texts,
+                    'blocks': [dict(block, bbox=list(block['bbox'])) for block in text_blocks],
+                    # Without the base64 images, already stored on Question
+                    'questions': [
+                        {key: value for key, value in q_data.items() if key != 'images'}
+                        for q_data in questions_data
+                    ],
+                    'ocr_pages': ocr_pages,
+                }
+            )
+        
+        return questions_data, page_texts
+    
+    def reextract_questions(
+        self,
+        paper: Paper,
+        images: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse questions again from the paper's stored PaperPage text,
+        without opening the PDF or loading raw_text.
+        
+        Pages are streamed into one buffer and parsed together, so a
+        question running over a page break is parsed whole; each question
+        is tagged with the page it starts on.
+        
+        Returns:
+            List of parsed questions tagged with their page number
+        """
+        texts = []
+        page_numbers = []
+        page_starts = []
+        offset = 0
+        for page_number, text in paper.iter_page_texts():
+            texts.append(text)
+            page_numbers.append(page_number)
+            page_starts.append(offset)
+            offset += len(text) + 1
+        
+        buffer = '\n'.join(texts)
+        questions_data = self.pymupdf_extractor.extract_questions_from_text(buffer)
+        
+        for q_data in questions_data:
+            number = re.search(rf"^\s*{re.escape(str(q_data['question_number']))}\s*[.)]", buffer, re.MULTILINE)
+            if number:
+                q_data['page'] = page_numbers[bisect_right(page_starts, number.end()) - 1]
+        
+        return self.pymupdf_extractor.attach_images(questions_data, images or [])
+    
+    def analyze_papers(self, subject, papers: List[Paper]) -> Dict[str, Any]:
+        """
+        Analyze a batch of a subject's papers with shared services.
+        
+        Every paper gets a queued job up front so progress is reported per
+        paper from the start. Duplicate detection and topic clustering run
+        once for the whole batch instead of once per paper.
+        
+        Returns:
+            Statistics about the batch
+        """
+        jobs = [(paper, AnalysisJob.objects.create(paper=paper)) for paper in papers]
+        for _, job in jobs:
+            job.update_progress()
+        
+        analyzed = []
+        failed = 0
+        for paper, job in jobs:
+            paper.status = Paper.ProcessingStatus.PROCESSING
+            paper.save()
+            try:
+                self.analyze_paper(paper, job=job, detect_duplicates=False)
+                analyzed.append(paper)
+            except Exception:
+                # analyze_paper already logged and marked the paper failed
+                failed += 1
+        
+        stats = {
+            'papers_analyzed': len(analyzed),
+            'papers_failed': failed,
+            'duplicates_found': 0,
+            'clusters_created': 0,
+        }
+        if not analyzed:
+            return stats
+        
+        stats['duplicates_found'] = self.detect_duplicates(subject, analyzed)
+        
+        try:
+            from apps.analytics.clustering import analyze_subject_topics
+            stats['clusters_created'] = analyze_subject_topics(subject)['clusters_created']
+        except Exception as e:
+            logger.error(f"Topic clustering failed for subject {subject.id}: {e}", exc_info=True)
+        
+        # Duplicate flags changed after the per-paper refreshes
+        safe_refresh_snapshot(subject, clusters=False)
+        
+        logger.info(
+            f"Batch analysis for {subject}: {len(analyzed)} analyzed, {failed} failed, "
+            f"{stats['duplicates_found']} duplicates, {stats['clusters_created']} clusters"
+        )
+        return stats
+    
+    def detect_duplicates(self, subject, papers: Optional[List[Paper]] = None) -> int:
+        """
+        Flag duplicate questions of a subject.
+        
+        Each question of `papers` (all of the subject's papers if None) is
+        compared with the subject's questions created before it. Questions
+        flagged by an earlier run are not checked or counted again.
+        
+        Returns:
+            Number of questions newly flagged as duplicates
+        """
+        questions = Question.objects.filter(subject=subject).exclude(embedding__isnull=True)
+        
+        existing = []
+        check_ids = set()
+        paper_ids = {paper.pk for paper in papers} if papers is not None else None
+        for q_id, paper_id, is_duplicate, embedding in questions.order_by('created_at', 'id').values_list(
+            'id', 'paper_id', 'is_duplicate', 'embedding'
+        ):
+            existing.append((str(q_id), embedding))
+            if not is_duplicate and (paper_ids is None or paper_id in paper_ids):
+                check_ids.add(str(q_id))
+        
+        if not check_ids:
+            return 0
+        
+        duplicates = self.similarity.batch_find_duplicates(existing, check_ids)
+        
+        for q_id, dup_id, score in duplicates:
+            Question.objects.filter(id=q_id).update(
+                is_duplicate=True,
+                duplicate_of_id=dup_id,
+                similarity_score=score
+            )
+        
+        if duplicates:
+            # Queryset updates send no signals
+            bump_data_version(subject.pk)
+        
+        return len(duplicates)
+    
     def _classify_ktu_questions(
         self,
         questions_data: list,
@@ -202,36 +418,6 @@ class AnalysisPipeline:
         classified = []
         
         for q_data in questions_data:
-                            module = next((m for m in modules if m.number == module_num), None)
-                            if module:
-                                question.module = module
-                
-                # Bloom's taxonomy (rule-based, fast)
-                question.bloom_level = self.bloom_classifier.classify(q_data['text'])
-                
-                # Difficulty (rule-based, fast)
-                question.difficulty = self.difficulty_estimator.estimate(
-                    q_data['text'], q_data.get('marks')
-                )
-                
-                question.save()
-                created_questions.append((question, q_data))
-            
-            job.progress = 40
-            job.save()
-            
-            # Batch classify questions without module hints
-            unclassified = [(q, data) for q, data in created_questions if q.module is None]
-            if unclassified and modules and self.module_classifier:
-                question_texts = [data['text'] for _, data in unclassified]
-                module_nums = self.module_classifier.classify_batch(question_texts, subject, modules)
-                
-                for (question, _), module_num in zip(unclassified, module_nums):
-                    if module_num:
-                        question.module = next(
-                            (m for m in modules if m.number == module_num), None
-                        )
-                        question.save()
             # Get module assignment from pattern
             module_num = None
             part = q_data.get('part', '')
@@ -273,51 +459,3 @@ class AnalysisPipeline:
             return 'comparison'
         else:
             return 'theory'
-
-            
-            # Step 4: Detect duplicates
-            job.status = AnalysisJob.Status.DETECTING
-            job.progress = 85
-            job.save()
-            
-            # Get all questions for this subject for duplicate detection
-            all_subject_questions = Question.objects.filter(
-                paper__subject=subject
-            ).exclude(embedding__isnull=True)
-            
-            existing = [(str(q.id), q.embedding) for q in all_subject_questions]
-            
-            duplicates = self.similarity.batch_find_duplicates(existing)
-            
-            for q_id, dup_id, score in duplicates:
-                try:
-                    question = Question.objects.get(id=q_id)
-                    question.is_duplicate = True
-                    question.duplicate_of_id = dup_id
-                    question.similarity_score = score
-                    question.save()
-                except Question.DoesNotExist:
-                    pass
-            
-            job.duplicates_found = len(duplicates)
-            
-            # Complete
-            job.status = AnalysisJob.Status.COMPLETED
-            job.progress = 100
-            job.completed_at = timezone.now()
-            
-            paper.status = Paper.ProcessingStatus.COMPLETED
-            paper.processed_at = timezone.now()
-            paper.save()
-            
-        except Exception as e:
-            logger.error(f"Analysis failed for paper {paper.id}: {e}")
-            job.status = AnalysisJob.Status.FAILED
-            job.error_message = str(e)
-            
-            paper.status = Paper.ProcessingStatus.FAILED
-            paper.processing_error = str(e)
-            paper.save()
-        
-        job.save()
-        return job
@@ -0,0 +1,103 @@
+"""
+Process-level registry for the analysis pipeline.
+
+Building an AnalysisPipeline imports PyMuPDF, pdfplumber and scikit-learn
+and may load the sentence-transformers model. Django-Q workers are long
+lived, so the pipeline is built once per worker process (ideally right
+after the worker spawns) and reused by every task it runs.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+WARM_EMBEDDINGS = getattr(settings, 'ANALYSIS_WARM_EMBEDDINGS', True)
+
+_lock = threading.Lock()
+_pipeline = None
+_stats = {
+    'pid': None,
+    'cold_starts': 0,
+    'warm_starts': 0,
+    'build_seconds': 0.0,
+    'warmed_at': None,
+}
+
+
+def _build_pipeline():
+    """Construct the pipeline and record how long it took."""
+    from .pipeline import AnalysisPipeline
+
+    started = time.perf_counter()
+    pipeline = AnalysisPipeline(llm_client=None)
+
+    if WARM_EMBEDDINGS and pipeline.embedder.is_available():
+        try:
+            pipeline.embedder._load_model()
+        except Exception as e:
+            logger.warning(f"Embedding model not pre-loaded: {e}")
+
+    _stats['build_seconds'] = time.perf_counter() - started
+    _stats['pid'] = os.getpid()
+    _stats['warmed_at'] = time.time()
+    logger.info(
+        f"Analysis pipeline built in {_stats['build_seconds']:.2f}s (pid {_stats['pid']})"
+    )
+    return pipeline
+
+
+def get_pipeline():
+    """
+    Return the pipeline for this process, building it on first use.
+
+    A forked child inherits the parent's module state, so the pid is
+    checked to avoid sharing a pipeline (and its open handles) across
+    processes.
+    """
+    global _pipeline
+
+    if _pipeline is not None and _stats['pid'] == os.getpid():
+        _stats['warm_starts'] += 1
+        return _pipeline
+
+    with _lock:
+        if _pipeline is None or _stats['pid'] != os.getpid():
+            _pipeline = _build_pipeline()
+            _stats['cold_starts'] += 1
+        else:
+            _stats['warm_starts'] += 1
+    return _pipeline
+
+
+def warm_up(**kwargs):
+    """
+    Build the pipeline ahead of the first task.
+    Connected to Django-Q's ``post_spawn`` signal; errors are logged so a
+    failed warm-up only means the first task pays the cold start.
+    """
+    global _pipeline
+
+    try:
+        with _lock:
+            if _pipeline is None or _stats['pid'] != os.getpid():
+                _pipeline = _build_pipeline()
+        logger.info(f"Worker {kwargs.get('proc_name', os.getpid())} warmed analysis pipeline")
+    except Exception as e:
+        logger.warning(f"Analysis pipeline warm-up failed: {e}")
+
+
+def pipeline_stats() -> Dict[str, Any]:
+    """Warm/cold start counters and build time for this process."""
+    return dict(_stats, warm=_pipeline is not None and _stats['pid'] == os.getpid())
+
+
+def reset():
+    """Drop the cached pipeline (e.g. after changing analysis settings)."""
+    global _pipeline
+    with _lock:
+        _pipeline = None
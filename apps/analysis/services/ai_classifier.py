@@ -21,6 +21,8 @@ class AIClassifier:
         self.embedding_service = embedding_service
         self.clusterer = None
         self.ml_classifier = None
+        self.kmeans = None
+        self._fallback_embedder = None
         
         # Initialize components
         self._init_clusterer()
@@ -32,6 +34,8 @@ class AIClassifier:
             from sklearn.cluster import KMeans, AgglomerativeClustering
             self.kmeans = KMeans
             self.agglomerative = AgglomerativeClustering
+            from .subject_clusterer import SubjectClusterer
+            self.clusterer = SubjectClusterer()
             logger.info("Clustering algorithms initialized")
         except ImportError:
             logger.warning("scikit-learn not available for clustering")
@@ -69,8 +73,10 @@ class AIClassifier:
         # Step 1: Generate embeddings for all questions
         question_embeddings = self._generate_embeddings(questions)
         
+        is_dense = isinstance(question_embeddings, np.ndarray)
+        
         # Step 2: Cluster questions semantically
-        clusters = self._cluster_questions(question_embeddings, n_clusters=5)
+        clusters = self._cluster_questions(question_embeddings, subject=subject)
         
         # Step 3: Label clusters using LLM
         cluster_labels = self._label_clusters(questions, clusters)
@@ -78,7 +84,7 @@ class AIClassifier:
         # Step 4: If syllabus available, match to syllabus units
         if syllabus_text:
             syllabus_mapping = self._match_to_syllabus(
-                questions, question_embeddings, syllabus_text
+                questions, question_embeddings, syllabus_text, subject
             )
         else:
             syllabus_mapping = {}
@@ -110,7 +116,8 @@ class AIClassifier:
                 'question_type': question_type,
                 'difficulty': difficulty,
                 'bloom_level': bloom_level,
-                'embedding': question_embeddings[i].tolist() if len(question_embeddings) > i else None
+                # Hashing vectors are not stored: they can't be compared with model embeddings
+                'embedding': question_embeddings[i].tolist() if is_dense and question_embeddings.shape[0] > i else None
             })
         
         logger.info(f"AI classification completed for {len(classified_questions)} questions")
@@ -119,49 +126,74 @@ class AIClassifier:
     def _generate_embeddings(
         self, 
         questions: List[Dict[str, Any]]
-    ) -> np.ndarray:
+    ):
         """
         Generate embeddings for questions.
         
+        Falls back to the hashing vectorizer (sparse) when no transformer
+        model is available.
+        
         Args:
             questions: List of questions
             
         Returns:
-            Numpy array of embeddings
+            Numpy array of embeddings, or a sparse matrix from the fallback
         """
-        if not self.embedding_service:
-            logger.warning("Embedding service not available, using dummy embeddings")
-            return np.random.rand(len(questions), 384)  # Dummy embeddings
-        
         texts = [q['text'] for q in questions]
-        embeddings = self.embedding_service.encode(texts)
         
-        return np.array(embeddings)
+        if self.embedding_service and self.embedding_service.is_available():
+            try:
+                return np.array(self.embedding_service.encode(texts))
+            except Exception as e:
+                logger.warning(f"Embedding model failed, using hashing vectorizer: {e}")
+        
+        return self.fallback_embedder.encode(texts)
+    
+    @property
+    def fallback_embedder(self):
+        """Lazily built HashingEmbedder."""
+        if self._fallback_embedder is None:
+            from .embedder import HashingEmbedder
+            self._fallback_embedder = HashingEmbedder()
+        return self._fallback_embedder
     
     def _cluster_questions(
         self,
         embeddings: np.ndarray,
-        n_clusters: int = 5
+        n_clusters: int = 5,
+        subject=None
     ) -> np.ndarray:
         """
-        Cluster questions using KMeans.
+        Cluster questions, one cluster per module.
+        
+        With a subject, questions are assigned to the subject's persistent
+        centroids, which are warm-started with each new paper. Without one
+        a throwaway KMeans is fitted.
         
         Args:
             embeddings: Question embeddings
-            n_clusters: Number of clusters (modules)
+            n_clusters: Number of clusters when no subject is given
+            subject: Subject whose cluster model to use and update
             
         Returns:
             Cluster assignments
         """
         if not self.kmeans:
             logger.warning("KMeans not available, using dummy clusters")
-            return np.random.randint(0, n_clusters, size=len(embeddings))
+            return np.random.randint(0, n_clusters, size=embeddings.shape[0])
+        
+        if subject is not None and self.clusterer and self.clusterer.available:
+            return self.clusterer.assign(subject, embeddings)
+        
+        n_clusters = min(n_clusters, embeddings.shape[0])
+        if n_clusters == 0:
+            return np.zeros(0, dtype=int)
         
         # Use KMeans clustering
         kmeans = self.kmeans(n_clusters=n_clusters, random_state=42)
         clusters = kmeans.fit_predict(embeddings)
         
-        logger.info(f"Clustered {len(embeddings)} questions into {n_clusters} groups")
+        logger.info(f"Clustered {embeddings.shape[0]} questions into {n_clusters} groups")
         return clusters
     
     def _label_clusters(
@@ -228,44 +260,118 @@ Topic name:"""
         self,
         questions: List[Dict[str, Any]],
         question_embeddings: np.ndarray,
-        syllabus_text: str
+        syllabus_text: str,
+        subject=None
     ) -> Dict[int, int]:
         """
         Match questions to syllabus units using embeddings.
         
+        All questions are scored against all units with one matrix
+        multiply of L2-normalised embeddings (cosine similarity).
+        
         Args:
             questions: List of questions
             question_embeddings: Question embeddings
             syllabus_text: Syllabus text
+            subject: Subject whose modules hold precomputed unit embeddings
             
         Returns:
             Mapping of question index to module number
         """
-        if not self.embedding_service:
+        if not question_embeddings.shape[0]:
             return {}
         
-        # Parse syllabus into units/modules
-        syllabus_units = self._parse_syllabus_units(syllabus_text)
+        if not isinstance(question_embeddings, np.ndarray):
+            return self._match_to_syllabus_hashed(question_embeddings, syllabus_text, subject)
         
-        # Generate embeddings for syllabus units
-        unit_texts = [unit['text'] for unit in syllabus_units]
-        unit_embeddings = self.embedding_service.encode(unit_texts)
+        question_matrix = np.asarray(question_embeddings, dtype=np.float32)
+        unit_numbers, unit_matrix = self._get_syllabus_unit_embeddings(
+            subject, syllabus_text, question_matrix.shape[1]
+        )
+        if unit_matrix is None:
+            return {}
         
-        # Match questions to units using cosine similarity
-        mapping = {}
+        similarities = self._normalize_rows(question_matrix) @ self._normalize_rows(unit_matrix).T
+        best_units = similarities.argmax(axis=1)
         
-        for i, q_emb in enumerate(question_embeddings):
-            # Calculate similarity with all units
-            similarities = []
-            for u_emb in unit_embeddings:
-                sim = self._cosine_similarity(q_emb, u_emb)
-                similarities.append(sim)
-            
-            # Assign to most similar unit
-            best_unit_idx = np.argmax(similarities)
-            mapping[i] = syllabus_units[best_unit_idx]['module_number']
+        return {i: int(unit_numbers[j]) for i, j in enumerate(best_units)}
+    
+    def _match_to_syllabus_hashed(self, question_matrix, syllabus_text: str, subject=None) -> Dict[int, int]:
+        """
+        Syllabus matching for hashing-vectorizer (sparse, L2-normalised) rows.
+        Unit texts come from the modules when stored; hashing them is cheap,
+        so their vectors are not persisted.
+        """
+        units = []
+        if subject is not None:
+            units = [
+                {'module_number': number, 'text': text}
+                for number, text in subject.modules.exclude(
+                    syllabus_text=''
+                ).values_list('number', 'syllabus_text')
+            ]
+        if not units:
+            units = self._parse_syllabus_units(syllabus_text)
+        
+        unit_matrix = self.fallback_embedder.encode([unit['text'] for unit in units])
+        similarities = (question_matrix @ unit_matrix.T).toarray()
+        best_units = similarities.argmax(axis=1)
+        
+        return {i: units[j]['module_number'] for i, j in enumerate(best_units)}
+    
+    def _get_syllabus_unit_embeddings(
+        self,
+        subject,
+        syllabus_text: str,
+        dimensions: int
+    ) -> Tuple[List[int], Optional[np.ndarray]]:
+        """
+        Unit module numbers and embedding matrix for a syllabus.
         
-        return mapping
+        Uses the embeddings stored on the subject's modules when they match
+        the question embedding size. Otherwise the syllabus is parsed and
+        embedded once, and the result is stored on the modules for the
+        following papers.
+        """
+        if subject is not None:
+            stored = [
+                (number, embedding)
+                for number, embedding in subject.modules.exclude(
+                    syllabus_embedding__isnull=True
+                ).values_list('number', 'syllabus_embedding')
+                if embedding and len(embedding) == dimensions
+            ]
+            if stored:
+                numbers, embeddings = zip(*stored)
+                return list(numbers), np.asarray(embeddings, dtype=np.float32)
+        
+        if not self.embedding_service or not self.embedding_service.is_available():
+            return [], None
+        
+        syllabus_units = self._parse_syllabus_units(syllabus_text)
+        try:
+            unit_embeddings = self.embedding_service.encode([unit['text'] for unit in syllabus_units])
+        except Exception as e:
+            logger.warning(f"Syllabus unit embeddings unavailable: {e}")
+            return [], None
+        
+        if subject is not None:
+            from .syllabus import SyllabusService
+            SyllabusService(self.embedding_service).apply_units(
+                subject, syllabus_units, np.asarray(unit_embeddings).tolist()
+            )
+        
+        return (
+            [unit['module_number'] for unit in syllabus_units],
+            np.asarray(unit_embeddings, dtype=np.float32)
+        )
+    
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """Scale each row to unit length (zero rows stay zero)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
     
     def _parse_syllabus_units(self, syllabus_text: str) -> List[Dict[str, Any]]:
         """
@@ -277,52 +383,8 @@ Topic name:"""
         Returns:
             List of syllabus units with module numbers
         """
-        # Simple parsing - split by "Module" or "Unit"
-        import re
-        
-        units = []
-        
-        # Pattern: Module 1, Unit 1, etc.
-        pattern = r'(?:Module|Unit)\s+(\d+)[:\-\s]+(.+?)(?=(?:Module|Unit)\s+\d+|$)'
-        
-        matches = re.finditer(pattern, syllabus_text, re.IGNORECASE | re.DOTALL)
-        
-        for match in matches:
-            module_num = int(match.group(1))
-            text = match.group(2).strip()
-            
-            units.append({
-                'module_number': module_num,
-                'text': text[:1000]  # Limit text length
-            })
-        
-        # If no modules found, create default 5 modules
-        if not units:
-            # Split into 5 equal parts
-            chunks = self._split_text_into_chunks(syllabus_text, 5)
-            units = [
-                {'module_number': i+1, 'text': chunk}
-                for i, chunk in enumerate(chunks)
-            ]
-        
-        return units
-    
-    def _split_text_into_chunks(self, text: str, n: int) -> List[str]:
-        """Split text into n chunks."""
-        words = text.split()
-        chunk_size = len(words) // n
-        
-        chunks = []
-        for i in range(n):
-            start = i * chunk_size
-            end = start + chunk_size if i < n-1 else len(words)
-            chunks.append(" ".join(words[start:end]))
-        
-        return chunks
-    
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors."""
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+        from .syllabus import parse_syllabus_units
+        return parse_syllabus_units(syllabus_text)
     
     def _classify_question_type(self, text: str) -> str:
         """Classify question type using LLM or keywords."""
@@ -2,6 +2,7 @@
 Embedding generation service using sentence-transformers.
 """
 import logging
+import re
 from typing import List, Optional
 import numpy as np
 
@@ -13,10 +14,21 @@ class EmbeddingService:
     
     _model = None
     _model_name = None
+    _available = None
     
     def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
         self.model_name = model_name
     
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether sentence-transformers is installed (checked without importing it)."""
+        if cls._available is None:
+            import importlib.util
+            cls._available = importlib.util.find_spec('sentence_transformers') is not None
+            if not cls._available:
+                logger.warning("sentence-transformers not installed, using hashing vectorizer")
+        return cls._available
+    
     def _load_model(self):
         """Lazy load the embedding model."""
         if EmbeddingService._model is None or EmbeddingService._model_name != self.model_name:
@@ -29,6 +41,14 @@ class EmbeddingService:
                 logger.error(f"Failed to load embedding model: {e}")
                 raise
     
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into a 2D array of embeddings.
+        Raises if the model cannot be loaded.
+        """
+        self._load_model()
+        return EmbeddingService._model.encode(texts, convert_to_numpy=True)
+    
     def get_embedding(self, text: str) -> Optional[List[float]]:
         """
         Generate embedding for a single text.
@@ -55,3 +75,35 @@ class EmbeddingService:
         except Exception as e:
             logger.error(f"Batch embedding generation failed: {e}")
             return [None] * len(texts)
+
+
+class HashingEmbedder:
+    """
+    Deterministic, model-free fallback for EmbeddingService.
+    
+    Hashes word unigrams and bigrams of the normalised text into a fixed
+    sparse space (L2-normalised), so it needs no fitting, no vocabulary
+    and gives the same vector for the same text in every process.
+    """
+    
+    model_name = 'hashing'
+    
+    def __init__(self, n_features: int = 2 ** 14):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words='english',
+            alternate_sign=False,
+            norm='l2',
+            preprocessor=self.normalize,
+        )
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase and keep only letters, so numbering and marks don't count."""
+        return re.sub(r'[^a-z]+', ' ', text.lower())
+    
+    def encode(self, texts: List[str]):
+        """Encode texts into a sparse CSR matrix."""
+        return self.vectorizer.transform(texts)
@@ -33,29 +33,30 @@ class QuestionExtractor:
     
     def extract_text(self, pdf_path: str) -> str:
         """Extract all text from a PDF file."""
+        return '\n'.join(text for text in self.extract_page_texts(pdf_path) if text)
+    
+    def extract_page_texts(self, pdf_path: str) -> List[str]:
+        """Extract the text of each page of a PDF file."""
         text_parts = []
         
         if self.pdfplumber:
             try:
                 with self.pdfplumber.open(pdf_path) as pdf:
                     for page in pdf.pages:
-                        text = page.extract_text()
-                        if text:
-                            text_parts.append(text)
+                        text_parts.append(page.extract_text() or '')
             except Exception as e:
                 logger.error(f"pdfplumber extraction failed: {e}")
         
         # Fallback to PyMuPDF
-        if not text_parts and self.fitz:
+        if not any(text_parts) and self.fitz:
             try:
                 doc = self.fitz.open(pdf_path)
-                for page in doc:
-                    text_parts.append(page.get_text())
+                text_parts = [page.get_text() for page in doc]
                 doc.close()
             except Exception as e:
                 logger.error(f"PyMuPDF extraction failed: {e}")
         
-        return '\n'.join(text_parts)
+        return text_parts
     
     def extract_questions(self, text: str) -> List[Dict[str, Any]]:
         """
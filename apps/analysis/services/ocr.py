@@ -0,0 +1,218 @@
+"""
+Page-level OCR for scanned question papers.
+
+Only pages without a usable text layer are rasterized, in grayscale and at
+a DPI matched to the embedded scan, and they are OCRed in parallel across
+processes. Results are cached per (file hash, page) in PageOCRResult.
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _default_ocr_workers() -> int:
+    """Split the cores between the Django-Q workers, each of which may OCR at once."""
+    q_workers = getattr(settings, 'Q_CLUSTER', {}).get('workers') or os.cpu_count() or 1
+    return max(1, (os.cpu_count() or 1) // q_workers)
+
+
+OCR_LANGUAGE = getattr(settings, 'ANALYSIS_OCR_LANGUAGE', 'eng')
+OCR_WORKERS = getattr(settings, 'ANALYSIS_OCR_WORKERS', None) or _default_ocr_workers()
+OCR_MIN_PAGE_CHARS = getattr(settings, 'ANALYSIS_OCR_MIN_PAGE_CHARS', 20)
+OCR_MIN_DPI = getattr(settings, 'ANALYSIS_OCR_MIN_DPI', 150)
+OCR_MAX_DPI = getattr(settings, 'ANALYSIS_OCR_MAX_DPI', 300)
+OCR_DEFAULT_DPI = getattr(settings, 'ANALYSIS_OCR_DEFAULT_DPI', 200)
+OCR_MAX_PIXELS = 4000  # Longest rendered edge, keeps A3 scans in check
+
+
+def choose_dpi(page) -> int:
+    """
+    Pick a render DPI for a page.
+
+    Rendering above the resolution of the embedded scan adds pixels but no
+    detail, so the scan's native DPI is used, clamped to the OCR range.
+    """
+    dpi = None
+    for info in page.get_image_info():
+        x0, _, x1, _ = info['bbox']
+        width_inches = (x1 - x0) / 72
+        if width_inches > 0:
+            native = info['width'] / width_inches
+            dpi = max(dpi or 0, native)
+
+    if dpi is None:
+        dpi = OCR_DEFAULT_DPI
+    dpi = min(max(dpi, OCR_MIN_DPI), OCR_MAX_DPI)
+
+    longest_edge = max(page.rect.width, page.rect.height) / 72
+    if longest_edge > 0:
+        dpi = min(dpi, OCR_MAX_PIXELS / longest_edge)
+
+    return int(dpi)
+
+
+def ocr_page(pdf_path: str, page_number: int, dpi: int, language: str) -> Tuple[int, str]:
+    """
+    Render one page in grayscale and OCR it.
+    Top-level so it can run in a worker process.
+    """
+    import fitz
+    import pytesseract
+    from PIL import Image
+
+    with fitz.open(pdf_path) as doc:
+        pix = doc[page_number - 1].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+
+    image = Image.frombytes('L', (pix.width, pix.height), pix.samples)
+    return page_number, pytesseract.image_to_string(image, lang=language)
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCREngine:
+    """OCRs the text-less pages of a PDF, with a per-page result cache."""
+
+    _available = None
+
+    def __init__(self, language: str = OCR_LANGUAGE, max_workers: int = OCR_WORKERS):
+        self.language = language
+        self.max_workers = max(1, max_workers)
+
+    @property
+    def available(self) -> bool:
+        """Whether pytesseract and the tesseract binary can be used."""
+        if OCREngine._available is None:
+            try:
+                import pytesseract
+                pytesseract.get_tesseract_version()
+                OCREngine._available = True
+            except Exception as e:
+                logger.warning(f"OCR not available: {e}")
+                OCREngine._available = False
+        return OCREngine._available
+
+    def extract_page_texts(
+        self,
+        pdf_path: str,
+        file_hash: Optional[str] = None,
+        doc=None
+    ) -> Tuple[List[str], List[int]]:
+        """
+        Extract the text of every page, OCRing pages without a text layer.
+
+        Args:
+            pdf_path: Path to PDF file
+            file_hash: SHA-256 of the file, computed if not given
+            doc: The PDF already opened by the caller, if any
+
+        Returns:
+            Tuple of (text per page, 1-based numbers of the OCRed pages)
+        """
+        from .pymupdf_extractor import open_pdf
+
+        page_texts = []
+        dpis = {}
+        with open_pdf(pdf_path, doc) as doc:
+            for page_number, page in enumerate(doc, start=1):
+                text = page.get_text()
+                page_texts.append(text)
+                if len(text.strip()) < OCR_MIN_PAGE_CHARS:
+                    dpis[page_number] = choose_dpi(page)
+
+        if not dpis or not self.available:
+            return page_texts, []
+
+        ocr_texts = self.ocr_pages(pdf_path, file_hash or file_sha256(pdf_path), dpis)
+        for page_number, text in ocr_texts.items():
+            if text.strip():
+                page_texts[page_number - 1] = text
+
+        return page_texts, sorted(ocr_texts)
+
+    def ocr_pages(self, pdf_path: str, file_hash: str, dpis: Dict[int, int]) -> Dict[int, str]:
+        """
+        OCR the given pages, reusing cached results.
+
+        Args:
+            pdf_path: Path to PDF file
+            file_hash: SHA-256 of the file (cache key)
+            dpis: Render DPI per 1-based page number
+
+        Returns:
+            OCR text per page number
+        """
+        from apps.analysis.models import PageOCRResult
+
+        results = dict(
+            PageOCRResult.objects.filter(
+                file_hash=file_hash,
+                language=self.language,
+                page_number__in=list(dpis)
+            ).values_list('page_number', 'text')
+        )
+
+        missing = [page_number for page_number in dpis if page_number not in results]
+        if not missing:
+            return results
+
+        logger.info(f"OCR: {len(missing)} page(s) of {pdf_path} ({len(results)} cached)")
+        ocred = self._run(pdf_path, [(page_number, dpis[page_number]) for page_number in missing])
+
+        PageOCRResult.objects.bulk_create(
+            [
+                PageOCRResult(
+                    file_hash=file_hash,
+                    page_number=page_number,
+                    language=self.language,
+                    dpi=dpis[page_number],
+                    text=text
+                )
+                for page_number, text in ocred.items()
+            ],
+            ignore_conflicts=True
+        )
+
+        results.update(ocred)
+        return results
+
+    def _run(self, pdf_path: str, pages: List[Tuple[int, int]]) -> Dict[int, str]:
+        """OCR pages in a process pool, or inline when a pool is not worth it."""
+        workers = min(self.max_workers, len(pages))
+
+        # Daemonic processes (e.g. daemonized Django-Q workers) cannot fork
+        if workers > 1 and not multiprocessing.current_process().daemon:
+            results = {}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(ocr_page, pdf_path, page_number, dpi, self.language)
+                    for page_number, dpi in pages
+                ]
+                for future in futures:
+                    try:
+                        page_number, text = future.result()
+                        results[page_number] = text
+                    except Exception as e:
+                        logger.error(f"OCR failed for a page of {pdf_path}: {e}")
+            return results
+
+        results = {}
+        for page_number, dpi in pages:
+            try:
+                results[page_number] = ocr_page(pdf_path, page_number, dpi, self.language)[1]
+            except Exception as e:
+                logger.error(f"OCR failed for page {page_number} of {pdf_path}: {e}")
+        return results
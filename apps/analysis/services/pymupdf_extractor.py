@@ -5,12 +5,27 @@ Extracts text, images, and coordinates losslessly.
 import logging
 import base64
 import re
+from contextlib import contextmanager
 from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
-import io
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever extraction or question parsing changes so cached results
+# (ExtractionCache) from older versions are no longer used.
+EXTRACTOR_VERSION = 'pymupdf-1'
+
+
+@contextmanager
+def open_pdf(pdf_path: str, doc=None):
+    """Yield `doc` if the caller already opened the PDF, else open and close it."""
+    if doc is not None:
+        yield doc
+        return
+    import fitz
+    with fitz.open(pdf_path) as opened:
+        yield opened
+
 
 class PyMuPDFExtractor:
     """
@@ -32,12 +47,13 @@ class PyMuPDFExtractor:
             logger.error("PyMuPDF not available - install with: pip install PyMuPDF")
             raise
     
-    def extract_text_with_coordinates(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def extract_text_with_coordinates(self, pdf_path: str, doc=None) -> List[Dict[str, Any]]:
         """
         Extract text with bounding box coordinates.
         
         Args:
             pdf_path: Path to PDF file
+            doc: The PDF already opened by the caller, if any
             
         Returns:
             List of text blocks with coordinates
@@ -48,32 +64,30 @@ class PyMuPDFExtractor:
         text_blocks = []
         
         try:
-            doc = self.fitz.open(pdf_path)
-            
-            for page_num, page in enumerate(doc, start=1):
-                blocks = page.get_text("dict")["blocks"]
-                
-                for block in blocks:
-                    if block["type"] == 0:  # Text block
-                        bbox = block["bbox"]  # (x0, y0, x1, y1)
-                        
-                        # Extract text from lines
-                        text_parts = []
-                        for line in block.get("lines", []):
-                            for span in line.get("spans", []):
-                                text_parts.append(span["text"])
-                        
-                        text = " ".join(text_parts).strip()
-                        
-                        if text:
-                            text_blocks.append({
-                                "text": text,
-                                "bbox": bbox,
-                                "page": page_num,
-                                "type": "text"
-                            })
+            with open_pdf(pdf_path, doc) as doc:
+                for page_num, page in enumerate(doc, start=1):
+                    blocks = page.get_text("dict")["blocks"]
+                    
+                    for block in blocks:
+                        if block["type"] == 0:  # Text block
+                            bbox = block["bbox"]  # (x0, y0, x1, y1)
+                            
+                            # Extract text from lines
+                            text_parts = []
+                            for line in block.get("lines", []):
+                                for span in line.get("spans", []):
+                                    text_parts.append(span["text"])
+                            
+                            text = " ".join(text_parts).strip()
+                            
+                            if text:
+                                text_blocks.append({
+                                    "text": text,
+                                    "bbox": bbox,
+                                    "page": page_num,
+                                    "type": "text"
+                                })
             
-            doc.close()
             logger.info(f"Extracted {len(text_blocks)} text blocks from {pdf_path}")
             
         except Exception as e:
@@ -82,12 +96,13 @@ class PyMuPDFExtractor:
         
         return text_blocks
     
-    def extract_images(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def extract_images(self, pdf_path: str, doc=None) -> List[Dict[str, Any]]:
         """
         Extract all images from PDF with coordinates and base64 encoding.
         
         Args:
             pdf_path: Path to PDF file
+            doc: The PDF already opened by the caller, if any
             
         Returns:
             List of images with metadata
@@ -98,37 +113,35 @@ class PyMuPDFExtractor:
         images = []
         
         try:
-            doc = self.fitz.open(pdf_path)
-            
-            for page_num, page in enumerate(doc, start=1):
-                # Get images from page
-                image_list = page.get_images(full=True)
-                
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]
-                    
-                    # Extract image
-                    base_image = doc.extract_image(xref)
-                    image_bytes = base_image["image"]
-                    image_ext = base_image["ext"]
+            with open_pdf(pdf_path, doc) as doc:
+                for page_num, page in enumerate(doc, start=1):
+                    # Get images from page
+                    image_list = page.get_images(full=True)
                     
-                    # Get image bounding box
-                    img_rects = page.get_image_rects(xref)
-                    bbox = img_rects[0] if img_rects else None
-                    
-                    # Encode to base64
-                    image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                    
-                    images.append({
-                        "image_data": image_base64,
-                        "format": image_ext,
-                        "bbox": list(bbox) if bbox else None,
-                        "page": page_num,
-                        "index": img_index,
-                        "type": "image"
-                    })
+                    for img_index, img in enumerate(image_list):
+                        xref = img[0]
+                        
+                        # Extract image
+                        base_image = doc.extract_image(xref)
+                        image_bytes = base_image["image"]
+                        image_ext = base_image["ext"]
+                        
+                        # Get image bounding box
+                        img_rects = page.get_image_rects(xref)
+                        bbox = img_rects[0] if img_rects else None
+                        
+                        # Encode to base64
+                        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+                        
+                        images.append({
+                            "image_data": image_base64,
+                            "format": image_ext,
+                            "bbox": list(bbox) if bbox else None,
+                            "page": page_num,
+                            "index": img_index,
+                            "type": "image"
+                        })
             
-            doc.close()
             logger.info(f"Extracted {len(images)} images from {pdf_path}")
             
         except Exception as e:
@@ -208,6 +221,25 @@ class PyMuPDFExtractor:
         
         return questions, images
     
+    def extract_questions_from_text(
+        self,
+        text: str,
+        images: Optional[List[Dict[str, Any]]] = None,
+        text_blocks: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse questions from already extracted (e.g. OCRed) text.
+        
+        Args:
+            text: Full text of the paper
+            images: Extracted images with coordinates
+            text_blocks: Text blocks with coordinates
+            
+        Returns:
+            List of parsed questions
+        """
+        return self._parse_questions(text, text_blocks or [], images or [])
+    
     def _parse_questions(
         self,
         text: str,
@@ -239,13 +271,25 @@ class PyMuPDFExtractor:
         # Combine
         all_questions = part_a + part_b
         
-        # Associate images with questions based on proximity
-        for question in all_questions:
+        return self.attach_images(all_questions, images, text_blocks)
+    
+    def attach_images(
+        self,
+        questions: List[Dict[str, Any]],
+        images: List[Dict[str, Any]],
+        text_blocks: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Associate images with questions based on proximity.
+        Also used to restore the images of questions loaded from
+        ExtractionCache, which stores them without image data.
+        """
+        for question in questions:
             question['images'] = self._find_nearby_images(
-                question, text_blocks, images
+                question, text_blocks or [], images
             )
         
-        return all_questions
+        return questions
     
     def _find_nearby_images(
         self,
@@ -354,36 +398,17 @@ class PyMuPDFExtractor:
         return questions
 
 
-def extract_with_ocr(pdf_path: str) -> str:
+def extract_with_ocr(pdf_path: str, file_hash: Optional[str] = None) -> str:
     """
-    Fallback: Extract text using OCR when PDF is scanned.
-    Uses Tesseract OCR with OpenCV preprocessing.
+    Fallback: Extract text from a scanned PDF.
+    Pages that already have a text layer keep it; only the others are OCRed.
     """
+    from .ocr import OCREngine
+    
     try:
-        import pytesseract
-        from PIL import Image
-        import fitz
-        
-        text_parts = []
-        
-        doc = fitz.open(pdf_path)
-        
-        for page_num, page in enumerate(doc):
-            # Convert page to image
-            pix = page.get_pixmap(dpi=300)
-            
-            # Convert to PIL Image
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-            
-            # OCR
-            text = pytesseract.image_to_string(img)
-            text_parts.append(text)
-        
-        doc.close()
-        
-        logger.info(f"OCR extraction completed for {pdf_path}")
-        return '\n'.join(text_parts)
+        page_texts, ocr_pages = OCREngine().extract_page_texts(pdf_path, file_hash)
+        logger.info(f"OCR extraction completed for {pdf_path}: {len(ocr_pages)} page(s) OCRed")
+        return '\n'.join(page_texts)
         
     except Exception as e:
         logger.error(f"OCR extraction failed: {e}")
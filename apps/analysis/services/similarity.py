@@ -2,7 +2,7 @@
 Duplicate detection service using cosine similarity.
 """
 import logging
-from typing import List, Tuple, Optional
+from typing import List, Optional, Set, Tuple
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -71,18 +71,24 @@ class SimilarityService:
     
     def batch_find_duplicates(
         self,
-        questions: List[Tuple[str, List[float]]]
+        questions: List[Tuple[str, List[float]]],
+        check_ids: Optional[Set[str]] = None
     ) -> List[Tuple[str, str, float]]:
         """
         Find all duplicates within a set of questions.
         
+        Args:
+            questions: (question_id, embedding) tuples, oldest first
+            check_ids: Only check these questions (each still against
+                every question before it); all of them if None
+        
         Returns:
             List of (question_id, duplicate_of_id, similarity_score)
         """
         duplicates = []
         
         for i, (q_id, q_emb) in enumerate(questions):
-            if not q_emb:
+            if not q_emb or (check_ids is not None and q_id not in check_ids):
                 continue
             
             # Only check against questions that came before (to avoid double-counting)
@@ -0,0 +1,110 @@
+"""
+Per-subject incremental question clustering.
+
+Each subject keeps one set of k centroids, k being its module count. A new
+paper's questions are assigned to the nearest existing centroid (O(n*k))
+and then folded into the centroids with the mini-batch k-means update (a
+per-cluster running mean), so clusters stay stable across papers and
+nothing is refitted from scratch. Only centroids and per-cluster counts are
+stored, as JSON.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLUSTERS = 5
+
+
+class SubjectClusterer:
+    """Loads, assigns with and updates a subject's SubjectClusterModel."""
+
+    def __init__(self):
+        try:
+            from sklearn.cluster import MiniBatchKMeans
+            from sklearn.metrics.pairwise import euclidean_distances
+            self.minibatch_kmeans = MiniBatchKMeans
+            self.euclidean_distances = euclidean_distances
+        except ImportError:
+            logger.warning("scikit-learn not available for incremental clustering")
+            self.minibatch_kmeans = None
+            self.euclidean_distances = None
+
+    @property
+    def available(self) -> bool:
+        return self.minibatch_kmeans is not None
+
+    def cluster_count(self, subject) -> int:
+        """Number of clusters for a subject: one per module."""
+        return subject.modules.count() or DEFAULT_CLUSTERS
+
+    def assign(self, subject, vectors) -> np.ndarray:
+        """
+        Assign vectors (dense or sparse rows) to the subject's clusters and
+        update the model with them.
+
+        Returns:
+            Cluster index per row
+        """
+        from apps.analysis.models import SubjectClusterModel
+
+        n_samples, dimensions = vectors.shape
+        if n_samples == 0:
+            return np.zeros(0, dtype=int)
+
+        n_clusters = self.cluster_count(subject)
+        record = SubjectClusterModel.objects.filter(subject=subject).first()
+
+        if record and (record.n_clusters != n_clusters or record.dimensions != dimensions):
+            # Modules or vectorizer changed - start a new model
+            logger.info(f"Resetting cluster model for {subject}: k or dimensions changed")
+            record.delete()
+            record = None
+
+        if record is None:
+            if n_samples < n_clusters:
+                # Too few questions to seed k centroids: each is its own
+                # cluster, and the model is seeded from a later paper
+                return np.arange(n_samples)
+            model = self.minibatch_kmeans(n_clusters=n_clusters, random_state=42, n_init=3)
+            model.partial_fit(vectors)
+            labels = model.predict(vectors)
+            centroids = model.cluster_centers_
+            counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+            record = SubjectClusterModel(subject=subject, n_clusters=n_clusters, dimensions=dimensions)
+        else:
+            centroids = np.asarray(record.centroids, dtype=np.float64)
+            labels = self.euclidean_distances(vectors, centroids, squared=True).argmin(axis=1)
+            centroids, counts = self._update(centroids, self._counts(record), vectors, labels)
+
+        record.centroids = centroids.tolist()
+        record.counts = counts.tolist()
+        record.samples_seen += n_samples
+        record.save()
+
+        logger.info(f"Assigned {n_samples} questions to {n_clusters} subject clusters")
+        return labels
+
+    @staticmethod
+    def _counts(record) -> np.ndarray:
+        """Samples per cluster; spread evenly for models saved without counts."""
+        if len(record.counts) == record.n_clusters:
+            return np.asarray(record.counts, dtype=np.float64)
+        return np.full(record.n_clusters, record.samples_seen / record.n_clusters, dtype=np.float64)
+
+    @staticmethod
+    def _update(centroids: np.ndarray, counts: np.ndarray, vectors, labels: np.ndarray):
+        """
+        Mini-batch k-means step: move each centroid to the running mean of
+        every sample assigned to it so far.
+        """
+        centroids = centroids.copy()
+        counts = counts.copy()
+        for cluster in np.unique(labels):
+            members = vectors[labels == cluster]
+            total = counts[cluster] + members.shape[0]
+            batch_sum = np.asarray(members.sum(axis=0)).ravel()
+            centroids[cluster] += (batch_sum - members.shape[0] * centroids[cluster]) / total
+            counts[cluster] = total
+        return centroids, counts
@@ -0,0 +1,170 @@
+"""
+Syllabus ingestion: text extraction, unit parsing and unit embeddings.
+
+Runs in the background after upload. Results are cached per syllabus file
+hash (SyllabusCache) and copied onto the subject's modules, where
+AIClassifier picks up the precomputed unit embeddings.
+"""
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from .ocr import OCREngine, file_sha256
+
+logger = logging.getLogger(__name__)
+
+# "Module 1:", "UNIT 2 -", ... at the start of a line; a mid-sentence
+# "see Unit 12 - ..." is not a header
+UNIT_HEADER_PATTERN = re.compile(r'^\s*(?:Module|Unit)\s+(\d+)[:\-\s]+', re.IGNORECASE | re.MULTILINE)
+UNIT_TEXT_LIMIT = 1000
+DEFAULT_UNIT_COUNT = 5
+# Headers numbered above this are treated as unit text, not new units
+MAX_UNIT_NUMBER = 12
+
+
+def split_text_into_chunks(text: str, n: int) -> List[str]:
+    """Split text into n chunks of roughly equal word count."""
+    words = text.split()
+    chunk_size = len(words) // n
+
+    chunks = []
+    for i in range(n):
+        start = i * chunk_size
+        end = start + chunk_size if i < n - 1 else len(words)
+        chunks.append(" ".join(words[start:end]))
+
+    return chunks
+
+
+def parse_syllabus_units(syllabus_text: str, max_units: int = MAX_UNIT_NUMBER) -> List[Dict[str, Any]]:
+    """
+    Parse syllabus into units/modules.
+
+    Splits on unit headers in a single linear pass, ignoring headers
+    numbered outside 1..max_units. Without headers the text is split into
+    DEFAULT_UNIT_COUNT equal parts.
+
+    Returns:
+        List of syllabus units with module numbers
+    """
+    units = []
+    headers = [
+        header for header in UNIT_HEADER_PATTERN.finditer(syllabus_text)
+        if 1 <= int(header.group(1)) <= max_units
+    ]
+
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(syllabus_text)
+        text = syllabus_text[header.end():end].strip()
+        units.append({
+            'module_number': int(header.group(1)),
+            'text': text[:UNIT_TEXT_LIMIT]
+        })
+
+    if not units:
+        chunks = split_text_into_chunks(syllabus_text, DEFAULT_UNIT_COUNT)
+        units = [
+            {'module_number': i + 1, 'text': chunk}
+            for i, chunk in enumerate(chunks)
+        ]
+
+    return units
+
+
+class SyllabusService:
+    """Parses a subject's syllabus once and stores units on its modules."""
+
+    def __init__(self, embedding_service=None, ocr_engine: Optional[OCREngine] = None):
+        self.embedding_service = embedding_service
+        self.ocr_engine = ocr_engine or OCREngine()
+
+    def ingest(self, subject) -> int:
+        """
+        Parse the subject's syllabus file and update its modules.
+
+        Returns:
+            Number of syllabus units applied
+        """
+        from apps.analysis.models import SyllabusCache
+
+        if not subject.syllabus_file:
+            return 0
+
+        path = subject.syllabus_file.path
+        file_hash = file_sha256(path)
+
+        cache = SyllabusCache.objects.filter(file_hash=file_hash).first()
+        if cache is None:
+            # PyMuPDF text layer, OCR for scanned pages
+            page_texts, _ = self.ocr_engine.extract_page_texts(path, file_hash)
+            text = '\n'.join(page_texts)
+            units = parse_syllabus_units(text)
+            cache, _ = SyllabusCache.objects.get_or_create(
+                file_hash=file_hash,
+                defaults={'text': text, 'units': units}
+            )
+            logger.info(f"Parsed syllabus {file_hash[:12]} into {len(units)} units")
+
+        if cache.embeddings is None and cache.units:
+            embeddings = self._embed_units(cache.units)
+            if embeddings is not None:
+                cache.embeddings = embeddings
+                cache.embedding_model = self.embedding_service.model_name
+                cache.save(update_fields=['embeddings', 'embedding_model', 'updated_at'])
+
+        subject.syllabus_text = cache.text
+        subject.syllabus_hash = file_hash
+        subject.save(update_fields=['syllabus_text', 'syllabus_hash', 'updated_at'])
+
+        self.apply_units(subject, cache.units, cache.embeddings)
+        return len(cache.units)
+
+    def _embed_units(self, units: List[Dict[str, Any]]) -> Optional[List[List[float]]]:
+        """Embed all unit texts in one batch, or None if embeddings are unavailable."""
+        if not self.embedding_service or not self.embedding_service.is_available():
+            return None
+        try:
+            return self.embedding_service.encode([unit['text'] for unit in units]).tolist()
+        except Exception as e:
+            logger.warning(f"Syllabus unit embeddings not computed: {e}")
+            return None
+
+    def apply_units(self, subject, units, embeddings=None):
+        """
+        Store unit text and embeddings on the modules, creating missing ones
+        in bulk. Units numbered beyond the subject's modules (or
+        DEFAULT_UNIT_COUNT, if more) are skipped.
+        """
+        from apps.analytics.versioning import bump_data_version
+        from apps.subjects.models import Module
+
+        modules = {module.number: module for module in subject.modules.all()}
+        module_range = max([DEFAULT_UNIT_COUNT, *modules])
+        to_update = []
+        to_create = []
+
+        for i, unit in enumerate(units):
+            number = unit['module_number']
+            if not 1 <= number <= module_range:
+                logger.info(f"Skipping syllabus unit {number} of {subject}: outside modules 1-{module_range}")
+                continue
+            embedding = embeddings[i] if embeddings else None
+
+            module = modules.get(number)
+            if module is None:
+                module = Module(subject=subject, name=f'Module {number}', number=number)
+                modules[number] = module
+                to_create.append(module)
+            else:
+                to_update.append(module)
+
+            module.syllabus_text = unit['text']
+            module.syllabus_embedding = embedding
+
+        if to_create:
+            Module.objects.bulk_create(to_create)
+        if to_update:
+            Module.objects.bulk_update(to_update, ['syllabus_text', 'syllabus_embedding'])
+        if to_create or to_update:
+            # Bulk writes send no signals
+            bump_data_version(subject.pk)
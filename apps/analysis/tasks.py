@@ -11,17 +11,15 @@ def analyze_paper_task(paper_id: str):
     Background task to analyze a paper.
     Called via Django-Q2.
     """
-    from .pipeline import AnalysisPipeline
+    from .registry import get_pipeline
     
     try:
         paper = Paper.objects.get(id=paper_id)
         paper.status = Paper.ProcessingStatus.PROCESSING
         paper.save()
         
-        # Run analysis without LLM for speed (use keyword-based classification)
-        # LLM is too slow for real-time processing
-        pipeline = AnalysisPipeline(llm_client=None)
-        pipeline.analyze_paper(paper)
+        # Reuse this worker's warm pipeline (keyword-based, no LLM for speed)
+        get_pipeline().analyze_paper(paper)
         
     except Paper.DoesNotExist:
         pass
@@ -31,6 +29,59 @@ def analyze_paper_task(paper_id: str):
         paper.save()
 
 
+def analyze_subject_papers_task(subject_id: str, paper_ids: list = None):
+    """
+    Background task to analyze newly uploaded papers of a subject in one job.
+    Services are built once and shared across papers; duplicate detection
+    and topic clustering run once at the end.
+    """
+    from .registry import get_pipeline, pipeline_stats
+    
+    try:
+        subject = Subject.objects.get(id=subject_id)
+    except Subject.DoesNotExist:
+        return None
+    
+    # Syllabus not ingested yet (its task may still be queued) - do it first
+    if subject.syllabus_file and not subject.syllabus_hash:
+        process_syllabus_task(subject_id)
+        subject.refresh_from_db()
+    
+    papers = subject.papers.filter(status=Paper.ProcessingStatus.PENDING)
+    if paper_ids:
+        papers = papers.filter(id__in=paper_ids)
+    papers = list(papers.order_by('created_at'))
+    
+    if not papers:
+        return None
+    
+    results = get_pipeline().analyze_papers(subject, papers)
+    # Saved with the task result so warm/cold worker starts can be compared
+    results['pipeline'] = pipeline_stats()
+    return results
+
+
+def process_syllabus_task(subject_id: str):
+    """
+    Background task to parse a subject's syllabus and store its units and
+    unit embeddings on the modules. Results are cached per file hash.
+    """
+    import logging
+    from .registry import get_pipeline
+    from .services.syllabus import SyllabusService
+    
+    try:
+        subject = Subject.objects.get(id=subject_id)
+        pipeline = get_pipeline()
+        service = SyllabusService(pipeline.embedder, pipeline.ocr_engine)
+        return service.ingest(subject)
+        
+    except Subject.DoesNotExist:
+        pass
+    except Exception as e:
+        logging.error(f"Syllabus processing failed for subject {subject_id}: {e}")
+
+
 def analyze_subject_topics_task(subject_id: str):
     """
     Background task to analyze topics for a subject.
@@ -62,6 +113,26 @@ def queue_paper_analysis(paper: Paper):
     )
 
 
+def queue_subject_analysis(subject: Subject, papers: list = None):
+    """Queue one batch analysis job for a subject's pending papers."""
+    paper_ids = [str(paper.id) for paper in papers] if papers else None
+    async_task(
+        'apps.analysis.tasks.analyze_subject_papers_task',
+        str(subject.id),
+        paper_ids,
+        task_name=f'analyze_subject_{subject.id}'
+    )
+
+
+def queue_syllabus_processing(subject: Subject):
+    """Queue syllabus parsing and embedding for a subject."""
+    async_task(
+        'apps.analysis.tasks.process_syllabus_task',
+        str(subject.id),
+        task_name=f'process_syllabus_{subject.id}'
+    )
+
+
 def queue_topic_analysis(subject: Subject):
     """Queue topic clustering analysis for a subject."""
     async_task(
@@ -1,7 +1,7 @@
 """Views for analysis app."""
 from django.views.generic import DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
@@ -11,6 +11,8 @@ import logging
 logger = logging.getLogger(__name__)
 
 from .models import AnalysisJob
+from apps.analytics.versioning import batch_version_bumps, bump_data_version
+from .events import job_payload, stream_subject_events
 from apps.papers.models import Paper
 from apps.subjects.models import Subject, Module
 from apps.questions.models import Question
@@ -34,26 +36,46 @@ KTU_MODULE_MAPPING = {
 
 
 class AnalysisStatusView(LoginRequiredMixin, View):
-    """Get analysis job status (for HTMX polling)."""
+    """Get analysis job status (polling fallback for the event stream)."""
     
     def get(self, request, pk):
         try:
-            job = AnalysisJob.objects.get(
+            job = AnalysisJob.objects.select_related('paper').get(
                 pk=pk,
                 paper__subject__user=request.user
             )
-            return JsonResponse({
-                'status': job.status,
-                'progress': job.progress,
-                'questions_extracted': job.questions_extracted,
-                'questions_classified': job.questions_classified,
-                'duplicates_found': job.duplicates_found,
-                'error_message': job.error_message,
-            })
+            return JsonResponse(job_payload(job))
         except AnalysisJob.DoesNotExist:
             return JsonResponse({'error': 'Job not found'}, status=404)
 
 
+class AnalysisEventStreamView(LoginRequiredMixin, View):
+    """
+    Server-sent events stream of progress for all of a subject's jobs.
+    Replaces per-job polling; clients fall back to AnalysisStatusView
+    when EventSource is unavailable.
+    """
+    
+    def get(self, request, subject_pk):
+        subject = get_object_or_404(Subject, pk=subject_pk, user=request.user)
+        
+        # EventSource sends Last-Event-ID on reconnect; the query param
+        # lets a client resume explicitly after a full page load.
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_event_id = None
+        
+        response = StreamingHttpResponse(
+            stream_subject_events(subject, last_event_id),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering (nginx)
+        return response
+
+
 class AnalysisDetailView(LoginRequiredMixin, DetailView):
     """View analysis job details."""
     
@@ -80,13 +102,11 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
         
         # Ensure modules exist (create 5 modules for KTU)
         if subject.modules.count() == 0:
-            for i in range(1, 6):
-                Module.objects.create(
-                    subject=subject,
-                    name=f'Module {i}',
-                    number=i,
-                    weightage=20
-                )
+            Module.objects.bulk_create([
+                Module(subject=subject, name=f'Module {i}', number=i, weightage=20)
+                for i in range(1, 6)
+            ])
+            bump_data_version(subject.pk)  # Bulk creates send no signals
         
         processed = 0
         failed = 0
@@ -99,7 +119,8 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
                 paper.save()
                 
                 # Run KTU-specific analysis
-                questions_count = self._analyze_ktu_paper(paper, subject)
+                with batch_version_bumps():
+                    questions_count = self._analyze_ktu_paper(paper, subject)
                 total_questions += questions_count
                 processed += 1
                 
@@ -126,6 +147,10 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
                 messages.success(request, f'✅ Analyzed {processed} paper(s). Extracted {total_questions} questions.')
                 messages.warning(request, f'⚠️ Topic clustering issue: {str(e)}')
         
+        if processed > 0:
+            from apps.analytics.snapshot import safe_refresh_snapshot
+            safe_refresh_snapshot(subject, clusters=False)
+        
         if failed > 0:
             messages.error(request, f'❌ {failed} paper(s) failed: {"; ".join(errors[:2])}')
         
@@ -135,14 +160,18 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
         """Analyze a KTU format paper and extract questions."""
         from django.utils import timezone
         
-        # Extract text from PDF using PyMuPDF
-        text = self._extract_pdf_text(paper.file.path)
+        # Reuse stored page text on re-analysis, else extract (OCRing scanned pages)
+        text = '\n'.join(page_text for _, page_text in paper.iter_page_texts())
+        if not text.strip():
+            page_texts = self._extract_pdf_text(paper.file.path, paper.file_hash)
+            text = '\n'.join(page_texts)
+            # Text is stored per page only, as in the pipeline
+            paper.page_count = len(page_texts)
+            paper.save(update_fields=['page_count', 'updated_at'])
+            paper.save_pages(page_texts)
         
-        if not text or len(text) < 100:
-            raise Exception("Could not extract text from PDF. The file may be scanned/image-based.")
-        
-        paper.raw_text = text
-        paper.save()
+        if len(text) < 100:
+            raise Exception("Could not extract text from PDF. The file may be scanned/image-based and OCR found no text.")
         
         # Parse exam info (month, year) from filename or text
         exam_info = self._parse_exam_info(paper.title, text)
@@ -185,6 +214,7 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
             # Create question
             Question.objects.create(
                 paper=paper,
+                subject_id=paper.subject_id,
                 question_number=str(q_num),
                 text=q_data['text'],
                 marks=q_data.get('marks') or marks,
@@ -200,19 +230,35 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
         
         return created_count
     
-    def _extract_pdf_text(self, file_path):
-        """Extract text from PDF using multiple fallback methods."""
+    def _extract_pdf_text(self, file_path, file_hash=None):
+        """Extract per-page text from a PDF using multiple fallback methods."""
+        # Same file already extracted by an earlier upload
+        if file_hash:
+            from .models import ExtractionCache
+            from .services.pymupdf_extractor import EXTRACTOR_VERSION
+            page_texts = ExtractionCache.objects.filter(
+                file_hash=file_hash,
+                extractor_version=EXTRACTOR_VERSION
+            ).values_list('page_texts', flat=True).first()
+            if page_texts and ''.join(page_texts).strip():
+                return list(page_texts)
+        
+        # Scanned papers: OCR the pages without a text layer (cached per page)
+        try:
+            from .services.ocr import OCREngine
+            page_texts, ocr_pages = OCREngine().extract_page_texts(file_path, file_hash)
+            if ocr_pages and ''.join(page_texts).strip():
+                return page_texts
+        except Exception as e:
+            logger.warning(f"OCR extraction failed: {e}")
+        
         # Try PyPDF2 first (most reliable on Windows)
         try:
             from PyPDF2 import PdfReader
             reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            if text.strip():
-                return text
+            page_texts = [page.extract_text() or '' for page in reader.pages]
+            if ''.join(page_texts).strip():
+                return page_texts
         except Exception as e:
             logger.warning(f"PyPDF2 extraction failed: {e}")
         
@@ -220,12 +266,10 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
         try:
             import fitz  # PyMuPDF
             doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text("text") + "\n"
+            page_texts = [page.get_text("text") for page in doc]
             doc.close()
-            if text.strip():
-                return text
+            if ''.join(page_texts).strip():
+                return page_texts
         except Exception as e:
             logger.warning(f"PyMuPDF extraction failed: {e}")
         
@@ -233,13 +277,9 @@ class ManualAnalyzeView(LoginRequiredMixin, View):
         try:
             import pdfplumber
             with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            if text.strip():
-                return text
+                page_texts = [page.extract_text() or '' for page in pdf.pages]
+            if ''.join(page_texts).strip():
+                return page_texts
         except Exception as e:
             logger.warning(f"pdfplumber extraction failed: {e}")
         
@@ -450,16 +490,26 @@ class ResetAndAnalyzeView(LoginRequiredMixin, View):
     def post(self, request, subject_pk):
         subject = get_object_or_404(Subject, pk=subject_pk, user=request.user)
         
-        # Delete all existing questions for this subject
-        Question.objects.filter(paper__subject=subject).delete()
-        
-        # Delete existing topic clusters
         from apps.analytics.models import TopicCluster
-        TopicCluster.objects.filter(subject=subject).delete()
         
-        # Reset all papers to pending
         papers = subject.papers.all()
-        papers.update(status='pending', processing_error='')
+        with batch_version_bumps():
+            # Delete all existing questions for this subject
+            Question.objects.filter(subject=subject).delete()
+            
+            # Delete existing topic clusters
+            TopicCluster.objects.filter(subject=subject).delete()
+            
+            # Reset all papers to pending (queryset updates send no signals)
+            papers.update(status='pending', processing_error='')
+            bump_data_version(subject.pk)
+        
+        # Start question clustering from scratch as well
+        from .models import SubjectClusterModel
+        SubjectClusterModel.objects.filter(subject=subject).delete()
+        
+        from apps.analytics.snapshot import safe_refresh_snapshot
+        safe_refresh_snapshot(subject)
         
         messages.info(request, f'Reset {papers.count()} paper(s). Click "Start Analysis" to re-analyze.')
         
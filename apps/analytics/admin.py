@@ -2,7 +2,7 @@
 Admin configuration for analytics app.
 """
 from django.contrib import admin
-from .models import TopicCluster
+from .models import TopicCluster, SubjectAnalyticsSnapshot
 
 
 @admin.register(TopicCluster)
@@ -31,3 +31,9 @@ class TopicClusterAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(SubjectAnalyticsSnapshot)
+class SubjectAnalyticsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'version', 'questions_refreshed_at', 'clusters_refreshed_at', 'updated_at')
+    readonly_fields = ('version', 'schema_version', 'questions_refreshed_at', 'clusters_refreshed_at', 'updated_at')
@@ -1,62 +1,96 @@
 """
 Statistics calculator for analytics dashboard.
+
+Every statistic is computed with a fixed number of grouped aggregate
+queries, so the query count does not grow with the number of modules,
+papers or topics.
 """
+import logging
 from typing import Dict, Any, List
 from collections import Counter
-from django.db.models import Count, Avg
+from django.db import DatabaseError, connection
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
 
 from apps.questions.models import Question
 from apps.subjects.models import Subject
 from apps.analytics.models import TopicCluster
 
+logger = logging.getLogger(__name__)
+
 
 class StatsCalculator:
     """Calculates statistics for a subject."""
     
     def __init__(self, subject: Subject):
         self.subject = subject
-        self.questions = Question.objects.filter(paper__subject=subject)
+        self.questions = Question.objects.filter(subject=subject)
+        self.clusters = TopicCluster.objects.filter(subject=subject)
+        self._modules = None
+    
+    @property
+    def modules(self) -> list:
+        """The subject's modules, loaded once per calculator."""
+        if self._modules is None:
+            self._modules = list(self.subject.modules.all())
+        return self._modules
     
     def get_overview(self) -> Dict[str, Any]:
-        """Get overview statistics."""
-        total_questions = self.questions.count()
-        unique_questions = self.questions.filter(is_duplicate=False).count()
-        duplicates = total_questions - unique_questions
+        """Get overview statistics (3 queries)."""
+        question_stats = self.questions.aggregate(
+            total=Count('id'),
+            unique=Count('id', filter=Q(is_duplicate=False)),
+            classified=Count('id', filter=Q(module__isnull=False)),
+        )
+        cluster_stats = self.clusters.aggregate(
+            total=Count('id'),
+            critical=Count('id', filter=Q(priority_tier=TopicCluster.PriorityTier.TIER_1)),
+        )
+        subject_stats = Subject.objects.filter(pk=self.subject.pk).aggregate(
+            papers=Count('papers', filter=Q(papers__is_deleted=False), distinct=True),
+            modules=Count('modules', filter=Q(modules__is_deleted=False), distinct=True),
+        )
         
-        # Count topic clusters
-        total_clusters = TopicCluster.objects.filter(subject=self.subject).count()
-        tier_1_topics = TopicCluster.objects.filter(
-            subject=self.subject,
-            priority_tier=TopicCluster.PriorityTier.TIER_1
-        ).count()
+        total_questions = question_stats['total']
+        duplicates = total_questions - question_stats['unique']
         
         return {
             'total_questions': total_questions,
-            'unique_questions': unique_questions,
+            'unique_questions': question_stats['unique'],
             'duplicates': duplicates,
             'duplicate_percentage': round(duplicates / total_questions * 100, 1) if total_questions else 0,
-            'papers_count': self.subject.papers.count(),
-            'modules_count': self.subject.modules.count(),
-            'total_topics': total_clusters,
-            'critical_topics': tier_1_topics,
+            'classified_questions': question_stats['classified'],
+            'papers_count': subject_stats['papers'],
+            'modules_count': subject_stats['modules'],
+            'total_topics': cluster_stats['total'],
+            'critical_topics': cluster_stats['critical'],
         }
     
+    def get_module_counts(self) -> Dict[Any, int]:
+        """Question count per module id (None for unclassified), in one query."""
+        return dict(
+            self.questions
+            .order_by()
+            .values('module')
+            .annotate(count=Count('id'))
+            .values_list('module', 'count')
+        )
+    
     def get_module_distribution(self) -> List[Dict[str, Any]]:
         """Get question distribution across modules."""
-        modules = self.subject.modules.all()
-        distribution = []
-        
-        for module in modules:
-            count = self.questions.filter(module=module).count()
-            distribution.append({
+        counts = self.get_module_counts()
+        distribution = [
+            {
                 'module': module.name,
                 'module_number': module.number,
-                'count': count,
+                'count': counts.get(module.id, 0),
                 'expected_weightage': float(module.weightage),
-            })
+            }
+            for module in self.modules
+        ]
         
         # Add unclassified
-        unclassified = self.questions.filter(module__isnull=True).count()
+        unclassified = counts.get(None, 0)
         if unclassified:
             distribution.append({
                 'module': 'Unclassified',
@@ -67,11 +101,57 @@ class StatsCalculator:
         
         return distribution
     
+    def get_module_topic_counts(self) -> Dict[Any, Dict[str, int]]:
+        """Topic and critical-topic counts per module id, in one query."""
+        rows = (
+            self.clusters
+            .order_by()
+            .values('module')
+            .annotate(
+                topics=Count('id'),
+                critical=Count('id', filter=Q(priority_tier=TopicCluster.PriorityTier.TIER_1)),
+            )
+        )
+        return {
+            row['module']: {'topics': row['topics'], 'critical': row['critical']}
+            for row in rows
+        }
+    
+    def get_module_difficulty(self) -> Dict[Any, Dict[str, int]]:
+        """Difficulty counts per module id, in one query."""
+        result = {}
+        rows = (
+            self.questions
+            .exclude(difficulty='')
+            .order_by()
+            .values_list('module', 'difficulty')
+            .annotate(count=Count('id'))
+        )
+        for module_id, difficulty, count in rows:
+            result.setdefault(module_id, {})[difficulty] = count
+        return result
+    
+    def get_repeated_topics(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Topics that appeared in two or more exams, most frequent first."""
+        clusters = self.clusters.filter(frequency_count__gte=2).order_by('-frequency_count')[:limit]
+        return [
+            {
+                'id': str(c.id),
+                'topic': c.topic_name,
+                'representative_text': c.representative_text,
+                'question_count': c.frequency_count,
+                'years_appeared': c.years_appeared,
+                'priority': c.get_tier_label(),
+            }
+            for c in clusters
+        ]
+    
     def get_difficulty_distribution(self) -> Dict[str, int]:
         """Get question distribution by difficulty."""
         return dict(
             self.questions
             .exclude(difficulty='')
+            .order_by()
             .values('difficulty')
             .annotate(count=Count('id'))
             .values_list('difficulty', 'count')
@@ -82,58 +162,95 @@ class StatsCalculator:
         return dict(
             self.questions
             .exclude(bloom_level='')
+            .order_by()
             .values('bloom_level')
             .annotate(count=Count('id'))
             .values_list('bloom_level', 'count')
         )
     
     def get_year_trend(self) -> List[Dict[str, Any]]:
-        """Get question count trend by year."""
-        papers = self.subject.papers.exclude(year='').order_by('year')
-        trend = []
-        
-        for paper in papers:
-            count = paper.questions.count()
-            trend.append({
-                'year': paper.year,
-                'paper': paper.title,
-                'question_count': count,
-            })
+        """Get question count trend by year (one query)."""
+        papers = (
+            self.subject.papers
+            .exclude(year='')
+            .annotate(question_count=Count('questions'))
+            .order_by('year')
+            .values('year', 'title', 'question_count')
+        )
         
-        return trend
+        return [
+            {
+                'year': paper['year'],
+                'paper': paper['title'],
+                'question_count': paper['question_count'],
+            }
+            for paper in papers
+        ]
     
     def get_topic_frequency(self, top_n: int = 10) -> List[Dict[str, int]]:
-        """Get most frequent topics."""
-        all_topics = []
-        for question in self.questions.exclude(topics=[]):
-            all_topics.extend(question.topics)
+        """
+        Get most frequent topics.
         
-        counter = Counter(all_topics)
+        On SQLite the topics arrays are expanded with json_each and counted
+        in one GROUP BY query; other databases count in Python over the
+        topics column only.
+        """
+        if connection.vendor == 'sqlite':
+            try:
+                return self._topic_frequency_sql(top_n)
+            except DatabaseError as e:
+                logger.warning(f"json_each topic count failed, counting in Python: {e}")
+        
+        counter = Counter()
+        for topics in self.questions.exclude(topics=[]).values_list('topics', flat=True).iterator():
+            counter.update(topics or [])
         return [{'topic': t, 'count': c} for t, c in counter.most_common(top_n)]
     
+    def _topic_frequency_sql(self, top_n: int) -> List[Dict[str, int]]:
+        """Topic counts via SQLite's json_each, reading only the topics column."""
+        ids_sql, ids_params = self.questions.values('id').query.sql_with_params()
+        table = connection.ops.quote_name(Question._meta.db_table)
+        sql = (
+            f"SELECT topic.value, COUNT(*) AS count "
+            f"FROM {table} AS question, json_each(question.topics) AS topic "
+            f"WHERE question.id IN ({ids_sql}) AND json_valid(question.topics) "
+            f"AND json_type(question.topics) = 'array' "
+            f"GROUP BY topic.value ORDER BY count DESC, topic.value LIMIT %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*ids_params, top_n])
+            return [{'topic': topic, 'count': count} for topic, count in cursor.fetchall()]
+    
     def get_top_topics_per_module(self, top_n: int = 3) -> Dict[int, List[Dict[str, Any]]]:
         """
         Get top N topics for each module based on repetition.
-        Used for the main dashboard graph.
+        Used for the main dashboard graph. One query: clusters are ranked
+        within their module with a window function.
         """
-        modules = self.subject.modules.all()
-        result = {}
+        result = {module.number: [] for module in self.modules}
         
-        for module in modules:
-            clusters = TopicCluster.objects.filter(
-                subject=self.subject,
-                module=module
-            ).order_by('-frequency_count')[:top_n]
-            
-            result[module.number] = [
-                {
-                    'topic': cluster.topic_name,
-                    'frequency': cluster.frequency_count,
-                    'priority': cluster.get_tier_label(),
-                    'marks': cluster.total_marks,
-                }
-                for cluster in clusters
-            ]
+        clusters = (
+            self.clusters
+            .filter(module__isnull=False, module__is_deleted=False)
+            .annotate(
+                module_number=F('module__number'),
+                rank=Window(
+                    RowNumber(),
+                    partition_by=F('module'),
+                    order_by=[F('frequency_count').desc(), F('topic_name').asc()],
+                ),
+            )
+            .filter(rank__lte=top_n)
+            .order_by('module_number', 'rank')
+        )
+        
+        for cluster in clusters:
+            result.setdefault(cluster.module_number, []).append({
+                'topic': cluster.topic_name,
+                'frequency': cluster.frequency_count,
+                'priority': cluster.get_tier_label(),
+                'marks': cluster.total_marks,
+            })
         
         return result
     
@@ -144,28 +261,24 @@ class StatsCalculator:
         except:
             return {}
         
-        clusters = TopicCluster.objects.filter(
-            subject=self.subject,
-            module=module
-        ).order_by('-frequency_count')
+        clusters = list(
+            self.clusters.filter(module=module).order_by('-frequency_count')
+        )
         
         # Group by priority tier
-        by_tier = {}
-        for tier in TopicCluster.PriorityTier:
-            tier_clusters = clusters.filter(priority_tier=tier)
-            by_tier[tier.label] = [
-                {
-                    'topic': c.topic_name,
-                    'frequency': c.frequency_count,
-                    'years': c.years_appeared,
-                    'marks': c.total_marks,
-                }
-                for c in tier_clusters
-            ]
+        by_tier = {tier.label: [] for tier in TopicCluster.PriorityTier}
+        tier_labels = {tier.value: tier.label for tier in TopicCluster.PriorityTier}
+        for c in clusters:
+            by_tier[tier_labels[c.priority_tier]].append({
+                'topic': c.topic_name,
+                'frequency': c.frequency_count,
+                'years': c.years_appeared,
+                'marks': c.total_marks,
+            })
         
         return {
             'module': module,
-            'total_topics': clusters.count(),
+            'total_topics': len(clusters),
             'topics_by_tier': by_tier,
             'all_topics': [
                 {
@@ -11,6 +11,8 @@ from django.db import transaction
 from apps.questions.models import Question
 from apps.subjects.models import Subject, Module
 from apps.analytics.models import TopicCluster
+from apps.analytics.snapshot import safe_refresh_snapshot
+from apps.analytics.versioning import batch_version_bumps
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +48,8 @@ class TopicClusteringService:
         
         # Get all questions for this subject
         questions = Question.objects.filter(
-            paper__subject=self.subject
-        ).select_related('paper', 'module').order_by('module__number', 'question_number')
+            subject=self.subject
+        ).for_clustering().order_by('module__number', 'question_number')
         
         if not questions.exists():
             logger.warning(f"No questions found for subject {self.subject}")
@@ -309,4 +311,9 @@ def analyze_subject_topics(
         tier_2_threshold=tier_2_threshold,
         tier_3_threshold=tier_3_threshold
     )
-    return service.analyze_subject()
+    with batch_version_bumps():
+        stats = service.analyze_subject()
+    
+    # Topic statistics for the dashboard
+    safe_refresh_snapshot(subject, questions=False)
+    return stats
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+        ("subjects", "0005_module_syllabus_unit"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubjectAnalyticsSnapshot",
+            fields=[
+                (
+                    "subject",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="analytics_snapshot",
+                        serialize=False,
+                        to="subjects.subject",
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=0)),
+                ("schema_version", models.PositiveIntegerField(default=0)),
+                ("data", models.JSONField(default=dict)),
+                ("questions_refreshed_at", models.DateTimeField(blank=True, null=True)),
+                ("clusters_refreshed_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Subject Analytics Snapshot",
+                "verbose_name_plural": "Subject Analytics Snapshots",
+            },
+        ),
+    ]
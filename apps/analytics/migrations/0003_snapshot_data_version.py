@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_subjectanalyticssnapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subjectanalyticssnapshot",
+            name="data_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Subject.data_version the snapshot was computed from",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0003_snapshot_data_version"),
+        ("subjects", "0006_subject_data_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="topiccluster",
+            index=models.Index(
+                fields=["module", "-frequency_count", "topic_name", "id"],
+                name="analytics_t_module__7b86b0_idx",
+            ),
+        ),
+    ]
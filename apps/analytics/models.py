@@ -67,6 +67,8 @@ class TopicCluster(BaseModel):
             models.Index(fields=['subject', 'module']),
             models.Index(fields=['priority_tier']),
             models.Index(fields=['-frequency_count']),
+            # Keyset pagination of a module's topics
+            models.Index(fields=['module', '-frequency_count', 'topic_name', 'id']),
         ]
     
     def __str__(self):
@@ -96,3 +98,38 @@ class TopicCluster(BaseModel):
             self.PriorityTier.TIER_4: 'Low Priority',
         }
         return tier_map.get(self.priority_tier, 'Unknown')
+
+
+class SubjectAnalyticsSnapshot(models.Model):
+    """
+    Precomputed analytics for a subject, served by the dashboard and the
+    chart API in a single primary-key lookup.
+    
+    Question statistics are refreshed when a paper's analysis finishes and
+    topic statistics when clustering finishes; `version` is bumped on every
+    refresh.
+    """
+    
+    subject = models.OneToOneField(
+        'subjects.Subject',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='analytics_snapshot'
+    )
+    version = models.PositiveIntegerField(default=0)
+    schema_version = models.PositiveIntegerField(default=0)
+    data_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Subject.data_version the snapshot was computed from'
+    )
+    data = models.JSONField(default=dict)
+    questions_refreshed_at = models.DateTimeField(null=True, blank=True)
+    clusters_refreshed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Subject Analytics Snapshot'
+        verbose_name_plural = 'Subject Analytics Snapshots'
+    
+    def __str__(self):
+        return f"Analytics snapshot: {self.subject} (v{self.version})"
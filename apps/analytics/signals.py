@@ -0,0 +1,49 @@
+"""
+Signal handlers keeping Subject.data_version current.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.papers.models import Paper
+from apps.questions.models import Question
+from apps.subjects.models import Module
+from .models import TopicCluster
+from .versioning import bump_data_version
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    """A question was added, edited or removed."""
+    if instance.subject_id:
+        bump_data_version(instance.subject_id)
+
+
+@receiver(post_save, sender=TopicCluster)
+@receiver(post_delete, sender=TopicCluster)
+def topic_cluster_changed(sender, instance, **kwargs):
+    """A topic cluster was added, edited or removed."""
+    bump_data_version(instance.subject_id)
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def module_changed(sender, instance, **kwargs):
+    """
+    A module was added, edited or removed. Deleting a module also
+    unclassifies its questions (SET_NULL) without saving them.
+    """
+    bump_data_version(instance.subject_id)
+
+
+@receiver(post_save, sender=Paper)
+def paper_saved(sender, instance, created, update_fields=None, **kwargs):
+    """A paper was added, renamed, re-dated or soft-deleted."""
+    if created or instance.changed_fields(Paper.ANALYTICS_FIELDS, update_fields):
+        bump_data_version(instance.subject_id)
+
+
+@receiver(post_delete, sender=Paper)
+def paper_deleted(sender, instance, **kwargs):
+    """A paper was removed."""
+    bump_data_version(instance.subject_id)
@@ -0,0 +1,190 @@
+"""
+Materialized per-subject analytics.
+
+SubjectAnalyticsSnapshot stores the output of StatsCalculator so the
+dashboard and chart API read one row instead of recomputing from Question
+and TopicCluster on every request. Question-derived and cluster-derived
+sections are refreshed separately, by the pipeline and by topic
+clustering respectively, and each records the subject data version it
+was computed from. Sections older than the subject's data version (e.g.
+after a question was edited by hand) are rebuilt on next access.
+"""
+import logging
+from typing import Any, Dict
+
+from django.utils import timezone
+
+from .calculator import StatsCalculator
+from .models import SubjectAnalyticsSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of `data` changes; older snapshots are rebuilt in full
+SCHEMA_VERSION = 2
+
+TOP_TOPICS_PER_MODULE = 3
+
+SECTIONS = ('questions', 'clusters')
+
+
+def _question_sections(calculator: StatsCalculator) -> Dict[str, Any]:
+    overview = calculator.get_overview()
+    return {
+        'question_overview': {
+            key: overview[key]
+            for key in (
+                'total_questions', 'unique_questions', 'duplicates', 'duplicate_percentage',
+                'classified_questions', 'papers_count', 'modules_count',
+            )
+        },
+        'module_counts': {str(k): v for k, v in calculator.get_module_counts().items()},
+        'module_difficulty': {str(k): v for k, v in calculator.get_module_difficulty().items()},
+        'difficulty_distribution': calculator.get_difficulty_distribution(),
+        'bloom_distribution': calculator.get_bloom_distribution(),
+        'year_trend': calculator.get_year_trend(),
+        'top_topics': calculator.get_topic_frequency(),
+    }
+
+
+def _cluster_sections(calculator: StatsCalculator) -> Dict[str, Any]:
+    counts = calculator.get_module_topic_counts()
+    return {
+        'cluster_overview': {
+            'total_topics': sum(c['topics'] for c in counts.values()),
+            'critical_topics': sum(c['critical'] for c in counts.values()),
+        },
+        'module_topic_counts': {str(k): v for k, v in counts.items()},
+        'top_topics_per_module': {
+            str(number): topics
+            for number, topics in calculator.get_top_topics_per_module(TOP_TOPICS_PER_MODULE).items()
+        },
+        'repeated_topics': calculator.get_repeated_topics(),
+    }
+
+
+def _compose(calculator: StatsCalculator, data: Dict[str, Any]) -> None:
+    """Derive the combined overview and per-module rows from the stored sections."""
+    data['overview'] = {**data.get('question_overview', {}), **data.get('cluster_overview', {})}
+
+    module_counts = data.get('module_counts', {})
+    module_difficulty = data.get('module_difficulty', {})
+    topic_counts = data.get('module_topic_counts', {})
+    top_topics = data.get('top_topics_per_module', {})
+    total = data['overview'].get('total_questions', 0)
+
+    modules = []
+    for module in calculator.modules:
+        key = str(module.id)
+        count = module_counts.get(key, 0)
+        difficulty = module_difficulty.get(key, {})
+        modules.append({
+            'id': key,
+            'name': module.name,
+            'number': module.number,
+            'count': count,
+            'percentage': round(count / total * 100, 1) if total else 0,
+            'expected_weightage': float(module.weightage),
+            'easy': difficulty.get('easy', 0),
+            'medium': difficulty.get('medium', 0),
+            'hard': difficulty.get('hard', 0),
+            'topic_count': topic_counts.get(key, {}).get('topics', 0),
+            'critical_topics': topic_counts.get(key, {}).get('critical', 0),
+            'top_topics': [
+                dict(topic, name=topic['topic'])
+                for topic in top_topics.get(str(module.number), [])
+            ],
+        })
+    data['modules'] = modules
+
+    unclassified = module_counts.get('None', 0)
+    data['module_distribution'] = [
+        {
+            'module': module['name'],
+            'module_number': module['number'],
+            'count': module['count'],
+            'expected_weightage': module['expected_weightage'],
+        }
+        for module in modules
+    ]
+    if unclassified:
+        data['module_distribution'].append({
+            'module': 'Unclassified',
+            'module_number': 0,
+            'count': unclassified,
+            'expected_weightage': 0,
+        })
+
+
+def refresh_snapshot(subject, questions: bool = True, clusters: bool = True) -> SubjectAnalyticsSnapshot:
+    """
+    Recompute the requested sections of a subject's snapshot.
+
+    Args:
+        subject: Subject instance
+        questions: Refresh question statistics (after paper analysis)
+        clusters: Refresh topic statistics (after topic clustering)
+
+    Returns:
+        The saved snapshot
+    """
+    from apps.subjects.models import Subject
+
+    # Read before computing, so writes made meanwhile trigger another refresh
+    data_version = Subject.objects.filter(pk=subject.pk).values_list('data_version', flat=True).first() or 0
+
+    snapshot = SubjectAnalyticsSnapshot.objects.filter(pk=subject.pk).first()
+    if snapshot is None or snapshot.schema_version != SCHEMA_VERSION:
+        snapshot = snapshot or SubjectAnalyticsSnapshot(subject=subject)
+        snapshot.data = {}
+        snapshot.schema_version = SCHEMA_VERSION
+        questions = clusters = True
+
+    calculator = StatsCalculator(subject)
+    now = timezone.now()
+    data = dict(snapshot.data)
+
+    section_versions = dict(data.get('section_versions', {}))
+
+    if questions:
+        data.update(_question_sections(calculator))
+        section_versions['questions'] = data_version
+        snapshot.questions_refreshed_at = now
+    if clusters:
+        data.update(_cluster_sections(calculator))
+        section_versions['clusters'] = data_version
+        snapshot.clusters_refreshed_at = now
+    _compose(calculator, data)
+
+    data['section_versions'] = section_versions
+    snapshot.data = data
+    # The oldest section decides whether the snapshot is stale
+    snapshot.data_version = min(section_versions.get(section, 0) for section in SECTIONS)
+    snapshot.version += 1
+    snapshot.save()
+
+    logger.info(f"Analytics snapshot for {subject} refreshed (v{snapshot.version})")
+    return snapshot
+
+
+def safe_refresh_snapshot(subject, **sections) -> None:
+    """refresh_snapshot for callers that must not fail because of analytics."""
+    try:
+        refresh_snapshot(subject, **sections)
+    except Exception as e:
+        logger.error(f"Analytics snapshot refresh failed for {subject}: {e}", exc_info=True)
+
+
+def get_snapshot(subject) -> SubjectAnalyticsSnapshot:
+    """The subject's snapshot, built on first access and after untracked changes."""
+    snapshot = SubjectAnalyticsSnapshot.objects.filter(pk=subject.pk).first()
+    if snapshot is None or snapshot.schema_version != SCHEMA_VERSION:
+        return refresh_snapshot(subject)
+    if snapshot.data_version < subject.data_version:
+        # Rebuild only the sections computed before the latest change
+        section_versions = snapshot.data.get('section_versions', {})
+        stale = {
+            section: section_versions.get(section, 0) < subject.data_version
+            for section in SECTIONS
+        }
+        snapshot = refresh_snapshot(subject, **stale)
+    return snapshot
@@ -0,0 +1,72 @@
+"""
+Tests for the analytics statistics calculator.
+"""
+from django.test import TestCase
+
+from apps.analytics.calculator import StatsCalculator
+from apps.analytics.models import TopicCluster
+from apps.papers.models import Paper
+from apps.questions.models import Question
+from apps.subjects.models import Module, Subject
+from apps.users.models import User
+
+# Queries for get_complete_stats: overview (3), module counts, modules,
+# difficulty, Bloom level, year trend, topic frequency and top topics
+COMPLETE_STATS_QUERIES = 10
+
+
+class StatsCalculatorQueryCountTests(TestCase):
+    """get_complete_stats runs a fixed number of queries."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='analytics', email='analytics@example.com')
+
+    def make_subject(self, size):
+        """A subject with `size` modules and papers, each paper with a question per module."""
+        subject = Subject.objects.create(user=self.user, name=f'Subject {size}')
+        modules = [
+            Module.objects.create(subject=subject, name=f'Module {n}', number=n)
+            for n in range(1, size + 1)
+        ]
+        for n in range(size):
+            paper = Paper.objects.create(
+                subject=subject, title=f'Paper {n}', year=str(2015 + n),
+                file=f'papers/paper{n}.pdf',
+            )
+            for module in modules:
+                Question.objects.create(
+                    paper=paper, subject=subject, module=module,
+                    question_number=str(module.number),
+                    text=f'Explain topic {module.number}',
+                    topics=[f'topic {module.number}'],
+                    difficulty=Question.DifficultyLevel.MEDIUM,
+                    bloom_level=Question.BloomLevel.UNDERSTAND,
+                )
+        for module in modules:
+            TopicCluster.objects.create(
+                subject=subject, module=module,
+                topic_name=f'topic {module.number}', normalized_key=f'topic {module.number}',
+                frequency_count=size,
+            )
+        return subject
+
+    def assert_stats_queries(self, subject):
+        calculator = StatsCalculator(subject)
+        with self.assertNumQueries(COMPLETE_STATS_QUERIES):
+            return calculator.get_complete_stats()
+
+    def test_one_module_and_paper(self):
+        stats = self.assert_stats_queries(self.make_subject(1))
+
+        self.assertEqual(stats['overview']['total_questions'], 1)
+        self.assertEqual(stats['overview']['papers_count'], 1)
+        self.assertEqual(len(stats['year_trend']), 1)
+
+    def test_query_count_does_not_grow(self):
+        stats = self.assert_stats_queries(self.make_subject(6))
+
+        self.assertEqual(stats['overview']['total_questions'], 36)
+        self.assertEqual(stats['overview']['modules_count'], 6)
+        self.assertEqual(len(stats['module_distribution']), 6)
+        self.assertEqual(len(stats['year_trend']), 6)
+        self.assertEqual(len(stats['top_topics_per_module']), 6)
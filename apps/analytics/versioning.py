@@ -0,0 +1,49 @@
+"""
+Per-subject data version.
+
+Subject.data_version is bumped whenever a subject's questions, topic
+clusters, modules or papers change. Analytics caches and HTTP validators (ETag and
+Last-Modified) are keyed by it, so nothing cached needs explicit
+invalidation.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db.models import F
+from django.utils import timezone
+
+_local = threading.local()
+
+
+def bump_data_version(subject_id) -> None:
+    """Increment a subject's data version (deferred inside batch_version_bumps)."""
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending.add(subject_id)
+        return
+
+    from apps.subjects.models import Subject
+    Subject.objects.filter(pk=subject_id).update(
+        data_version=F('data_version') + 1,
+        data_updated_at=timezone.now()
+    )
+
+
+@contextmanager
+def batch_version_bumps():
+    """
+    Collect version bumps from bulk writes and apply them once per subject
+    on exit, instead of one UPDATE per saved question or cluster.
+    """
+    if getattr(_local, 'pending', None) is not None:
+        # Nested: the outermost block applies the bumps
+        yield
+        return
+
+    _local.pending = set()
+    try:
+        yield
+    finally:
+        subject_ids, _local.pending = _local.pending, None
+        for subject_id in subject_ids:
+            bump_data_version(subject_id)
@@ -4,11 +4,56 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, redirect
 from django.http import JsonResponse, HttpResponse, FileResponse
 from django.contrib import messages
+from django.core.cache import cache
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.db.models import Count, Q
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from pathlib import Path
 
+from apps.core.mixins import HTMXResponseMixin
+from apps.core.pagination import keyset_paginate
 from apps.subjects.models import Subject, Module
 from apps.analytics.models import TopicCluster
-from .calculator import StatsCalculator
+from .snapshot import get_snapshot
+
+ANALYTICS_CACHE_TIMEOUT = getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 24 * 60 * 60)
+
+TOPIC_PAGE_SIZE = getattr(settings, 'ANALYTICS_TOPIC_PAGE_SIZE', 50)
+
+# Unique sort key for keyset pagination of a module's topics
+TOPIC_ORDERING = ['-frequency_count', 'topic_name', 'id']
+
+
+def _subject_version(request, subject_pk):
+    """
+    (data_version, data_updated_at) of the user's subject, or None.
+    Looked up once per request and shared by the ETag and Last-Modified checks.
+    """
+    cached = getattr(request, '_subject_versions', {})
+    if subject_pk not in cached:
+        cached[subject_pk] = Subject.objects.filter(
+            pk=subject_pk, user=request.user
+        ).values_list('data_version', 'data_updated_at').first()
+        request._subject_versions = cached
+    return cached[subject_pk]
+
+
+def _analytics_etag(request, subject_pk):
+    version = _subject_version(request, subject_pk)
+    return f'{subject_pk}-{version[0]}' if version else None
+
+
+def _analytics_last_modified(request, subject_pk):
+    version = _subject_version(request, subject_pk)
+    return version[1] if version else None
+
+
+def _cache_key(name: str, subject) -> str:
+    """Cache key that changes whenever the subject's data does."""
+    return f'analytics:{name}:{subject.pk}:v{subject.data_version}'
 
 
 class AnalyticsDashboardView(LoginRequiredMixin, TemplateView):
@@ -22,46 +67,23 @@ class AnalyticsDashboardView(LoginRequiredMixin, TemplateView):
         subject = get_object_or_404(
             Subject, pk=self.kwargs['subject_pk'], user=self.request.user
         )
+        context['subject'] = subject
         
-        calculator = StatsCalculator(subject)
-        stats = calculator.get_complete_stats()
-        
-        # Get top topics per module for the main graph
-        top_topics = calculator.get_top_topics_per_module(top_n=3)
-        
-        # Get all modules with their topic counts
-        modules = subject.modules.all()
-        module_data = []
-        module_labels = []
-        module_counts = []
-        
-        for module in modules:
-            topic_count = TopicCluster.objects.filter(
-                subject=subject,
-                module=module
-            ).count()
-            tier_1_count = TopicCluster.objects.filter(
-                subject=subject,
-                module=module,
-                priority_tier=TopicCluster.PriorityTier.TIER_1
-            ).count()
-            
-            # Count questions in this module
-            question_count = module.questions.count()
-            module_labels.append(f'Module {module.number}')
-            module_counts.append(question_count)
-            
-            module_data.append({
-                'module': module,
-                'topic_count': topic_count,
-                'critical_topics': tier_1_count,
-                'top_topics': top_topics.get(module.number, []),
-                'question_count': question_count,
-            })
+        key = _cache_key('dashboard', subject)
+        cached = cache.get(key)
+        if cached is not None:
+            context.update(cached)
+            return context
+        
+        # Precomputed statistics, one primary-key lookup
+        snapshot = get_snapshot(subject)
+        stats = snapshot.data
+        overview = stats['overview']
+        module_data = stats['modules']
         
         # Prepare chart data as JSON for JavaScript
-        context['module_labels'] = json.dumps(module_labels)
-        context['module_data'] = json.dumps(module_counts)
+        context['module_labels'] = json.dumps([f"Module {m['number']}" for m in module_data])
+        context['module_data'] = json.dumps([m['count'] for m in module_data])
         
         # Bloom's taxonomy data
         bloom_dist = stats['bloom_distribution']
@@ -92,44 +114,47 @@ class AnalyticsDashboardView(LoginRequiredMixin, TemplateView):
         context['year_data'] = json.dumps(year_data)
         
         # Compute additional stats
-        total_questions = stats['overview']['total_questions']
-        total_papers = stats['overview']['papers_count']
-        repeated_questions = stats['overview']['duplicates']
+        total_questions = overview['total_questions']
         
         # Classification rate = questions with modules assigned
-        from apps.questions.models import Question
-        questions_with_module = Question.objects.filter(
-            paper__subject=subject,
-            module__isnull=False
-        ).count()
-        classification_rate = round(questions_with_module / total_questions * 100, 1) if total_questions else 0
+        classification_rate = (
+            round(overview['classified_questions'] / total_questions * 100, 1) if total_questions else 0
+        )
         
-        context['subject'] = subject
+        context['snapshot_version'] = snapshot.version
         context['stats'] = {
-            **stats['overview'],
-            'total_papers': total_papers,
+            **overview,
+            'total_papers': overview['papers_count'],
             'total_questions': total_questions,
-            'repeated_questions': repeated_questions,
+            'repeated_questions': overview['duplicates'],
             'classification_rate': classification_rate,
         }
         context['modules'] = module_data
         context['module_stats'] = module_data  # For template compatibility
-        context['has_analysis'] = TopicCluster.objects.filter(subject=subject).exists()
+        context['has_analysis'] = overview['total_topics'] > 0
         
-        # Get repeated questions (tier 1 and tier 2 topics)
-        repeated_clusters = TopicCluster.objects.filter(
-            subject=subject,
-            frequency_count__gte=2
-        ).order_by('-frequency_count')[:10]
-        context['repeated_questions'] = repeated_clusters
+        # Repeated questions (topics seen in two or more exams)
+        context['repeated_questions'] = stats['repeated_topics']
         
+        cache.set(
+            key,
+            {name: value for name, value in context.items() if name not in ('view', 'subject')},
+            ANALYTICS_CACHE_TIMEOUT
+        )
         return context
 
 
-class ModuleAnalyticsView(LoginRequiredMixin, TemplateView):
-    """Detailed analytics for a specific module."""
+class ModuleAnalyticsView(LoginRequiredMixin, HTMXResponseMixin, TemplateView):
+    """
+    Detailed analytics for a specific module.
+    
+    Topics are listed a page at a time (keyset-paginated on
+    TOPIC_ORDERING); scrolling to the end of the table fetches the next
+    page's rows via htmx_template_name.
+    """
     
     template_name = 'analytics/module_detail.html'
+    htmx_template_name = 'partials/topic_rows.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -139,28 +164,28 @@ class ModuleAnalyticsView(LoginRequiredMixin, TemplateView):
         module_number = self.kwargs['module_number']
         module = get_object_or_404(Module, subject=subject, number=module_number)
         
-        calculator = StatsCalculator(subject)
-        module_stats = calculator.get_module_topic_stats(module_number)
-        
-        # Get all topic clusters for this module
-        topics = TopicCluster.objects.filter(
-            subject=subject,
-            module=module
-        ).order_by('-frequency_count')
-        
-        # Count topics by tier
-        tier_counts = {
-            'tier_1': topics.filter(priority_tier=TopicCluster.PriorityTier.TIER_1).count(),
-            'tier_2': topics.filter(priority_tier=TopicCluster.PriorityTier.TIER_2).count(),
-            'tier_3': topics.filter(priority_tier=TopicCluster.PriorityTier.TIER_3).count(),
-            'tier_4': topics.filter(priority_tier=TopicCluster.PriorityTier.TIER_4).count(),
-        }
+        topics = TopicCluster.objects.filter(subject=subject, module=module)
+        try:
+            page = keyset_paginate(
+                topics, TOPIC_ORDERING, self.request.GET.get('cursor'), TOPIC_PAGE_SIZE
+            )
+            rank_offset = max(int(self.request.GET.get('rank', 0)), 0)
+        except ValueError as e:
+            raise BadRequest(str(e))
         
         context['subject'] = subject
         context['module'] = module
-        context['stats'] = module_stats
-        context['topics'] = topics
-        context['tier_counts'] = tier_counts
+        context['topics'] = page.object_list
+        context['page'] = page
+        context['rank_offset'] = rank_offset
+        context['next_rank'] = rank_offset + len(page.object_list)
+        
+        if not self.is_htmx_request():
+            # Count topics by tier
+            context['tier_counts'] = topics.aggregate(**{
+                tier.value: Count('id', filter=Q(priority_tier=tier.value))
+                for tier in TopicCluster.PriorityTier
+            })
         
         return context
 
@@ -191,16 +216,32 @@ class TriggerTopicAnalysisView(LoginRequiredMixin, View):
 
 
 class AnalyticsAPIView(LoginRequiredMixin, View):
-    """API endpoint for analytics data (for Chart.js)."""
+    """
+    API endpoint for analytics data (for Chart.js).
+    
+    Responses are cached per subject data version and carry ETag and
+    Last-Modified headers, so unchanged data is answered with a 304.
+    """
     
+    @method_decorator(condition(etag_func=_analytics_etag, last_modified_func=_analytics_last_modified))
     def get(self, request, subject_pk):
         subject = get_object_or_404(
             Subject, pk=subject_pk, user=request.user
         )
         
-        calculator = StatsCalculator(subject)
-        stats = calculator.get_complete_stats()
+        key = _cache_key('api', subject)
+        chart_data = cache.get(key)
+        if chart_data is None:
+            chart_data = self.build_chart_data(get_snapshot(subject).data)
+            cache.set(key, chart_data, ANALYTICS_CACHE_TIMEOUT)
         
+        response = JsonResponse(chart_data)
+        # Browsers must revalidate, which the ETag makes cheap
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    def build_chart_data(self, stats):
+        """Format snapshot data for the charts."""
         # Format data for charts
         chart_data = {
             'overview': stats['overview'],
@@ -226,4 +267,4 @@ class AnalyticsAPIView(LoginRequiredMixin, View):
                     'priority': topic['priority']
                 })
         
-        return JsonResponse(chart_data)
+        return chart_data
@@ -0,0 +1 @@
+# Custom management commands
@@ -0,0 +1,116 @@
+"""
+Management command printing the query plan of the application's hot
+queries, to check that they are served by indexes, rows included.
+Usage: python manage.py explain_hot_queries [--subject <uuid>] [--fail-on-scan]
+"""
+import re
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from apps.analytics.models import TopicCluster
+from apps.analytics.views import TOPIC_ORDERING
+from apps.papers.models import Paper
+from apps.questions.models import Question
+from apps.questions.views import QUESTION_ORDERING
+from apps.subjects.models import Module, Subject
+
+# SQLite plan lines that read a whole table rather than an index range
+FULL_SCAN = re.compile(r'\bSCAN (?!.*\bUSING\b)(?!CONSTANT ROW)')
+# SQLite plan lines that sort rows instead of reading them in index order
+TEMP_B_TREE = re.compile(r'\bUSE TEMP B-TREE\b')
+
+
+def hot_queries(subject_id, module_id, user_id):
+    """(name, queryset) pairs mirroring the queries run by views and services."""
+    subject_questions = Question.objects.filter(subject_id=subject_id).order_by()
+    return [
+        ('question list page', Question.objects.filter(
+            subject__user_id=user_id, subject_id=subject_id
+        ).for_list().order_by(*QUESTION_ORDERING)[:51]),
+        ('question list, difficulty filter', Question.objects.filter(
+            subject_id=subject_id, difficulty='hard'
+        ).for_list().order_by(*QUESTION_ORDERING)[:51]),
+        ('question list, bloom filter', Question.objects.filter(
+            subject_id=subject_id, bloom_level='apply'
+        ).for_list().order_by(*QUESTION_ORDERING)[:51]),
+        ('questions per module', subject_questions.values('module').annotate(count=Count('id'))),
+        ('difficulty per module', subject_questions.exclude(difficulty='').values_list(
+            'module', 'difficulty'
+        ).annotate(count=Count('id'))),
+        ('bloom distribution', subject_questions.exclude(bloom_level='').values(
+            'bloom_level'
+        ).annotate(count=Count('id'))),
+        ('unique questions', subject_questions.filter(is_duplicate=False).values('id')),
+        ('module report, part A', Question.objects.filter(
+            module_id=module_id, part='A'
+        ).for_report().order_by('year', 'question_number')),
+        ('upload duplicate check', Paper.objects.filter(
+            subject_id=subject_id, file_hash__in=['0' * 64]
+        ).order_by().values_list('file_hash', flat=True)),
+        ('pending papers', Paper.objects.filter(subject_id=subject_id, status=Paper.ProcessingStatus.PENDING)),
+        ('paper status counts', Paper.objects.filter(subject_id=subject_id).values(
+            'status'
+        ).annotate(count=Count('id')).order_by()),
+        ('module topic page', TopicCluster.objects.filter(
+            subject_id=subject_id, module_id=module_id
+        ).order_by(*TOPIC_ORDERING)[:51]),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN (QUERY PLAN on SQLite) for the hot question, paper and topic queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subject', help='Explain with this subject (defaults to any subject)')
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Exit with an error if a query reads a table without an index or sorts '
+                 'in a temp B-tree (SQLite only)'
+        )
+
+    def handle(self, *args, **options):
+        subject = Subject.all_objects.filter(pk=options['subject']) if options['subject'] else Subject.all_objects
+        subject = subject.values('id', 'user_id').first()
+        if options['subject'] and subject is None:
+            raise CommandError(f"Subject {options['subject']} not found")
+
+        # Plans do not depend on the parameter values, so any ids will do
+        subject_id = subject['id'] if subject else uuid.uuid4()
+        user_id = subject['user_id'] if subject else 0
+        module_id = (
+            Module.all_objects.filter(subject_id=subject_id).values_list('id', flat=True).first()
+            or uuid.uuid4()
+        )
+
+        sqlite = connection.vendor == 'sqlite'
+        scans = []
+        for name, queryset in hot_queries(subject_id, module_id, user_id):
+            plan = queryset.explain()
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            if sqlite:
+                full_scans = [line.strip() for line in plan.splitlines() if FULL_SCAN.search(line)]
+                sorts = [line.strip() for line in plan.splitlines() if TEMP_B_TREE.search(line)]
+                if full_scans or sorts:
+                    scans.append(name)
+                if full_scans:
+                    self.stdout.write(self.style.WARNING(f"  full scan: {'; '.join(full_scans)}"))
+                if sorts:
+                    self.stdout.write(self.style.WARNING(f"  temp B-tree: {'; '.join(sorts)}"))
+            self.stdout.write('')
+
+        if not sqlite:
+            self.stdout.write(f'Plans shown as reported by {connection.vendor}; index check is SQLite-only')
+        elif scans:
+            message = (
+                f"{len(scans)} queries read a table without an index or sort in a temp B-tree: "
+                f"{', '.join(scans)}"
+            )
+            if options['fail_on_scan']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('All hot queries are served by indexes'))
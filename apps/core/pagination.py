@@ -0,0 +1,95 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of OFFSET, each page continues after the sort key of the previous
+page's last row, so fetching a page costs the same however deep it is and
+rows inserted meanwhile do not shift later pages. The sort key must be
+unique (end it with the primary key) and its columns must not be NULL.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of rows plus the cursor of the page after it."""
+
+    def __init__(self, object_list: List[Any], next_cursor: Optional[str]):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque, URL-safe cursor for a row's sort key."""
+    raw = json.dumps([str(value) if not isinstance(value, (int, float)) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    """
+    Sort key stored in a cursor.
+
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor for a key of this length
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid cursor: {e}')
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError('Invalid cursor: wrong key length')
+    return values
+
+
+def _sort_value(obj, field: str):
+    value = obj
+    for part in field.split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def _after(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """Rows strictly after `values` in `ordering`, as (a > x) | (a = x & b > y) | ..."""
+    condition = Q()
+    for index, key in enumerate(ordering):
+        field = key.lstrip('-')
+        lookup = 'lt' if key.startswith('-') else 'gt'
+        clause = Q(**{f'{field}__{lookup}': values[index]})
+        for previous_key, previous_value in zip(ordering[:index], values):
+            clause &= Q(**{previous_key.lstrip('-'): previous_value})
+        condition |= clause
+    return condition
+
+
+def keyset_paginate(queryset, ordering: Sequence[str], cursor: Optional[str], per_page: int) -> KeysetPage:
+    """
+    Fetch the page of `queryset` that follows `cursor` (the first page if None).
+
+    Args:
+        queryset: Rows to paginate; its own ordering is replaced
+        ordering: Unique sort key, e.g. ['year', 'question_number', 'id']
+        cursor: next_cursor of the previous page
+        per_page: Rows per page
+
+    Raises:
+        ValueError: For a malformed cursor
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        queryset = queryset.filter(_after(ordering, decode_cursor(cursor, len(ordering))))
+
+    # One extra row tells whether another page exists
+    rows = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([_sort_value(last, key.lstrip('-')) for key in ordering])
+    return KeysetPage(object_list=rows, next_cursor=next_cursor)
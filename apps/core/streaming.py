@@ -0,0 +1,53 @@
+"""
+File-like helpers for streaming responses.
+
+Writers such as csv.writer, zipfile and pyarrow expect a file; these
+objects hand what is written back to a generator feeding
+StreamingHttpResponse instead of building the whole body first.
+"""
+
+
+class Echo:
+    """Pseudo-buffer whose write() returns the value instead of storing it."""
+    
+    def write(self, value):
+        return value
+
+
+class ChunkSink:
+    """
+    Write-only, non-seekable file object that collects bytes until drained.
+    
+    zipfile writes data descriptors instead of seeking back when the target
+    cannot seek, so an archive can be streamed through it.
+    """
+    
+    closed = False
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def writable(self) -> bool:
+        return True
+    
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
@@ -26,7 +26,7 @@ class DashboardView(TemplateView):
         if user.is_authenticated:
             context['total_subjects'] = user.subjects.count() if hasattr(user, 'subjects') else 0
             context['total_papers'] = Paper.objects.filter(subject__user=user).count()
-            context['total_questions'] = Question.objects.filter(paper__subject__user=user).count()
+            context['total_questions'] = Question.objects.filter(subject__user=user).count()
             
             # Get recent subjects
             context['recent_subjects'] = user.subjects.all()[:5] if hasattr(user, 'subjects') else []
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0002_initial"),
+        ("subjects", "0006_subject_data_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="paper",
+            index=models.Index(
+                fields=["subject", "year"], name="papers_pape_subject_9cf91b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0003_paper_subject_year_index"),
+        ("subjects", "0006_subject_data_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="paper",
+            index=models.Index(
+                fields=["subject", "status"], name="papers_pape_subject_0eebf1_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paper",
+            index=models.Index(
+                fields=["subject", "file_hash"], name="papers_pape_subject_e58f34_idx"
+            ),
+        ),
+    ]
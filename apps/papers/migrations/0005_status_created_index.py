@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0004_hot_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="paper",
+            name="papers_pape_subject_0eebf1_idx",
+        ),
+        migrations.AddIndex(
+            model_name="paper",
+            index=models.Index(
+                fields=["subject", "status", "created_at"],
+                name="papers_pape_subject_9e6488_idx",
+            ),
+        ),
+    ]
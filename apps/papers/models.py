@@ -1,9 +1,55 @@
 """
 Paper models for uploaded question papers.
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DEFERRED, OuterRef, Subquery
 from django.conf import settings
-from apps.core.models import SoftDeleteModel
+from apps.core.models import SoftDeleteModel, SoftDeleteManager
+
+
+class PaperQuerySet(models.QuerySet):
+    """
+    Paper querysets. update() keeps the copies of subject and year on the
+    papers' questions in step, as Paper.save() does for one paper.
+    """
+    
+    # Paper fields copied onto Question, by update() keyword
+    QUESTION_COPIES = {'subject': 'subject_id', 'subject_id': 'subject_id', 'year': 'year'}
+    
+    def update(self, **kwargs):
+        copied = {self.QUESTION_COPIES[name] for name in kwargs if name in self.QUESTION_COPIES}
+        if not copied:
+            return super().update(**kwargs)
+        
+        from apps.analytics.versioning import batch_version_bumps, bump_data_version
+        from apps.questions.models import Question
+        
+        with transaction.atomic(using=self.db), batch_version_bumps():
+            papers = dict(self.values_list('pk', 'subject_id'))
+            count = super().update(**kwargs)
+            
+            updated = self.model._base_manager.filter(pk=OuterRef('paper_id'))
+            Question.objects.filter(paper_id__in=papers).update(**{
+                field: Subquery(updated.values(field)[:1]) for field in copied
+            })
+            
+            # Queryset updates send no signals
+            subject_ids = set(papers.values()) | set(
+                self.model._base_manager.filter(pk__in=papers).values_list('subject_id', flat=True)
+            )
+            for subject_id in subject_ids:
+                bump_data_version(subject_id)
+        return count
+
+
+class PaperManager(SoftDeleteManager.from_queryset(PaperQuerySet)):
+    """
+    Default paper manager. The full document text is only needed by the
+    analysis pipeline, so it is deferred; per-page text lives in PaperPage.
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().defer('raw_text')
 
 
 class Paper(SoftDeleteModel):
@@ -46,17 +92,118 @@ class Paper(SoftDeleteModel):
     # Metadata
     notes = models.TextField(blank=True)
     
+    objects = PaperManager()
+    all_objects = models.Manager.from_queryset(PaperQuerySet)()
+    
     class Meta:
         verbose_name = 'Paper'
         verbose_name_plural = 'Papers'
         ordering = ['-created_at']
+        indexes = [
+            # Year-ordered question and paper listings within a subject
+            models.Index(fields=['subject', 'year']),
+            # Status counts and the pending-paper queue (in Meta.ordering)
+            models.Index(fields=['subject', 'status', 'created_at']),
+            # Duplicate check on every upload
+            models.Index(fields=['subject', 'file_hash']),
+        ]
+    
+    # Fields shown in a subject's analytics (year trend, paper counts)
+    ANALYTICS_FIELDS = ('title', 'year', 'is_deleted')
     
     def __str__(self):
         return f"{self.title} ({self.year})" if self.year else self.title
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def changed_fields(self, field_names, update_fields=None):
+        """
+        Which of the given fields (attnames) differ from the values last
+        loaded or saved; all of them for a paper not loaded from the
+        database. With update_fields, only fields a save writes count.
+        """
+        if update_fields is not None:
+            saved = {self._meta.get_field(name).attname for name in update_fields}
+            field_names = [name for name in field_names if name in saved]
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return set(field_names)
+        return {
+            name for name in field_names
+            if loaded.get(name, DEFERRED) is not DEFERRED and loaded[name] != getattr(self, name)
+        }
+    
+    def save(self, *args, **kwargs):
+        """
+        Save, and copy a changed subject or year onto the paper's questions.
+        
+        Only values that differ from those loaded are synced, so status
+        and other routine saves cost no extra queries. Queryset updates go
+        through PaperQuerySet.update(), which does the same in bulk.
+        """
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        super().save(*args, **kwargs)
+        
+        changed = set() if adding else self.changed_fields(['subject_id', 'year'], update_fields)
+        if 'subject_id' in changed:
+            self.sync_question_subjects()
+        if 'year' in changed:
+            # Question.year is a copy for ordering; the year change itself
+            # bumps the data version (Paper.ANALYTICS_FIELDS)
+            self.questions.exclude(year=self.year).update(year=self.year)
+        
+        saved = self._meta.concrete_fields if update_fields is None else [
+            self._meta.get_field(name) for name in update_fields
+        ]
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{
+                field.attname: getattr(self, field.attname)
+                for field in saved if field.attname not in deferred
+            },
+        }
+    
+    def sync_question_subjects(self):
+        """
+        Point this paper's questions at its current subject (after a move).
+        Both subjects' analytics change, so their data versions are bumped.
+        """
+        moved = self.questions.exclude(subject_id=self.subject_id)
+        previous = set(moved.values_list('subject_id', flat=True).distinct())
+        if not previous:
+            return
+        moved.update(subject_id=self.subject_id)
+        
+        from apps.analytics.versioning import bump_data_version
+        for subject_id in previous | {self.subject_id}:
+            bump_data_version(subject_id)
+    
     def get_question_count(self):
         """Return number of extracted questions."""
         return self.questions.count() if hasattr(self, 'questions') else 0
+    
+    def save_pages(self, page_texts):
+        """Replace the stored per-page text with one bulk insert."""
+        self.pages.all().delete()
+        PaperPage.objects.bulk_create(
+            [
+                PaperPage(paper=self, page_number=number, text_content=text)
+                for number, text in enumerate(page_texts, start=1)
+            ],
+            batch_size=100
+        )
+    
+    def iter_page_texts(self):
+        """Yield (page_number, text) one page at a time from PaperPage."""
+        return self.pages.order_by('page_number').values_list(
+            'page_number', 'text_content'
+        ).iterator(chunk_size=20)
 
 
 class PaperPage(models.Model):
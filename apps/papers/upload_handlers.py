@@ -0,0 +1,44 @@
+"""
+Upload handling for question papers.
+
+Uploads are streamed straight to a temporary file on disk while their
+SHA-256 is computed, so a batch of PDFs is never held in memory and never
+read a second time just to hash it. FileSystemStorage then moves the
+temporary file into MEDIA_ROOT instead of copying it.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Write every upload to disk and hash it in the same pass."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.hasher.hexdigest()
+        return uploaded_file
+
+
+def get_file_hash(uploaded_file) -> str:
+    """
+    SHA-256 of an uploaded file, using the digest computed during upload
+    when available and streaming the file otherwise.
+    """
+    file_hash = getattr(uploaded_file, 'sha256', None)
+    if file_hash:
+        return file_hash
+
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
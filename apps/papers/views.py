@@ -4,11 +4,50 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.shortcuts import get_object_or_404, redirect
-import hashlib
 
+from apps.analytics.versioning import bump_data_version
 from apps.subjects.models import Subject, Module
 from .models import Paper
 from .forms import PaperUploadForm, BatchPaperUploadForm
+from .upload_handlers import get_file_hash
+
+
+def create_uploaded_papers(request, subject, files):
+    """
+    Create papers for uploaded PDFs, skipping files already in the subject.
+    
+    Files arrive on disk with their SHA-256 already computed by the upload
+    handler, so nothing is re-read here and saving moves the temp file
+    into place. Duplicates are checked with a single query per batch.
+    """
+    hashes = [get_file_hash(f) for f in files]
+    seen = set(
+        Paper.objects.filter(subject=subject, file_hash__in=hashes).order_by().values_list('file_hash', flat=True)
+    )
+    
+    papers = []
+    for uploaded_file, file_hash in zip(files, hashes):
+        if file_hash in seen:
+            messages.warning(
+                request,
+                f'"{uploaded_file.name}" already uploaded (skipped)'
+            )
+            continue
+        seen.add(file_hash)
+        
+        # Parse filename for metadata
+        parsed = BatchPaperUploadForm.parse_filename(uploaded_file.name)
+        
+        papers.append(Paper.objects.create(
+            subject=subject,
+            title=parsed['title'],
+            year=parsed['year'] or '',
+            exam_type=parsed['exam_type'] or '',
+            file=uploaded_file,
+            file_hash=file_hash,
+        ))
+    
+    return papers
 
 
 class GenericPaperUploadView(FormView):
@@ -38,35 +77,28 @@ class GenericPaperUploadView(FormView):
             university_type=university_type or 'OTHER'
         )
         
-        # Handle syllabus upload
-        if syllabus_file:
-            subject.syllabus_file = syllabus_file
-            # Extract syllabus text (basic extraction)
-            try:
-                import pdfplumber
-                with pdfplumber.open(syllabus_file) as pdf:
-                    syllabus_text = '\n'.join([page.extract_text() or '' for page in pdf.pages])
-                subject.syllabus_text = syllabus_text
-            except:
-                pass
-            subject.save()
-        
         # Create 5 modules by default
-        module_names = [
-            'Module 1',
-            'Module 2', 
-            'Module 3',
-            'Module 4',
-            'Module 5'
-        ]
-        for i, mod_name in enumerate(module_names, 1):
-            Module.objects.create(
+        Module.objects.bulk_create([
+            Module(
                 subject=subject,
-                name=mod_name,
+                name=f'Module {i}',
                 number=i,
                 description=f'Module {i} of {subject_name}',
                 weightage=20  # Equal weightage
             )
+            for i in range(1, 6)
+        ])
+        bump_data_version(subject.pk)  # Bulk creates send no signals
+        
+        # Handle syllabus upload - parsed and embedded in the background
+        if syllabus_file:
+            subject.syllabus_file = syllabus_file
+            subject.save(update_fields=['syllabus_file', 'updated_at'])
+            try:
+                from apps.analysis.tasks import queue_syllabus_processing
+                queue_syllabus_processing(subject)
+            except Exception as e:
+                messages.warning(self.request, f'Syllabus could not be queued for processing: {str(e)}')
         
         self._subject = subject
         return subject
@@ -113,45 +145,19 @@ class GenericPaperUploadView(FormView):
         )
         
         # Process files
-        uploaded_count = 0
-        for uploaded_file in files:
-            # Parse filename for metadata
-            parsed = BatchPaperUploadForm.parse_filename(uploaded_file.name)
-            
-            # Calculate file hash for deduplication
-            file_hash = hashlib.sha256()
-            for chunk in uploaded_file.chunks():
-                file_hash.update(chunk)
-            file_hash_hex = file_hash.hexdigest()
-            uploaded_file.seek(0)  # Reset file pointer
-            
-            # Check if file already exists (by hash)
-            if Paper.objects.filter(subject=subject, file_hash=file_hash_hex).exists():
-                messages.warning(
-                    request,
-                    f'"{uploaded_file.name}" already uploaded (skipped)'
-                )
-                continue
-            
-            # Create paper
-            paper = Paper.objects.create(
-                subject=subject,
-                title=parsed['title'],
-                year=parsed['year'],
-                exam_type=parsed['exam_type'],
-                file=uploaded_file,
-                file_hash=file_hash_hex,
-            )
-            uploaded_count += 1
-            
-            # Queue background analysis task
+        uploaded_papers = create_uploaded_papers(request, subject, files)
+        
+        uploaded_count = len(uploaded_papers)
+        
+        # Queue one background analysis job for the whole batch
+        if uploaded_papers:
             try:
-                from apps.analysis.tasks import queue_paper_analysis
-                queue_paper_analysis(paper)
+                from apps.analysis.tasks import queue_subject_analysis
+                queue_subject_analysis(subject, uploaded_papers)
             except Exception as e:
                 messages.warning(
                     request,
-                    f'"{uploaded_file.name}" uploaded but analysis could not be queued: {str(e)}'
+                    f'{uploaded_count} paper(s) uploaded but analysis could not be queued: {str(e)}'
                 )
         
         if uploaded_count > 0:
@@ -236,45 +242,19 @@ class PaperUploadView(LoginRequiredMixin, FormView):
                 return self.get(request, *args, **kwargs)
         
         # Process files
-        uploaded_count = 0
-        for uploaded_file in files:
-            # Parse filename for metadata
-            parsed = BatchPaperUploadForm.parse_filename(uploaded_file.name)
-            
-            # Calculate file hash for deduplication
-            file_hash = hashlib.sha256()
-            for chunk in uploaded_file.chunks():
-                file_hash.update(chunk)
-            file_hash_hex = file_hash.hexdigest()
-            uploaded_file.seek(0)  # Reset file pointer
-            
-            # Check if file already exists (by hash)
-            if Paper.objects.filter(subject=self.subject, file_hash=file_hash_hex).exists():
-                messages.warning(
-                    request,
-                    f'"{uploaded_file.name}" already uploaded (skipped)'
-                )
-                continue
-            
-            # Create paper
-            paper = Paper.objects.create(
-                subject=self.subject,
-                title=parsed['title'],
-                year=parsed['year'],
-                exam_type=parsed['exam_type'],
-                file=uploaded_file,
-                file_hash=file_hash_hex,
-            )
-            uploaded_count += 1
-            
-            # Queue background analysis task
+        uploaded_papers = create_uploaded_papers(request, self.subject, files)
+        
+        uploaded_count = len(uploaded_papers)
+        
+        # Queue one background analysis job for the whole batch
+        if uploaded_papers:
             try:
-                from apps.analysis.tasks import queue_paper_analysis
-                queue_paper_analysis(paper)
+                from apps.analysis.tasks import queue_subject_analysis
+                queue_subject_analysis(self.subject, uploaded_papers)
             except Exception as e:
                 messages.warning(
                     request,
-                    f'"{uploaded_file.name}" uploaded but analysis could not be queued: {str(e)}'
+                    f'{uploaded_count} paper(s) uploaded but analysis could not be queued: {str(e)}'
                 )
         
         if uploaded_count > 0:
@@ -7,3 +7,5 @@ class QuestionAdmin(admin.ModelAdmin):
     list_display = ('question_number', 'paper', 'module', 'difficulty', 'bloom_level', 'is_duplicate')
     list_filter = ('difficulty', 'bloom_level', 'is_duplicate', 'module')
     search_fields = ('text', 'paper__title')
+    # Always the paper's subject; set on save
+    readonly_fields = ('subject',)
@@ -0,0 +1,135 @@
+"""
+Streaming question exports.
+
+Rows are read with values_list(...).iterator(), so neither model instances
+nor the whole result set are held in memory, and the encoded output is
+handed to StreamingHttpResponse chunk by chunk. CSV keeps the original
+spreadsheet-friendly layout; JSONL and Parquet carry the full text and
+classification fields for downstream analysis.
+"""
+import csv
+import json
+from typing import Iterable, Iterator, List, Tuple
+
+from django.conf import settings
+from django.db.models.functions import Substr
+
+from apps.core.streaming import ChunkSink, Echo
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXPORT_CHUNK_SIZE = getattr(settings, 'QUESTION_EXPORT_CHUNK_SIZE', 2000)
+
+CSV_TEXT_LENGTH = 200
+
+# (header, lookup) pairs
+CSV_COLUMNS = [
+    ('Question Number', 'question_number'),
+    ('Text', 'text_excerpt'),
+    ('Module', 'module__name'),
+    ('Part', 'part'),
+    ('Marks', 'marks'),
+    ('Paper', 'paper__title'),
+    ('Subject', 'subject__name'),
+]
+
+RECORD_COLUMNS = [
+    ('id', 'id'),
+    ('question_number', 'question_number'),
+    ('text', 'text'),
+    ('part', 'part'),
+    ('marks', 'marks'),
+    ('module_number', 'module__number'),
+    ('module', 'module__name'),
+    ('topics', 'topics'),
+    ('question_type', 'question_type'),
+    ('difficulty', 'difficulty'),
+    ('bloom_level', 'bloom_level'),
+    ('is_duplicate', 'is_duplicate'),
+    ('paper', 'paper__title'),
+    ('year', 'year'),
+    ('subject', 'subject__name'),
+]
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _rows(queryset, columns) -> Iterator[Tuple]:
+    lookups = [lookup for _, lookup in columns]
+    return queryset.values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(queryset) -> Iterator[str]:
+    """CSV lines, header first; question text is cut to CSV_TEXT_LENGTH characters."""
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in CSV_COLUMNS])
+    queryset = queryset.annotate(text_excerpt=Substr('text', 1, CSV_TEXT_LENGTH))
+    for row in _rows(queryset, CSV_COLUMNS):
+        yield writer.writerow(['' if value is None else value for value in row])
+
+
+def stream_jsonl(queryset) -> Iterator[str]:
+    """One JSON object per question and line."""
+    names = [name for name, _ in RECORD_COLUMNS]
+    for row in _rows(queryset, RECORD_COLUMNS):
+        yield json.dumps(dict(zip(names, row)), ensure_ascii=False, default=str) + '\n'
+
+
+def _chunks(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_parquet(queryset) -> Iterator[bytes]:
+    """
+    A Parquet file written one row group per chunk of rows.
+    
+    Requires pyarrow; check PARQUET_AVAILABLE first.
+    """
+    schema = pa.schema([
+        ('id', pa.string()),
+        ('question_number', pa.string()),
+        ('text', pa.string()),
+        ('part', pa.string()),
+        ('marks', pa.int32()),
+        ('module_number', pa.int32()),
+        ('module', pa.string()),
+        ('topics', pa.list_(pa.string())),
+        ('question_type', pa.string()),
+        ('difficulty', pa.string()),
+        ('bloom_level', pa.string()),
+        ('is_duplicate', pa.bool_()),
+        ('paper', pa.string()),
+        ('year', pa.string()),
+        ('subject', pa.string()),
+    ])
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in _chunks(_rows(queryset, RECORD_COLUMNS), EXPORT_CHUNK_SIZE):
+            columns = list(zip(*chunk))
+            columns[0] = [str(value) for value in columns[0]]
+            columns[7] = [[str(topic) for topic in topics] if isinstance(topics, list) else [] for topics in columns[7]]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,171 @@
+"""
+Management command measuring how fast, and with how much memory, the
+Question querysets used by lists, exports, reports and clustering read a
+subject's questions.
+Usage: python manage.py benchmark_question_querysets [--subject <uuid> | --generate 10000]
+"""
+import base64
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.versioning import batch_version_bumps
+from apps.papers.models import Paper
+from apps.questions.models import Question
+from apps.subjects.models import Module, Subject
+from apps.users.models import User
+
+SYNTHETIC_SUBJECT_NAME = 'Queryset benchmark (synthetic)'
+
+WORDS = (
+    'explain define derive compare disaster hazard risk vulnerability mitigation '
+    'resilience earthquake flood cyclone landslide drought tsunami planning '
+    'response recovery community assessment framework policy early warning'
+).split()
+
+
+def _variants():
+    """Name -> function building the queryset for a subject."""
+    base = lambda subject: Question.objects.filter(subject=subject)
+    stats_columns = ('module', 'difficulty', 'bloom_level', 'is_duplicate')
+    return {
+        'full': lambda subject: base(subject).select_related('paper', 'module'),
+        'lean': lambda subject: base(subject).select_related('paper', 'module').lean(),
+        'list': lambda subject: base(subject).for_list(),
+        'report': lambda subject: base(subject).for_report(),
+        'clustering': lambda subject: base(subject).for_clustering(),
+        # Subject scans as analytics runs them, through Paper and on Question.subject
+        'stats-via-paper': lambda subject: Question.objects.filter(
+            paper__subject=subject
+        ).values_list(*stats_columns),
+        'stats': lambda subject: base(subject).values_list(*stats_columns),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks full and column-limited Question querysets (rows/s and memory)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subject', help='Benchmark the questions of this subject')
+        parser.add_argument(
+            '--generate', type=int, default=0,
+            help='Create (or reuse) a synthetic subject with this many questions'
+        )
+        parser.add_argument(
+            '--variant', choices=sorted(_variants()), action='append',
+            help='Only run this variant; run one per process for an isolated peak RSS'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per variant')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the synthetic subject and exit')
+
+    def handle(self, *args, **options):
+        if options['cleanup']:
+            self._cleanup()
+            return
+
+        if options['subject']:
+            subject = Subject.all_objects.filter(pk=options['subject']).first()
+            if subject is None:
+                raise CommandError(f"Subject {options['subject']} not found")
+        elif options['generate']:
+            subject = self._synthetic_subject(options['generate'])
+        else:
+            raise CommandError('Pass --subject <uuid> or --generate <count>')
+
+        count = Question.objects.filter(subject=subject).count()
+        self.stdout.write(f'Benchmarking on {count} questions of {subject.name}')
+
+        variants = _variants()
+        for name in options['variant'] or variants:
+            self._benchmark(name, variants[name](subject), options['repeat'])
+
+        self.stdout.write(f'process peak RSS: {self._peak_rss_mb():.1f} MB')
+
+    def _benchmark(self, name, queryset, repeat):
+        seconds = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            rows = self._consume(queryset.all())
+            seconds.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        self._consume(queryset.all())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = min(seconds)
+        rate = rows / best if best else float('inf')
+        self.stdout.write(
+            f'{name}: {best:.3f}s ({rate:,.0f} rows/s), '
+            f'peak Python memory {peak / 2**20:.1f} MB, '
+            f'process peak RSS {self._peak_rss_mb():.1f} MB'
+        )
+
+    def _consume(self, queryset):
+        """Load every row into memory, as list views and report builders do."""
+        return len(list(queryset))
+
+    def _peak_rss_mb(self):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS and kilobytes on Linux
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+    def _synthetic_subject(self, count):
+        user, _ = User.objects.get_or_create(
+            username='queryset-benchmark',
+            defaults={'email': 'queryset-benchmark@example.com'}
+        )
+        subject, _ = Subject.objects.get_or_create(user=user, name=SYNTHETIC_SUBJECT_NAME)
+        existing = Question.objects.filter(subject=subject).count()
+        if existing >= count:
+            return subject
+
+        modules = [
+            Module.objects.get_or_create(subject=subject, number=number, defaults={'name': f'Module {number}'})[0]
+            for number in range(1, 6)
+        ]
+        papers = [
+            Paper.objects.get_or_create(
+                subject=subject, title=f'Synthetic paper {year}',
+                defaults={'year': str(year), 'file': f'papers/synthetic_{year}.pdf', 'raw_text': 'x' * 50_000}
+            )[0]
+            for year in range(2015, 2025)
+        ]
+
+        rng = random.Random(42)
+        # Roughly the size of a small extracted diagram
+        image = base64.b64encode(rng.randbytes(6_000)).decode()
+        self.stdout.write(f'Generating {count - existing} synthetic questions...')
+
+        questions = []
+        for index in range(existing, count):
+            text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(12, 40))).capitalize() + '?'
+            part = 'A' if index % 3 else 'B'
+            questions.append(Question(
+                paper=papers[index % len(papers)],
+                subject=subject,
+                year=papers[index % len(papers)].year,
+                module=modules[index % len(modules)],
+                question_number=str(index % 20 + 1),
+                text=text,
+                marks=3 if part == 'A' else 14,
+                part=part,
+                topics=rng.sample(WORDS, 2),
+                keywords=rng.sample(WORDS, 6),
+                sub_questions=[{'label': 'a', 'text': text[:80]}, {'label': 'b', 'text': text[-80:]}],
+                images=[{'bbox': [0, 0, 100, 100], 'data': image}] if index % 4 == 0 else [],
+                embedding=[round(rng.uniform(-1, 1), 6) for _ in range(384)],
+                years_appeared=[str(2015 + index % 10)],
+            ))
+        Question.objects.bulk_create(questions, batch_size=500)
+        return subject
+
+    def _cleanup(self):
+        subjects = Subject.all_objects.filter(name=SYNTHETIC_SUBJECT_NAME, user__username='queryset-benchmark')
+        with batch_version_bumps():
+            deleted, _ = subjects.delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} synthetic objects'))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0004_add_ai_analysis_fields"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["paper", "question_number", "id"],
+                name="questions_q_paper_i_39c5ce_idx",
+            ),
+        ),
+    ]
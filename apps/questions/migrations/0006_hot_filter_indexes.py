@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_topic_keyset_index"),
+        ("papers", "0004_hot_filter_indexes"),
+        ("questions", "0005_question_keyset_index"),
+        ("subjects", "0006_subject_data_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["paper", "module", "difficulty"],
+                name="questions_q_paper_i_d0b783_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["paper", "bloom_level"], name="questions_q_paper_i_7f4afa_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["paper", "is_duplicate"], name="questions_q_paper_i_437475_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["module", "part"], name="questions_q_module__b04af6_idx"
+            ),
+        ),
+    ]
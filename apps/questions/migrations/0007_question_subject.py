@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_subject_from_paper(apps, schema_editor):
+    Question = apps.get_model("questions", "Question")
+    Paper = apps.get_model("papers", "Paper")
+    Question.objects.update(
+        subject_id=Subquery(
+            Paper.objects.filter(pk=OuterRef("paper_id")).values("subject_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0004_hot_filter_indexes"),
+        ("questions", "0006_hot_filter_indexes"),
+        ("subjects", "0006_subject_data_version"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="question",
+            name="questions_q_paper_i_d0b783_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="question",
+            name="questions_q_paper_i_7f4afa_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="question",
+            name="questions_q_paper_i_437475_idx",
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="subject",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="questions",
+                to="subjects.subject",
+            ),
+        ),
+        migrations.RunPython(copy_subject_from_paper, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="question",
+            name="subject",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="questions",
+                to="subjects.subject",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["subject", "module", "difficulty"],
+                name="questions_q_subject_021f7a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["subject", "bloom_level"], name="questions_q_subject_b6004c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["subject", "is_duplicate"],
+                name="questions_q_subject_2fec97_idx",
+            ),
+        ),
+    ]
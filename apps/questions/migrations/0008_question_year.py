@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:54
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_year_from_paper(apps, schema_editor):
+    Question = apps.get_model("questions", "Question")
+    Paper = apps.get_model("papers", "Paper")
+    Question.objects.update(
+        year=Subquery(Paper.objects.filter(pk=OuterRef("paper_id")).values("year")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("papers", "0004_hot_filter_indexes"),
+        ("questions", "0007_question_subject"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="question",
+            name="questions_q_paper_i_39c5ce_idx",
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="year",
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.RunPython(copy_year_from_paper, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["subject", "year", "question_number", "id"],
+                name="questions_q_subject_b657a4_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0008_question_year"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="question",
+            name="questions_q_module__b04af6_idx",
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["module", "part", "year", "question_number"],
+                name="questions_q_module__a95b2c_idx",
+            ),
+        ),
+    ]
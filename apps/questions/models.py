@@ -5,6 +5,54 @@ from django.db import models
 from apps.core.models import BaseModel
 
 
+# Large JSON columns most readers never touch: the 384-float embedding,
+# base64 image blobs and the parsed sub-question/keyword/year lists.
+HEAVY_FIELDS = ('embedding', 'images', 'sub_questions', 'keywords', 'years_appeared')
+
+LIST_FIELDS = (
+    'question_number', 'text', 'marks', 'part', 'topics',
+    'question_type', 'difficulty', 'bloom_level', 'is_duplicate',
+    'paper', 'paper__title', 'paper__year', 'year', 'subject',
+    'module', 'module__name', 'module__number',
+)
+
+REPORT_FIELDS = (
+    'question_number', 'text', 'sub_questions', 'marks', 'part', 'year',
+    'paper', 'paper__title', 'paper__year',
+)
+
+CLUSTERING_FIELDS = (
+    'question_number', 'text', 'marks', 'part', 'module', 'topic_cluster',
+    'paper', 'paper__year',
+)
+
+
+class QuestionQuerySet(models.QuerySet):
+    """
+    Column-limited presets for bulk readers of questions.
+    
+    Instances loaded through a preset still fetch a deferred field on
+    access (one query per row), so add any extra field a caller needs via
+    the `*fields` argument instead of relying on that.
+    """
+    
+    def lean(self):
+        """Everything except the heavy JSON columns."""
+        return self.defer(*HEAVY_FIELDS)
+    
+    def for_list(self, *fields):
+        """Columns shown in question lists and exports, with paper and module."""
+        return self.select_related('paper', 'module').only(*LIST_FIELDS, *fields)
+    
+    def for_report(self, *fields):
+        """Columns the PDF module reports render, with the paper's year and title."""
+        return self.select_related('paper').only(*REPORT_FIELDS, *fields)
+    
+    def for_clustering(self, *fields):
+        """Columns topic clustering reads, and the cluster link it writes."""
+        return self.select_related('paper').only(*CLUSTERING_FIELDS, *fields)
+
+
 class Question(BaseModel):
     """Extracted question with all analysis fields."""
     
@@ -38,6 +86,19 @@ class Question(BaseModel):
         related_name='questions'
     )
     
+    # Copy of paper.subject, so subject-wide queries need no join through
+    # Paper. Filled in on save and kept in step by Paper.save().
+    subject = models.ForeignKey(
+        'subjects.Subject',
+        on_delete=models.CASCADE,
+        related_name='questions'
+    )
+    
+    # Copy of paper.year, so question lists order on this table alone
+    # (see QUESTION_ORDERING). Filled in on save and kept in step by
+    # Paper.save().
+    year = models.CharField(max_length=50, blank=True)
+    
     # Question content
     question_number = models.CharField(max_length=20, blank=True)
     text = models.TextField()
@@ -133,14 +194,34 @@ class Question(BaseModel):
     module_manually_set = models.BooleanField(default=False)
     difficulty_manually_set = models.BooleanField(default=False)
     
+    objects = QuestionQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Question'
         verbose_name_plural = 'Questions'
         ordering = ['question_number']
+        indexes = [
+            # Keyset pagination of a subject's question list: QUESTION_ORDERING
+            models.Index(fields=['subject', 'year', 'question_number', 'id']),
+            # Per-subject statistics and question list filters
+            models.Index(fields=['subject', 'module', 'difficulty']),
+            models.Index(fields=['subject', 'bloom_level']),
+            models.Index(fields=['subject', 'is_duplicate']),
+            # Module reports and clustering, split by part, in year order
+            models.Index(fields=['module', 'part', 'year', 'question_number']),
+        ]
     
     def __str__(self):
         return f"Q{self.question_number}: {self.text[:50]}..."
     
+    def save(self, *args, **kwargs):
+        if self.paper_id is not None:
+            if self.subject_id is None:
+                self.subject_id = self.paper.subject_id
+            if self._state.adding and not self.year:
+                self.year = self.paper.year
+        super().save(*args, **kwargs)
+    
     def get_similar_questions(self, threshold=0.8):
         """Find similar questions based on embedding similarity."""
         if not self.embedding:
@@ -1,27 +1,47 @@
 """Views for question management."""
+from django.conf import settings
 from django.views.generic import ListView, DetailView, UpdateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
 from django.shortcuts import redirect, get_object_or_404
-from django.http import HttpResponse, JsonResponse
-import csv
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.core.exceptions import BadRequest
+from django.db.models import Max
 
+from apps.core.mixins import HTMXResponseMixin
+from apps.core.pagination import keyset_paginate
+from apps.subjects.models import Subject, Module
+from . import export
 from .models import Question
 from .forms import QuestionEditForm
 
+QUESTION_PAGE_SIZE = getattr(settings, 'QUESTION_PAGE_SIZE', 50)
 
-class QuestionListView(LoginRequiredMixin, ListView):
-    """List all questions for a paper."""
+# Unique sort key for keyset pagination, on Question's own columns so a
+# subject's list is read in index order (see Question.Meta.indexes)
+QUESTION_ORDERING = ['year', 'question_number', 'id']
+
+
+class QuestionListView(LoginRequiredMixin, HTMXResponseMixin, ListView):
+    """
+    List questions, a page at a time.
+    
+    Pages are keyset-paginated on QUESTION_ORDERING; the infinite-scroll
+    sentinel requests the next page with ?cursor=..., which is answered
+    with just the rows (htmx_template_name).
+    """
     
     model = Question
     template_name = 'questions/question_list.html'
+    htmx_template_name = 'partials/question_rows.html'
     context_object_name = 'questions'
+    page_size = QUESTION_PAGE_SIZE
     
     def get_queryset(self):
         qs = Question.objects.filter(
-            paper__subject__user=self.request.user
-        ).select_related('paper', 'module')
+            subject__user=self.request.user
+        ).for_list()
         
         # Filter by paper if specified
         paper_id = self.request.GET.get('paper')
@@ -31,9 +51,50 @@ class QuestionListView(LoginRequiredMixin, ListView):
         # Filter by subject if specified
         subject_id = self.request.GET.get('subject')
         if subject_id:
-            qs = qs.filter(paper__subject_id=subject_id)
+            qs = qs.filter(subject_id=subject_id)
+        
+        module = self.request.GET.get('module')
+        if module == 'unclassified':
+            qs = qs.filter(module__isnull=True)
+        elif module and module.isdigit():
+            qs = qs.filter(module__number=int(module))
+        
+        difficulty = self.request.GET.get('difficulty')
+        if difficulty:
+            qs = qs.filter(difficulty=difficulty)
+        
+        bloom = self.request.GET.get('bloom')
+        if bloom:
+            qs = qs.filter(bloom_level=bloom)
+        
+        search = self.request.GET.get('q', '').strip()
+        if search:
+            qs = qs.filter(text__icontains=search)
         
         return qs
+    
+    def get_context_data(self, **kwargs):
+        try:
+            page = keyset_paginate(
+                self.object_list, QUESTION_ORDERING, self.request.GET.get('cursor'), self.page_size
+            )
+        except ValueError as e:
+            raise BadRequest(str(e))
+        
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context['page'] = page
+        
+        params = self.request.GET.copy()
+        params.pop('cursor', None)
+        context['filter_query'] = params.urlencode()
+        
+        if not self.is_htmx_request():
+            context['subjects'] = Subject.objects.filter(user=self.request.user).only('id', 'name')
+            max_module = Module.objects.filter(
+                subject__user=self.request.user
+            ).aggregate(Max('number'))['number__max'] or 0
+            context['module_range'] = range(1, max_module + 1)
+        return context
 
 
 class QuestionDetailView(LoginRequiredMixin, DetailView):
@@ -45,7 +106,7 @@ class QuestionDetailView(LoginRequiredMixin, DetailView):
     
     def get_queryset(self):
         return Question.objects.filter(
-            paper__subject__user=self.request.user
+            subject__user=self.request.user
         ).select_related('paper', 'module', 'duplicate_of')
 
 
@@ -57,7 +118,7 @@ class QuestionUpdateView(LoginRequiredMixin, UpdateView):
     template_name = 'questions/question_edit.html'
     
     def get_queryset(self):
-        return Question.objects.filter(paper__subject__user=self.request.user)
+        return Question.objects.filter(subject__user=self.request.user)
     
     def get_success_url(self):
         return reverse_lazy('questions:detail', kwargs={'pk': self.object.pk})
@@ -79,7 +140,7 @@ class QuestionVerifyView(LoginRequiredMixin, View):
         question = get_object_or_404(
             Question,
             pk=pk,
-            paper__subject__user=request.user
+            subject__user=request.user
         )
         question.module_manually_set = True
         question.save()
@@ -88,38 +149,38 @@ class QuestionVerifyView(LoginRequiredMixin, View):
 
 
 class QuestionExportView(LoginRequiredMixin, View):
-    """Export questions to CSV."""
+    """Export questions as a streamed CSV, JSONL or Parquet download."""
     
     def get(self, request):
         # Get filter parameters
         paper_id = request.GET.get('paper')
         subject_id = request.GET.get('subject')
+        export_format = request.GET.get('format', 'csv').lower()
         
-        qs = Question.objects.filter(
-            paper__subject__user=request.user
-        ).select_related('paper', 'module')
+        if export_format not in export.FORMATS:
+            return HttpResponseBadRequest(
+                f"Unknown export format '{export_format}'. Use one of: {', '.join(export.FORMATS)}."
+            )
+        if export_format == 'parquet' and not export.PARQUET_AVAILABLE:
+            messages.error(request, 'Parquet export requires pyarrow. Use CSV or JSONL instead.')
+            params = request.GET.copy()
+            params.pop('format')
+            return redirect(f"{reverse('questions:list')}?{params.urlencode()}")
+        
+        qs = Question.objects.filter(subject__user=request.user)
         
         if paper_id:
             qs = qs.filter(paper_id=paper_id)
         if subject_id:
-            qs = qs.filter(paper__subject_id=subject_id)
-        
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="questions_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Question Number', 'Text', 'Module', 'Part', 'Marks', 'Paper', 'Subject'])
+            qs = qs.filter(subject_id=subject_id)
         
-        for question in qs:
-            writer.writerow([
-                question.question_number,
-                question.text[:200],
-                question.module.name if question.module else '',
-                question.part,
-                question.marks,
-                question.paper.title,
-                question.paper.subject.name
-            ])
+        streams = {
+            'csv': export.stream_csv,
+            'jsonl': export.stream_jsonl,
+            'parquet': export.stream_parquet,
+        }
+        content_type, extension = export.FORMATS[export_format]
         
+        response = StreamingHttpResponse(streams[export_format](qs), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="questions_export.{extension}"'
         return response
@@ -32,12 +32,12 @@ class ReportGenerator:
             
             # Gather data
             stats = self.calculator.get_complete_stats()
-            modules = self.subject.modules.all().prefetch_related('questions')
+            modules = self.subject.modules.all()
             
             # Prepare module data with questions
             module_data = []
             for module in modules:
-                questions = module.questions.select_related('paper').order_by('paper__year')
+                questions = module.questions.for_report().order_by('year')
                 module_data.append({
                     'module': module,
                     'questions': questions,
@@ -8,6 +8,8 @@ Generates PDFs matching the exact expected format with:
 - Final Study Priority Order
 """
 import logging
+import os
+import uuid
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from collections import defaultdict
@@ -39,8 +41,14 @@ class KTUModuleReportGenerator:
         
         return results
     
-    def generate_module_report(self, module: Module) -> Optional[str]:
-        """Generate a PDF report for a single module using ReportLab."""
+    def generate_module_report(self, module: Module, output_path: Optional[Path] = None) -> Optional[str]:
+        """
+        Generate a PDF report for a single module using ReportLab.
+        
+        The PDF is written next to `output_path` (default
+        MEDIA_ROOT/reports/<subject>/Module_<n>.pdf) and moved into place
+        when complete, so readers never see a partial file.
+        """
         try:
             from reportlab.lib.pagesizes import A4
             from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -52,15 +60,15 @@ class KTUModuleReportGenerator:
             report_data = self._prepare_module_data(module)
             
             # Output path
-            output_dir = Path(settings.MEDIA_ROOT) / 'reports' / str(self.subject.id)
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            filename = f"Module_{module.number}.pdf"
-            output_path = output_dir / filename
+            if output_path is None:
+                output_path = Path(settings.MEDIA_ROOT) / 'reports' / str(self.subject.id) / f"Module_{module.number}.pdf"
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            partial_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex}.part")
             
             # Create PDF document
             doc = SimpleDocTemplate(
-                str(output_path),
+                str(partial_path),
                 pagesize=A4,
                 rightMargin=2*cm,
                 leftMargin=2*cm,
@@ -72,7 +80,11 @@ class KTUModuleReportGenerator:
             story = self._build_pdf_content(report_data)
             
             # Generate PDF
-            doc.build(story)
+            try:
+                doc.build(story)
+                os.replace(partial_path, output_path)
+            finally:
+                partial_path.unlink(missing_ok=True)
             
             logger.info(f"Generated: {output_path}")
             return str(output_path)
@@ -310,7 +322,7 @@ class KTUModuleReportGenerator:
         # Get all questions for this module
         questions = Question.objects.filter(
             module=module
-        ).select_related('paper').order_by('paper__year', 'question_number')
+        ).for_report().order_by('year', 'question_number')
         
         # Group Part A questions by year
         part_a_by_year = self._group_part_a_by_year(questions.filter(part='A'))
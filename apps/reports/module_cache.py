@@ -0,0 +1,129 @@
+"""
+Cached KTU module reports.
+
+Module PDFs are stored under MEDIA_ROOT/reports/<subject>/v<data_version>/,
+so a report is reused until the subject's analytics data changes (see
+apps.analytics.versioning). Missing reports are rendered by Django-Q
+workers (apps.reports.tasks), since ReportLab layout is CPU-bound and
+holds the GIL. A request never waits for them: it queues the missing
+reports and asks the user to retry. A Module_<n>.pending file next to the
+report marks a render in progress, so each report is queued once across
+all server processes.
+"""
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which an unfinished render (e.g. no qcluster running, or a
+# killed worker) may be claimed and queued again
+REPORT_RENDER_TIMEOUT = getattr(settings, 'REPORTS_RENDER_TIMEOUT', 10 * 60)
+
+
+def subject_report_dir(subject_id) -> Path:
+    return Path(settings.MEDIA_ROOT) / 'reports' / str(subject_id)
+
+
+def module_report_path(subject_id, data_version: int, module_number: int) -> Path:
+    """Where the report of a module is cached for a given data version."""
+    return subject_report_dir(subject_id) / f'v{data_version}' / f'Module_{module_number}.pdf'
+
+
+def pending_marker_path(report_path: Path) -> Path:
+    """The file marking a report's render as queued or running."""
+    return report_path.with_suffix('.pending')
+
+
+def prune_old_versions(subject_id, data_version: int) -> None:
+    """
+    Remove report directories older than the previous data version.
+
+    The previous version is kept: a request that looked up its reports
+    just before the version changed may still be streaming them.
+    """
+    root = subject_report_dir(subject_id)
+    if not root.is_dir():
+        return
+    for entry in root.iterdir():
+        if entry.is_dir() and entry.name.startswith('v') and entry.name[1:].isdigit():
+            if int(entry.name[1:]) < data_version - 1:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def claim_render(report_path: Path) -> bool:
+    """
+    Atomically claim the render of a report; False if another request
+    already claimed it and its claim has not expired.
+    """
+    marker = pending_marker_path(report_path)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - marker.stat().st_mtime < REPORT_RENDER_TIMEOUT:
+                    return False
+                # Abandoned render: expire the claim and take it
+                marker.unlink()
+            except FileNotFoundError:
+                pass
+    return False
+
+
+def release_render(report_path: Path) -> None:
+    """Drop a report's render claim, once rendered or failed."""
+    pending_marker_path(report_path).unlink(missing_ok=True)
+
+
+def get_module_reports(
+    subject,
+    module_numbers: Optional[Iterable[int]] = None
+) -> Dict[int, Optional[Path]]:
+    """
+    Report PDFs for a subject's modules, queueing those not cached for the
+    subject's current data version unless they are queued already.
+
+    Args:
+        subject: Subject instance
+        module_numbers: Limit to these modules (default: all)
+
+    Returns:
+        Module number -> PDF path, or None where the report is still being
+        generated (or failed, and will be queued again on the next request)
+    """
+    from apps.subjects.models import Subject
+    from .tasks import queue_module_report
+
+    data_version = Subject.objects.filter(pk=subject.pk).values_list('data_version', flat=True).first() or 0
+
+    numbers = subject.modules.order_by('number').values_list('number', flat=True)
+    if module_numbers is not None:
+        numbers = numbers.filter(number__in=list(module_numbers))
+
+    paths = {number: module_report_path(subject.id, data_version, number) for number in numbers}
+    stale = [number for number, path in paths.items() if not path.exists()]
+
+    queued = [number for number in stale if claim_render(paths[number])]
+    if queued:
+        logger.info(f"Queueing {len(queued)} module report(s) for {subject} (data v{data_version})")
+        for number in queued:
+            try:
+                queue_module_report(subject.id, data_version, number)
+            except Exception:
+                release_render(paths[number])
+                raise
+
+    for number in stale:
+        # Rendered already if Django-Q runs tasks synchronously
+        if not paths[number].exists():
+            paths[number] = None
+
+    return paths
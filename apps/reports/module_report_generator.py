@@ -162,7 +162,7 @@ class ModuleReportGenerator:
         # Get all questions for this module
         questions = Question.objects.filter(
             module=module
-        ).select_related('paper', 'topic_cluster').order_by('paper__year', 'question_number')
+        ).for_report().order_by('year', 'question_number')
         
         # Group questions by part and year
         part_a_by_year = self._group_questions_by_year(questions.filter(part='A'))
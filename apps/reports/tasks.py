@@ -0,0 +1,46 @@
+"""
+Background tasks for report generation using Django-Q2.
+"""
+from typing import Optional
+
+from django_q.tasks import async_task
+
+from .module_cache import module_report_path, prune_old_versions, release_render
+
+
+def render_module_report_task(subject_id: str, data_version: int, module_number: int) -> Optional[str]:
+    """
+    Background task to render one module's report into the cache for
+    data_version, then prune report versions no longer needed. The
+    render claim is released either way, so a failed report is queued
+    again by the next request.
+    """
+    from apps.subjects.models import Module
+    from .ktu_report_generator import KTUModuleReportGenerator
+
+    path = module_report_path(subject_id, data_version, module_number)
+    try:
+        if not path.exists():
+            module = Module.objects.select_related('subject').filter(
+                subject_id=subject_id, number=module_number
+            ).first()
+            if module is None:
+                return None
+            if not KTUModuleReportGenerator(module.subject).generate_module_report(module, path):
+                raise RuntimeError(f"Report generation failed for module {module_number} of subject {subject_id}")
+    finally:
+        release_render(path)
+
+    prune_old_versions(subject_id, data_version)
+    return str(path)
+
+
+def queue_module_report(subject_id, data_version: int, module_number: int) -> str:
+    """Queue a module report for rendering; returns the task id."""
+    return async_task(
+        'apps.reports.tasks.render_module_report_task',
+        str(subject_id),
+        data_version,
+        module_number,
+        task_name=f'module_report_{subject_id}_{module_number}_v{data_version}'
+    )
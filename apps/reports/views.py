@@ -1,17 +1,17 @@
 """Views for report generation and download."""
 from django.views.generic import View, TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
-from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.contrib import messages
+from django.utils.http import content_disposition_header
 from pathlib import Path
 import zipfile
-import tempfile
 
+from apps.core.streaming import ChunkSink
 from apps.subjects.models import Subject, Module
 from .generator import ReportGenerator
-from .module_report_generator import ModuleReportGenerator
-from .ktu_report_generator import KTUModuleReportGenerator
+from .module_cache import get_module_reports
 
 
 class ReportsListView(LoginRequiredMixin, TemplateView):
@@ -31,8 +31,28 @@ class ReportsListView(LoginRequiredMixin, TemplateView):
         return context
 
 
+def _report_filename(subject, module_number) -> str:
+    return f"Module_{module_number}_{subject.code or subject.name.replace(' ', '_')}.pdf"
+
+
+def _stream_zip(files, chunk_size: int = 64 * 1024):
+    """
+    Yield a ZIP archive of (archive name, path) files as it is written.
+    PDFs are already compressed, so entries are stored as-is.
+    """
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for name, path in files:
+            with open(path, 'rb') as source, zf.open(name, 'w') as dest:
+                while chunk := source.read(chunk_size):
+                    dest.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
 class GenerateModuleReportView(LoginRequiredMixin, View):
-    """Generate and download a specific module report using KTU format."""
+    """Download a module report (KTU format), queueing its render if not cached."""
     
     def get(self, request, subject_pk, module_number):
         subject = get_object_or_404(
@@ -40,44 +60,48 @@ class GenerateModuleReportView(LoginRequiredMixin, View):
         )
         module = get_object_or_404(Module, subject=subject, number=module_number)
         
-        # Use KTU report generator for proper format
-        generator = KTUModuleReportGenerator(subject)
-        pdf_path = generator.generate_module_report(module)
+        pdf_path = get_module_reports(subject, [module.number]).get(module.number)
         
-        if pdf_path and Path(pdf_path).exists():
-            filename = f"Module_{module.number}_{subject.code or subject.name.replace(' ', '_')}.pdf"
+        if pdf_path and pdf_path.exists():
             return FileResponse(
                 open(pdf_path, 'rb'),
                 content_type='application/pdf',
                 as_attachment=True,
-                filename=filename
+                filename=_report_filename(subject, module.number)
             )
         
-        messages.error(request, f"Failed to generate report for Module {module.number}")
-        raise Http404("Report generation failed")
+        messages.warning(
+            request,
+            f"The report for Module {module.number} is still being generated; try again shortly."
+        )
+        return redirect('reports:list', subject_pk=subject.pk)
 
 
 class GenerateAllModuleReportsView(LoginRequiredMixin, View):
-    """Generate reports for all modules and return as ZIP."""
+    """Download all module reports as a streamed ZIP, rendering missing ones in the task queue."""
     
     def get(self, request, subject_pk):
         subject = get_object_or_404(
             Subject, pk=subject_pk, user=request.user
         )
         
-        # Use KTU report generator
-        generator = KTUModuleReportGenerator(subject)
-        results = generator.generate_all_module_reports()
+        results = get_module_reports(subject)
         
-        # Create a ZIP file with all module PDFs
-        successful_pdfs = []
-        for module_num, pdf_path in results.items():
-            if pdf_path and Path(pdf_path).exists():
-                successful_pdfs.append((module_num, pdf_path))
+        successful_pdfs = [
+            (module_num, pdf_path)
+            for module_num, pdf_path in results.items()
+            if pdf_path and pdf_path.exists()
+        ]
         
-        if not successful_pdfs:
+        if not results:
             messages.error(request, "No reports could be generated")
             raise Http404("Report generation failed")
+        if len(successful_pdfs) < len(results):
+            messages.warning(
+                request,
+                "Some module reports are still being generated; try again shortly."
+            )
+            return redirect('reports:list', subject_pk=subject.pk)
         
         # If only one report, return it directly
         if len(successful_pdfs) == 1:
@@ -86,22 +110,20 @@ class GenerateAllModuleReportsView(LoginRequiredMixin, View):
                 open(pdf_path, 'rb'),
                 content_type='application/pdf',
                 as_attachment=True,
-                filename=f"Module_{module_num}_{subject.code or subject.name.replace(' ', '_')}.pdf"
+                filename=_report_filename(subject, module_num)
             )
         
-        # Create ZIP file with all reports
-        zip_path = tempfile.mktemp(suffix='.zip')
-        with zipfile.ZipFile(zip_path, 'w') as zf:
-            for module_num, pdf_path in successful_pdfs:
-                filename = f"Module_{module_num}_{subject.code or subject.name.replace(' ', '_')}.pdf"
-                zf.write(pdf_path, filename)
-        
-        return FileResponse(
-            open(zip_path, 'rb'),
-            content_type='application/zip',
-            as_attachment=True,
-            filename=f"{subject.code or subject.name.replace(' ', '_')}_All_Modules.zip"
+        response = StreamingHttpResponse(
+            _stream_zip(
+                (_report_filename(subject, module_num), pdf_path)
+                for module_num, pdf_path in successful_pdfs
+            ),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = content_disposition_header(
+            True, f"{subject.code or subject.name.replace(' ', '_')}_All_Modules.zip"
         )
+        return response
 
 
 class GenerateAnalyticsReportView(LoginRequiredMixin, View):
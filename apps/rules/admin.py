@@ -1,9 +1,16 @@
 from django.contrib import admin
-from .models import ClassificationRule
+from .models import ClassificationRule, CompiledRuleCache
 
 
 @admin.register(ClassificationRule)
 class ClassificationRuleAdmin(admin.ModelAdmin):
-    list_display = ('name', 'subject', 'rule_type', 'is_active', 'is_validated', 'priority')
-    list_filter = ('rule_type', 'is_active', 'is_validated')
+    list_display = ('name', 'subject', 'rule_type', 'is_active', 'is_validated', 'compile_status', 'priority')
+    list_filter = ('rule_type', 'is_active', 'is_validated', 'compile_status')
     search_fields = ('name', 'natural_language')
+
+
+@admin.register(CompiledRuleCache)
+class CompiledRuleCacheAdmin(admin.ModelAdmin):
+    list_display = ('rule_type', 'natural_language', 'model_name', 'hits', 'created_at')
+    list_filter = ('rule_type', 'model_name')
+    search_fields = ('natural_language',)
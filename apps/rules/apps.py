@@ -5,3 +5,6 @@ class RulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.rules'
     verbose_name = 'Rules'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
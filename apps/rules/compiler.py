@@ -1,11 +1,39 @@
 """
 Rule compiler - Converts natural language rules to Python code using LLM.
+
+Compilations are cached per (rule type, natural language, model) in
+CompiledRuleCache, so identical rule texts cost one LLM call. Bulk
+compilation sends the distinct texts to the LLM concurrently through a
+bounded thread pool; database writes stay on the calling thread.
 """
+import hashlib
 import logging
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F
 
 logger = logging.getLogger(__name__)
 
+COMPILE_CONCURRENCY = getattr(settings, 'RULES_COMPILE_CONCURRENCY', 2)
+
+
+def get_llm_client():
+    """The Ollama client used for rule compilation."""
+    from services.llm.ollama_client import OllamaClient
+    return OllamaClient(timeout=getattr(settings, 'OLLAMA_TIMEOUT', 120))
+
+
+def compile_cache_key(rule_type: str, natural_language: str, model_name: str) -> str:
+    """
+    Cache key for a rule text; whitespace differences share a key.
+
+    Case is kept: rules may match case-sensitive terms ("AND" gates vs "and").
+    """
+    text = ' '.join(natural_language.split())
+    return hashlib.sha256(f'{model_name}\n{rule_type}\n{text}'.encode('utf-8')).hexdigest()
+
 
 class RuleCompiler:
     """Compiles natural language rules to executable Python code."""
@@ -30,16 +58,81 @@ def check_rule(question_text: str, keywords: list, marks: int | None) -> bool:
 Return ONLY the function code, no explanations.
 """
     
-    def __init__(self, llm_client):
-        self.llm_client = llm_client
+    def __init__(self, llm_client=None):
+        self.llm_client = llm_client or get_llm_client()
+    
+    @property
+    def model_name(self) -> str:
+        return getattr(self.llm_client, 'model', '') or 'default'
+    
+    def cache_key(self, rule) -> str:
+        return compile_cache_key(rule.rule_type, rule.natural_language, self.model_name)
     
     def compile(self, rule) -> Tuple[bool, str, Optional[str]]:
         """
-        Compile a natural language rule to Python code.
+        Compile a natural language rule to Python code, using the cache.
         
         Returns:
             (success, compiled_code, error_message)
         """
+        return self.compile_many([rule])[str(rule.id)]
+    
+    def compile_many(self, rules, max_workers: Optional[int] = None) -> Dict[str, Tuple[bool, str, Optional[str]]]:
+        """
+        Compile many rules, one LLM call per distinct uncached rule text.
+        
+        Args:
+            rules: ClassificationRule instances
+            max_workers: Concurrent LLM requests (defaults to RULES_COMPILE_CONCURRENCY)
+            
+        Returns:
+            Rule ID -> (success, compiled_code, error_message)
+        """
+        from .models import CompiledRuleCache
+        
+        keys = {str(rule.id): self.cache_key(rule) for rule in rules}
+        cached = {
+            entry.cache_key: entry.compiled_code
+            for entry in CompiledRuleCache.objects.filter(cache_key__in=set(keys.values()))
+        }
+        if cached:
+            CompiledRuleCache.objects.filter(cache_key__in=list(cached)).update(hits=F('hits') + 1)
+        
+        # One representative rule per uncached text
+        pending: Dict[str, object] = {}
+        for rule in rules:
+            key = keys[str(rule.id)]
+            if key not in cached:
+                pending.setdefault(key, rule)
+        
+        compiled: Dict[str, Tuple[bool, str, Optional[str]]] = {
+            key: (True, code, None) for key, code in cached.items()
+        }
+        if pending:
+            workers = max(1, min(max_workers or COMPILE_CONCURRENCY, len(pending)))
+            logger.info(
+                f"Compiling {len(pending)} rule texts ({len(cached)} cached) with {workers} workers"
+            )
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = pool.map(self._compile_text, pending.values())
+                for key, outcome in zip(pending, outcomes):
+                    compiled[key] = outcome
+            
+            CompiledRuleCache.objects.bulk_create([
+                CompiledRuleCache(
+                    cache_key=key,
+                    model_name=self.model_name,
+                    rule_type=rule.rule_type,
+                    natural_language=rule.natural_language,
+                    compiled_code=compiled[key][1]
+                )
+                for key, rule in pending.items() if compiled[key][0]
+            ], ignore_conflicts=True)
+        
+        return {rule_id: compiled[key] for rule_id, key in keys.items()}
+    
+    def _compile_text(self, rule) -> Tuple[bool, str, Optional[str]]:
+        """Ask the LLM for a rule's code and validate it (no database access)."""
         try:
             prompt = self.COMPILE_PROMPT.format(
                 rule_type=rule.get_rule_type_display(),
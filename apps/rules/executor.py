@@ -1,11 +1,55 @@
 """
 Safe rule executor - Executes compiled rules in a sandboxed environment.
+
+Compiled check_rule callables are cached per process, keyed by rule id and
+a hash of the rule's code, so a rule is exec()'d once rather than once per
+question. The cache is invalidated from post_save/post_delete signals.
+
+Batch evaluation first tries the static optimizer (optimizer.lower_rule),
+which evaluates simple rules with numpy over all questions at once.
 """
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .optimizer import QuestionBatch, lower_rule
 
 logger = logging.getLogger(__name__)
 
+VECTORIZE_RULES = getattr(settings, 'RULES_VECTORIZE', True)
+
+# (rule id, code hash) -> (code object, check_rule) or None if it failed to compile
+_compiled_rules: Dict[Tuple[str, str], Optional[Tuple[Any, Callable]]] = {}
+# (rule id, code hash) -> vectorized predicate or None if the rule has no vector form
+_vectorized_rules: Dict[Tuple[str, str], Optional[Callable]] = {}
+_compiled_lock = threading.Lock()
+
+
+def code_hash(code: str) -> str:
+    """Short content hash of a rule's compiled code."""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()[:16]
+
+
+def invalidate_rule(rule_id) -> None:
+    """Drop every cached compilation of a rule."""
+    rule_id = str(rule_id)
+    with _compiled_lock:
+        for cache in (_compiled_rules, _vectorized_rules):
+            for key in [key for key in cache if key[0] == rule_id]:
+                del cache[key]
+
+
+def clear_rule_cache() -> None:
+    """Drop all cached rule compilations."""
+    with _compiled_lock:
+        _compiled_rules.clear()
+        _vectorized_rules.clear()
+
 
 class RuleExecutor:
     """Safely executes compiled classification rules."""
@@ -38,36 +82,82 @@ class RuleExecutor:
         'None': None,
     }
     
-    def execute(self, rule, context: Dict[str, Any]) -> Optional[bool]:
+    def get_check_rule(self, rule) -> Optional[Callable]:
         """
-        Execute a compiled rule with the given context.
+        Return the rule's check_rule function, compiling it on first use.
         
-        Args:
-            rule: ClassificationRule instance with compiled_code
-            context: Dictionary with question_text, keywords, marks
-            
         Returns:
-            True/False if rule matches, None if execution failed
+            The callable, or None if the rule has no valid code
         """
         if not rule.compiled_code:
             logger.warning(f"Rule {rule.name} has no compiled code")
             return None
         
+        key = (str(rule.id), code_hash(rule.compiled_code))
+        try:
+            cached = _compiled_rules[key]
+            return cached[1] if cached else None
+        except KeyError:
+            pass
+        
+        compiled = None
         try:
+            code = compile(rule.compiled_code, f'<rule {rule.id}>', 'exec')
+            
             # Create restricted global namespace
             restricted_globals = {
                 '__builtins__': self.SAFE_BUILTINS,
             }
             
             # Execute the function definition
-            exec(rule.compiled_code, restricted_globals)
+            exec(code, restricted_globals)
             
             # Get the check_rule function
             check_rule = restricted_globals.get('check_rule')
-            if not callable(check_rule):
+            if callable(check_rule):
+                compiled = (code, check_rule)
+            else:
                 logger.error(f"Rule {rule.name}: check_rule is not callable")
-                return None
+                
+        except Exception as e:
+            logger.error(f"Rule compilation failed for {rule.name}: {e}")
+        
+        with _compiled_lock:
+            _compiled_rules[key] = compiled
+        return compiled[1] if compiled else None
+    
+    def get_vector_predicate(self, rule) -> Optional[Callable]:
+        """Return the rule's batch predicate, or None if it must run per question."""
+        if not rule.compiled_code:
+            return None
+        
+        key = (str(rule.id), code_hash(rule.compiled_code))
+        try:
+            return _vectorized_rules[key]
+        except KeyError:
+            pass
+        
+        predicate = lower_rule(rule.compiled_code)
+        with _compiled_lock:
+            _vectorized_rules[key] = predicate
+        return predicate
+    
+    def execute(self, rule, context: Dict[str, Any]) -> Optional[bool]:
+        """
+        Execute a compiled rule with the given context.
+        
+        Args:
+            rule: ClassificationRule instance with compiled_code
+            context: Dictionary with question_text, keywords, marks
             
+        Returns:
+            True/False if rule matches, None if execution failed
+        """
+        check_rule = self.get_check_rule(rule)
+        if check_rule is None:
+            return None
+        
+        try:
             # Execute with context
             result = check_rule(
                 context.get('question_text', ''),
@@ -95,3 +185,129 @@ class RuleExecutor:
                 if result is not None:
                     results[str(rule.id)] = result
         return results
+    
+    def execute_batch(
+        self,
+        rules,
+        contexts: List[Dict[str, Any]],
+        vectorize: Optional[bool] = None
+    ) -> Tuple[List[Dict[str, bool]], Dict[str, Dict[str, Any]]]:
+        """
+        Evaluate rules over a batch of questions, one rule at a time.
+        
+        Args:
+            rules: ClassificationRule instances (inactive/unvalidated are skipped)
+            contexts: One context dict per question
+            vectorize: Use the static optimizer where possible
+                (defaults to settings.RULES_VECTORIZE)
+            
+        Returns:
+            (results, stats) - per question a dict of rule ID to result, and
+            per rule ID the evaluated/matched/error counts and seconds spent
+        """
+        results = [{} for _ in contexts]
+        stats = {}
+        batch = QuestionBatch(contexts)
+        
+        for rule in rules:
+            if not (rule.is_active and rule.is_validated):
+                continue
+            
+            rule_id = str(rule.id)
+            matches, stats[rule_id] = self.evaluate_rule(rule, contexts, batch=batch, vectorize=vectorize)
+            for i, matched in matches.items():
+                results[i][rule_id] = matched
+        
+        return results, stats
+    
+    def evaluate_rule(
+        self,
+        rule,
+        contexts: List[Dict[str, Any]],
+        rows: Optional[List[int]] = None,
+        batch: Optional[QuestionBatch] = None,
+        vectorize: Optional[bool] = None
+    ) -> Tuple[Dict[int, bool], Dict[str, Any]]:
+        """
+        Evaluate one rule over some rows of a batch of questions.
+        
+        Args:
+            rule: ClassificationRule instance
+            contexts: One context dict per question
+            rows: Indexes of the contexts to evaluate (all if None)
+            batch: QuestionBatch of all the contexts; pass the same one
+                for every rule so the columns are built once
+            vectorize: Use the static optimizer where possible
+                (defaults to settings.RULES_VECTORIZE)
+        
+        Returns:
+            (matches, stats) - result per row evaluated without error, and
+            the rule's evaluated/matched/error counts and seconds spent
+        """
+        if vectorize is None:
+            vectorize = VECTORIZE_RULES
+        rows = list(range(len(contexts))) if rows is None else list(rows)
+        
+        matches = {}
+        stats = {
+            'name': rule.name, 'evaluated': 0, 'matched': 0, 'errors': 0,
+            'vectorized': 0, 'seconds': 0.0
+        }
+        
+        started = time.perf_counter()
+        check_rule = self.get_check_rule(rule)
+        if check_rule is None:
+            stats['errors'] = len(rows)
+            stats['seconds'] = time.perf_counter() - started
+            return matches, stats
+        
+        predicate = self.get_vector_predicate(rule) if vectorize and rows else None
+        if predicate is not None:
+            try:
+                if batch is None:
+                    batch = QuestionBatch(contexts)
+                matched_rows, unknown_rows = predicate(batch)
+                selected = np.zeros(batch.size, dtype=bool)
+                selected[rows] = True
+                known = (selected & ~unknown_rows).nonzero()[0]
+                for i in known:
+                    matches[int(i)] = bool(matched_rows[i])
+                stats['evaluated'] += len(known)
+                stats['vectorized'] = len(known)
+                stats['matched'] += int(matched_rows[known].sum())
+                # Rows the vector form cannot decide run per question
+                rows = (selected & unknown_rows).nonzero()[0]
+            except Exception as e:
+                logger.warning(f"Vectorized rule {rule.name} failed, evaluating per question: {e}")
+        
+        for i in rows:
+            context = contexts[i]
+            try:
+                matched = bool(check_rule(
+                    context.get('question_text', ''),
+                    context.get('keywords', []),
+                    context.get('marks')
+                ))
+            except Exception as e:
+                stats['errors'] += 1
+                logger.debug(f"Rule {rule.name} failed on question {i}: {e}")
+                continue
+            matches[int(i)] = matched
+            stats['evaluated'] += 1
+            stats['matched'] += matched
+        
+        stats['seconds'] = time.perf_counter() - started
+        return matches, stats
+    
+    def execute_for_subject(
+        self,
+        subject,
+        contexts: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, bool]], Dict[str, Dict[str, Any]]]:
+        """Evaluate all active, validated rules of a subject over a batch of questions."""
+        from .models import ClassificationRule
+        
+        rules = ClassificationRule.objects.filter(
+            subject=subject, is_active=True, is_validated=True
+        ).order_by('-priority', 'name')
+        return self.execute_batch(rules, contexts)
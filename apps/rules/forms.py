@@ -8,7 +8,7 @@ class RuleForm(forms.ModelForm):
     
     class Meta:
         model = ClassificationRule
-        fields = ['name', 'description', 'rule_type', 'natural_language', 'priority', 'is_active']
+        fields = ['name', 'description', 'rule_type', 'natural_language', 'target', 'priority', 'is_active']
         widgets = {
             'name': forms.TextInput(attrs={
                 'class': 'form-input',
@@ -25,6 +25,10 @@ class RuleForm(forms.ModelForm):
                 'rows': 4,
                 'placeholder': 'e.g., "If the question mentions array, linked list, or stack, classify it as Module 1"',
             }),
+            'target': forms.TextInput(attrs={
+                'class': 'form-input',
+                'placeholder': 'e.g., 1 (module), hard (difficulty), apply (Bloom level) or a topic',
+            }),
             'priority': forms.NumberInput(attrs={
                 'class': 'form-input',
                 'min': 0,
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:16
+
+import uuid
+from django.db import migrations, models
+
+
+def mark_validated_rules_compiled(apps, schema_editor):
+    ClassificationRule = apps.get_model("rules", "ClassificationRule")
+    ClassificationRule.objects.filter(is_validated=True).update(
+        compile_status="compiled"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rules", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompiledRuleCache",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("cache_key", models.CharField(max_length=64, unique=True)),
+                ("model_name", models.CharField(max_length=100)),
+                ("rule_type", models.CharField(max_length=20)),
+                ("natural_language", models.TextField()),
+                ("compiled_code", models.TextField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Compiled Rule Cache",
+                "verbose_name_plural": "Compiled Rule Cache",
+            },
+        ),
+        migrations.AddField(
+            model_name="classificationrule",
+            name="compile_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("compiling", "Compiling"),
+                    ("compiled", "Compiled"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(mark_validated_rules_compiled, migrations.RunPython.noop),
+    ]
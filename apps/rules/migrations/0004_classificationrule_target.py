@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:50
+
+import re
+
+from django.db import migrations, models
+
+# How targets were read from a rule's natural language before they were
+# stored explicitly
+MODULE_PATTERN = re.compile(r"\b(?:module|unit)\s*(\d+)", re.IGNORECASE)
+TOPIC_PATTERN = re.compile(r"\btopic\s*(?:is|=|:)?\s*[\"']?([^\"'\n.]+)", re.IGNORECASE)
+DIFFICULTY_WORDS = {
+    "easy": "easy",
+    "simple": "easy",
+    "medium": "medium",
+    "moderate": "medium",
+    "hard": "hard",
+    "difficult": "hard",
+}
+BLOOM_WORDS = {
+    "remember": "remember",
+    "understand": "understand",
+    "apply": "apply",
+    "analyze": "analyze",
+    "analyse": "analyze",
+    "evaluate": "evaluate",
+    "create": "create",
+}
+
+
+def _last_word(text, words):
+    found = ""
+    for match in re.finditer(r"[a-z]+", text.lower()):
+        found = words.get(match.group(0), found)
+    return found
+
+
+def parsed_target(rule):
+    text = rule.natural_language or ""
+    if rule.rule_type == "module":
+        matches = MODULE_PATTERN.findall(text)
+        return matches[-1] if matches else ""
+    if rule.rule_type == "difficulty":
+        return _last_word(text, DIFFICULTY_WORDS)
+    if rule.rule_type == "bloom":
+        return _last_word(text, BLOOM_WORDS)
+    if rule.rule_type == "topic":
+        match = TOPIC_PATTERN.search(text)
+        return (match.group(1).strip() if match else rule.name)[:255]
+    return ""
+
+
+def fill_targets(apps, schema_editor):
+    ClassificationRule = apps.get_model("rules", "ClassificationRule")
+    for rule in ClassificationRule.objects.filter(target=""):
+        rule.target = parsed_target(rule)
+        if rule.target:
+            rule.save(update_fields=["target"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rules", "0003_compile_status_and_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="classificationrule",
+            name="target",
+            field=models.CharField(
+                blank=True,
+                help_text="Module number, difficulty, Bloom level or topic assigned to matching questions",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(fill_targets, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 """
 Classification rule models.
 """
+from django.core.exceptions import ValidationError
 from django.db import models
 from apps.core.models import BaseModel
 
@@ -14,6 +15,12 @@ class ClassificationRule(BaseModel):
         DIFFICULTY = 'difficulty', 'Difficulty Assessment'
         BLOOM = 'bloom', 'Bloom\'s Taxonomy'
     
+    class CompileStatus(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        COMPILING = 'compiling', 'Compiling'
+        COMPILED = 'compiled', 'Compiled'
+        FAILED = 'failed', 'Failed'
+    
     subject = models.ForeignKey(
         'subjects.Subject',
         on_delete=models.CASCADE,
@@ -32,6 +39,13 @@ class ClassificationRule(BaseModel):
         help_text='Define the rule in plain English'
     )
     
+    # What a match assigns, by rule type
+    target = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Module number, difficulty, Bloom level or topic assigned to matching questions'
+    )
+    
     # Compiled Python code (generated by LLM)
     compiled_code = models.TextField(blank=True)
     
@@ -42,6 +56,11 @@ class ClassificationRule(BaseModel):
     is_active = models.BooleanField(default=True)
     is_validated = models.BooleanField(default=False)
     validation_error = models.TextField(blank=True)
+    compile_status = models.CharField(
+        max_length=20,
+        choices=CompileStatus.choices,
+        default=CompileStatus.PENDING
+    )
     
     class Meta:
         verbose_name = 'Classification Rule'
@@ -50,3 +69,63 @@ class ClassificationRule(BaseModel):
     
     def __str__(self):
         return f"{self.name} ({self.get_rule_type_display()})"
+    
+    def clean(self):
+        super().clean()
+        if self.target and self.get_target() is None:
+            raise ValidationError({'target': self._target_hint()})
+    
+    def _target_hint(self):
+        from apps.questions.models import Question
+        
+        if self.rule_type == self.RuleType.MODULE:
+            return 'Enter a module number.'
+        if self.rule_type == self.RuleType.DIFFICULTY:
+            return f"Enter one of: {', '.join(Question.DifficultyLevel.values)}."
+        if self.rule_type == self.RuleType.BLOOM:
+            return f"Enter one of: {', '.join(Question.BloomLevel.values)}."
+        return 'Enter a topic.'
+    
+    def get_target(self):
+        """
+        The question fields a matching rule sets, e.g. {'module_number': 2},
+        or None if the target is missing or invalid for the rule type.
+        """
+        from apps.questions.models import Question
+        
+        value = self.target.strip()
+        if not value:
+            return None
+        
+        if self.rule_type == self.RuleType.MODULE:
+            return {'module_number': int(value)} if value.isdigit() and int(value) > 0 else None
+        if self.rule_type == self.RuleType.DIFFICULTY:
+            value = value.lower()
+            return {'difficulty': value} if value in Question.DifficultyLevel.values else None
+        if self.rule_type == self.RuleType.BLOOM:
+            value = value.lower()
+            return {'bloom_level': value} if value in Question.BloomLevel.values else None
+        if self.rule_type == self.RuleType.TOPIC:
+            return {'topic': value}
+        return None
+
+
+class CompiledRuleCache(BaseModel):
+    """
+    LLM compilation of a rule text, shared by every rule with the same
+    type and natural language (keyed by a hash of both and the model).
+    """
+    
+    cache_key = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=100)
+    rule_type = models.CharField(max_length=20)
+    natural_language = models.TextField()
+    compiled_code = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Compiled Rule Cache'
+        verbose_name_plural = 'Compiled Rule Cache'
+    
+    def __str__(self):
+        return f"{self.rule_type}: {self.natural_language[:50]} ({self.model_name})"
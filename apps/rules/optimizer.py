@@ -0,0 +1,402 @@
+"""
+Static optimizer for compiled rules.
+
+Most generated ``check_rule`` functions are a single boolean expression
+over keyword containment and marks thresholds. Such rules are parsed with
+``ast`` and lowered to numpy operations evaluated over a whole batch of
+questions at once. Anything the optimizer does not recognise returns None
+and is run per question by RuleExecutor instead.
+
+Recognised forms (combined with and/or/not):
+    'x' in question_text.lower()    'x' not in question_text
+    question_text.lower().startswith('x') / endswith('x')
+    'x' in keywords                  marks >= 10, 5 <= marks < 10
+    marks is None / is not None      any(...)/all(...) over literal lists
+
+A lowered predicate returns (matched, unknown) boolean arrays. ``unknown``
+marks rows whose result depends on Python semantics the vector form does
+not reproduce (e.g. ``marks >= 10`` raises for marks=None); the executor
+re-evaluates those rows with the original function.
+"""
+import ast
+import copy
+import logging
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Roles of the check_rule arguments, by position
+TEXT, KEYWORDS, MARKS = 'text', 'keywords', 'marks'
+LOWER_TEXT = 'lower_text'
+
+COMPARE_OPS = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+# Swapped operator when the constant is on the left: 10 <= marks -> marks >= 10
+REVERSED_OPS = {
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+}
+
+Result = Tuple[np.ndarray, np.ndarray]
+VectorPredicate = Callable[['QuestionBatch'], Result]
+
+
+class Unsupported(Exception):
+    """Raised while lowering when a construct has no vector form."""
+
+
+class QuestionBatch:
+    """
+    Column view of a batch of rule contexts, shared by all rules.
+    Columns are built on first use, so an unused batch costs nothing.
+    """
+
+    def __init__(self, contexts: List[Dict[str, Any]]):
+        self.contexts = contexts
+        self.size = len(contexts)
+
+    @cached_property
+    def text(self) -> np.ndarray:
+        return np.array([context.get('question_text') or '' for context in self.contexts], dtype=str)
+
+    @cached_property
+    def lower_text(self) -> np.ndarray:
+        return np.char.lower(self.text)
+
+    @cached_property
+    def marks(self) -> np.ndarray:
+        return np.array(
+            [np.nan if context.get('marks') is None else context['marks'] for context in self.contexts],
+            dtype=np.float64
+        )
+
+    @cached_property
+    def keyword_rows(self) -> Dict[str, List[int]]:
+        """Inverted keyword index: keyword -> row numbers."""
+        rows = {}
+        for i, context in enumerate(self.contexts):
+            for keyword in set(context.get('keywords') or ()):
+                rows.setdefault(keyword, []).append(i)
+        return rows
+
+    def column(self, role: str) -> np.ndarray:
+        return self.lower_text if role == LOWER_TEXT else self.text
+
+    def has_keyword(self, keyword: str) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.keyword_rows.get(keyword, [])] = True
+        return mask
+
+    def falses(self) -> np.ndarray:
+        return np.zeros(self.size, dtype=bool)
+
+
+class _Lowerer:
+    """Turns one check_rule body into a VectorPredicate."""
+
+    def __init__(self, roles: Dict[str, str]):
+        self.roles = dict(roles)
+
+    def lower_function(self, func: ast.FunctionDef) -> VectorPredicate:
+        body = list(func.body)
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+            body = body[1:]  # Docstring
+
+        # Leading aliases: text = question_text.lower()
+        while body and isinstance(body[0], ast.Assign):
+            assign = body.pop(0)
+            if len(assign.targets) != 1 or not isinstance(assign.targets[0], ast.Name):
+                raise Unsupported('assignment')
+            role = self.text_role(assign.value)
+            if role is None:
+                raise Unsupported('assignment value')
+            self.roles[assign.targets[0].id] = role
+
+        # "if cond: return True" chains ending in "return False"
+        conditions = []
+        while body and isinstance(body[0], ast.If):
+            branch = body.pop(0)
+            if branch.orelse or len(branch.body) != 1 or not self.is_return(branch.body[0], True):
+                raise Unsupported('if statement')
+            conditions.append(self.lower(branch.test))
+
+        if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+            raise Unsupported('function body')
+        final = self.lower(body[0].value)
+
+        if not conditions:
+            return final
+        return _short_circuit(conditions + [final], conjunction=False)
+
+    @staticmethod
+    def is_return(node, value) -> bool:
+        return (
+            isinstance(node, ast.Return)
+            and isinstance(node.value, ast.Constant)
+            and node.value.value is value
+        )
+
+    def text_role(self, node) -> Optional[str]:
+        """TEXT or LOWER_TEXT if the node is the question text, else None."""
+        if isinstance(node, ast.Name) and self.roles.get(node.id) in (TEXT, LOWER_TEXT):
+            return self.roles[node.id]
+        if (
+            isinstance(node, ast.Call) and not node.args and not node.keywords
+            and isinstance(node.func, ast.Attribute) and node.func.attr == 'lower'
+            and self.text_role(node.func.value) is not None
+        ):
+            return LOWER_TEXT
+        return None
+
+    def role(self, node) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return self.roles.get(node.id)
+        return self.text_role(node)
+
+    def lower(self, node) -> VectorPredicate:
+        if isinstance(node, ast.BoolOp):
+            parts = [self.lower(value) for value in node.values]
+            return _short_circuit(parts, conjunction=isinstance(node.op, ast.And))
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = self.lower(node.operand)
+
+            def predicate(batch):
+                matched, unknown = operand(batch)
+                return ~matched, unknown
+            return predicate
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, bool):
+            value = node.value
+            return lambda batch: (np.full(batch.size, value), batch.falses())
+
+        if isinstance(node, ast.Compare):
+            return self.lower_compare(node)
+
+        if isinstance(node, ast.Call):
+            return self.lower_call(node)
+
+        raise Unsupported(type(node).__name__)
+
+    def lower_compare(self, node: ast.Compare) -> VectorPredicate:
+        if len(node.ops) > 1:
+            # 5 <= marks < 10 -> (5 <= marks) and (marks < 10)
+            operands = [node.left] + node.comparators
+            pairs = [
+                ast.Compare(left=operands[i], ops=[op], comparators=[operands[i + 1]])
+                for i, op in enumerate(node.ops)
+            ]
+            return self.lower(ast.BoolOp(op=ast.And(), values=pairs))
+
+        left, op, right = node.left, node.ops[0], node.comparators[0]
+
+        if isinstance(op, (ast.In, ast.NotIn)):
+            predicate = self.lower_contains(left, right)
+            if isinstance(op, ast.NotIn):
+                return lambda batch: (~predicate(batch)[0], batch.falses())
+            return predicate
+
+        if isinstance(op, (ast.Is, ast.IsNot)):
+            if self.role(left) == MARKS and isinstance(right, ast.Constant) and right.value is None:
+                negate = isinstance(op, ast.IsNot)
+                return lambda batch: (np.isnan(batch.marks) != negate, batch.falses())
+            raise Unsupported('is')
+
+        if type(op) in COMPARE_OPS:
+            if self.role(right) == MARKS and self.number(left) is not None:
+                left, right, op = right, left, REVERSED_OPS[type(op)]()
+            threshold = self.number(right)
+            if self.role(left) != MARKS or threshold is None:
+                raise Unsupported('comparison')
+            compare = COMPARE_OPS[type(op)]
+            ordering = not isinstance(op, (ast.Eq, ast.NotEq))
+
+            def predicate(batch):
+                missing = np.isnan(batch.marks)
+                with np.errstate(invalid='ignore'):
+                    matched = compare(batch.marks, threshold) & ~missing
+                if isinstance(op, ast.NotEq):
+                    matched |= missing  # None != 10 is True
+                # None >= 10 raises in Python; let the executor decide
+                return matched, missing if ordering else batch.falses()
+            return predicate
+
+        raise Unsupported('comparison')
+
+    def lower_contains(self, needle, haystack) -> VectorPredicate:
+        text = self.text_role(haystack)
+        value = self.string(needle)
+        if text is not None and value is not None:
+            return lambda batch: (np.char.find(batch.column(text), value) >= 0, batch.falses())
+        if self.role(haystack) == KEYWORDS and value is not None:
+            return lambda batch: (batch.has_keyword(value), batch.falses())
+        raise Unsupported('in')
+
+    def lower_call(self, node: ast.Call) -> VectorPredicate:
+        func = node.func
+
+        # question_text.lower().startswith('x')
+        if isinstance(func, ast.Attribute) and func.attr in ('startswith', 'endswith'):
+            text = self.text_role(func.value)
+            value = self.string(node.args[0]) if len(node.args) == 1 else None
+            if text is None or value is None or node.keywords:
+                raise Unsupported(func.attr)
+            method = np.char.startswith if func.attr == 'startswith' else np.char.endswith
+            return lambda batch: (method(batch.column(text), value), batch.falses())
+
+        # bool(expr)
+        if isinstance(func, ast.Name) and func.id == 'bool' and len(node.args) == 1 and not node.keywords:
+            return self.lower(node.args[0])
+
+        # any(... for x in [literals]) / all(...)
+        if (
+            isinstance(func, ast.Name) and func.id in ('any', 'all')
+            and len(node.args) == 1 and not node.keywords
+            and isinstance(node.args[0], (ast.GeneratorExp, ast.ListComp))
+        ):
+            return self.lower_quantifier(func.id, node.args[0])
+
+        raise Unsupported('call')
+
+    def lower_quantifier(self, name: str, generator) -> VectorPredicate:
+        if len(generator.generators) != 1:
+            raise Unsupported('nested comprehension')
+        comprehension = generator.generators[0]
+        if comprehension.ifs or comprehension.is_async or not isinstance(comprehension.target, ast.Name):
+            raise Unsupported('comprehension')
+        variable = comprehension.target.id
+
+        # any(k in ('a', 'b') for k in keywords) -> any keyword from the list
+        if self.role(comprehension.iter) == KEYWORDS:
+            elt = generator.elt
+            if (
+                name == 'any' and isinstance(elt, ast.Compare) and len(elt.ops) == 1
+                and isinstance(elt.ops[0], ast.In)
+                and isinstance(elt.left, ast.Name) and elt.left.id == variable
+            ):
+                values = self.strings(elt.comparators[0])
+                if values is not None:
+                    def predicate(batch):
+                        matched = batch.falses()
+                        for value in values:
+                            matched |= batch.has_keyword(value)
+                        return matched, batch.falses()
+                    return predicate
+            raise Unsupported('keyword comprehension')
+
+        # any(w in question_text.lower() for w in ['a', 'b'])
+        values = self.strings(comprehension.iter)
+        if values is None:
+            raise Unsupported('comprehension source')
+
+        parts = [
+            self.lower(_Substitute(variable, value).visit(copy.deepcopy(generator.elt)))
+            for value in values
+        ]
+        if not parts:
+            return lambda batch: (np.full(batch.size, name == 'all'), batch.falses())
+        return _short_circuit(parts, conjunction=name == 'all')
+
+    @staticmethod
+    def string(node) -> Optional[str]:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        return None
+
+    def strings(self, node) -> Optional[List[str]]:
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            values = [self.string(element) for element in node.elts]
+            if all(value is not None for value in values):
+                return values
+        return None
+
+    @staticmethod
+    def number(node) -> Optional[float]:
+        if (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool)
+        ):
+            return float(node.value)
+        return None
+
+
+class _Substitute(ast.NodeTransformer):
+    """Replace a comprehension variable with a string constant."""
+
+    def __init__(self, name: str, value: str):
+        self.name = name
+        self.value = value
+
+    def visit_Name(self, node):
+        if node.id == self.name:
+            return ast.copy_location(ast.Constant(value=self.value), node)
+        return node
+
+
+def _short_circuit(parts: List[VectorPredicate], conjunction: bool) -> VectorPredicate:
+    """
+    and/or over lowered parts. A row is unknown only if a part Python would
+    actually evaluate for it (given short-circuiting) is unknown.
+    """
+    combine = np.logical_and if conjunction else np.logical_or
+
+    def predicate(batch):
+        matched, unknown = parts[0](batch)
+        live = ~unknown & (matched if conjunction else ~matched)
+        for part in parts[1:]:
+            part_matched, part_unknown = part(batch)
+            unknown = unknown | (live & part_unknown)
+            matched = combine(matched, part_matched)
+            live &= ~part_unknown & (part_matched if conjunction else ~part_matched)
+        return matched, unknown
+    return predicate
+
+
+def lower_rule(code: str) -> Optional[VectorPredicate]:
+    """
+    Lower a rule's check_rule function to a batch predicate.
+
+    Returns:
+        Callable taking a QuestionBatch, or None if the rule must run per question
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    functions = [
+        node for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name == 'check_rule'
+    ]
+    if len(functions) != 1 or len(tree.body) != 1:
+        return None
+    func = functions[0]
+
+    args = func.args
+    if args.vararg or args.kwarg or args.kwonlyargs or args.posonlyargs or len(args.args) != 3:
+        return None
+    roles = {arg.arg: role for arg, role in zip(args.args, (TEXT, KEYWORDS, MARKS))}
+
+    try:
+        return _Lowerer(roles).lower_function(func)
+    except Unsupported as e:
+        logger.debug(f"Rule not vectorized: {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"Rule optimizer failed: {e}")
+        return None
@@ -0,0 +1,15 @@
+"""
+Signal handlers for classification rules.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .executor import invalidate_rule
+from .models import ClassificationRule
+
+
+@receiver(post_save, sender=ClassificationRule)
+@receiver(post_delete, sender=ClassificationRule)
+def invalidate_compiled_rule(sender, instance, **kwargs):
+    """Forget the cached compilation of a rule when it changes or is deleted."""
+    invalidate_rule(instance.pk)
@@ -0,0 +1,109 @@
+"""
+Rule application stage for the analysis pipeline.
+
+A subject's active, validated rules are grouped by rule type and tried in
+priority order; within a type the first matching rule wins and the rest
+are skipped. What a match assigns (module number, difficulty, Bloom level
+or topic) is the rule's explicit target.
+"""
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .executor import RuleExecutor
+from .models import ClassificationRule
+from .optimizer import QuestionBatch
+
+logger = logging.getLogger(__name__)
+
+STOP_WORDS = frozenset("""
+a an and are as at be by can do does for from give how in is it its of on or
+the their this to was what when where which why with write your you explain
+describe discuss define marks mark question questions briefly detail
+""".split())
+
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9\-]+')
+
+
+def extract_keywords(text: str) -> List[str]:
+    """Lowercased content words of a question, unique and in order."""
+    seen = OrderedDict()
+    for word in WORD_PATTERN.findall(text.lower()):
+        if len(word) > 2 and word not in STOP_WORDS:
+            seen.setdefault(word, None)
+    return list(seen)
+
+
+class RuleStage:
+    """Applies a subject's classification rules to extracted questions."""
+
+    def __init__(self, executor: Optional[RuleExecutor] = None):
+        self.executor = executor or RuleExecutor()
+
+    def load_rules(self, subject) -> Dict[str, List]:
+        """
+        Active, validated rules of the subject grouped by type, highest
+        priority first, paired with their targets.
+        """
+        rules = ClassificationRule.objects.filter(
+            subject=subject, is_active=True, is_validated=True
+        ).order_by('-priority', 'name')
+
+        grouped = OrderedDict()
+        for rule in rules:
+            target = rule.get_target()
+            if target is None:
+                logger.warning(f"Rule {rule.name}: no valid target set, skipped")
+                continue
+            grouped.setdefault(rule.rule_type, []).append((rule, target))
+        return grouped
+
+    def apply(self, subject, questions_data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Evaluate rules for every question and apply the first match per type.
+
+        The questions are put into one QuestionBatch shared by all rules;
+        each rule is evaluated over the rows no higher-priority rule of its
+        type has matched. Keywords the questions lack are extracted for
+        the rules only and not stored on the question data.
+
+        Returns:
+            Number of questions changed per rule type
+        """
+        grouped = self.load_rules(subject)
+        if not grouped:
+            return {}
+        applied = {rule_type: 0 for rule_type in grouped}
+
+        contexts = [
+            {
+                'question_text': q_data.get('text', ''),
+                'keywords': q_data.get('keywords') or extract_keywords(q_data.get('text', '')),
+                'marks': q_data.get('marks'),
+            }
+            for q_data in questions_data
+        ]
+        batch = QuestionBatch(contexts)
+
+        for rule_type, rules in grouped.items():
+            # Questions no rule of this type has matched yet
+            remaining = list(range(len(questions_data)))
+            for rule, target in rules:
+                if not remaining:
+                    break  # Lower-priority rules of this type are skipped
+                matches, _ = self.executor.evaluate_rule(rule, contexts, remaining, batch)
+                unmatched = []
+                for i in remaining:
+                    if matches.get(i):
+                        q_data = questions_data[i]
+                        q_data.update(target)
+                        if 'topic' in target:
+                            q_data['topics'] = [target['topic']]
+                        applied[rule_type] += 1
+                    else:
+                        unmatched.append(i)
+                remaining = unmatched
+
+        logger.info(f"Rules applied for {subject}: {applied}")
+        return applied
@@ -0,0 +1,92 @@
+"""
+Background tasks for rule compilation using Django-Q.
+"""
+import logging
+
+from django_q.tasks import async_task
+
+from .compiler import RuleCompiler
+from .executor import invalidate_rule
+from .models import ClassificationRule
+
+logger = logging.getLogger(__name__)
+
+
+def compile_rules(rules) -> dict:
+    """
+    Compile rules and store the results on them.
+
+    A result is only written if the rule's text and type are unchanged
+    since compilation started, so an edit made meanwhile is not
+    overwritten with code for the old text.
+
+    Returns:
+        Counts of compiled and failed rules
+    """
+    rules = list(rules)
+    if not rules:
+        return {'compiled': 0, 'failed': 0}
+
+    ClassificationRule.objects.filter(
+        id__in=[rule.id for rule in rules]
+    ).update(compile_status=ClassificationRule.CompileStatus.COMPILING)
+
+    outcomes = RuleCompiler().compile_many(rules)
+
+    counts = {'compiled': 0, 'failed': 0}
+    for rule in rules:
+        success, code, error = outcomes[str(rule.id)]
+        status = (
+            ClassificationRule.CompileStatus.COMPILED if success
+            else ClassificationRule.CompileStatus.FAILED
+        )
+        ClassificationRule.objects.filter(
+            id=rule.id,
+            natural_language=rule.natural_language,
+            rule_type=rule.rule_type
+        ).update(
+            compiled_code=code,
+            is_validated=success,
+            validation_error=error or '',
+            compile_status=status
+        )
+        invalidate_rule(rule.id)
+        counts['compiled' if success else 'failed'] += 1
+
+    logger.info(f"Rule compilation finished: {counts}")
+    return counts
+
+
+def compile_rule_task(rule_id: str):
+    """Background task to compile a single rule."""
+    try:
+        rule = ClassificationRule.objects.get(id=rule_id)
+    except ClassificationRule.DoesNotExist:
+        return {'compiled': 0, 'failed': 0}
+    return compile_rules([rule])
+
+
+def compile_subject_rules_task(subject_id: str):
+    """Background task to compile every rule of a subject that is not compiled yet."""
+    rules = ClassificationRule.objects.filter(subject_id=subject_id).exclude(
+        compile_status=ClassificationRule.CompileStatus.COMPILED
+    )
+    return compile_rules(rules)
+
+
+def queue_rule_compilation(rule: ClassificationRule):
+    """Queue a rule for background compilation."""
+    async_task(
+        'apps.rules.tasks.compile_rule_task',
+        str(rule.id),
+        task_name=f'compile_rule_{rule.id}'
+    )
+
+
+def queue_subject_compilation(subject):
+    """Queue compilation of all of a subject's uncompiled rules."""
+    async_task(
+        'apps.rules.tasks.compile_subject_rules_task',
+        str(subject.id),
+        task_name=f'compile_rules_{subject.id}'
+    )
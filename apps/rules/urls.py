@@ -7,6 +7,8 @@ app_name = 'rules'
 urlpatterns = [
     path('subject/<uuid:subject_pk>/', views.RuleListView.as_view(), name='list'),
     path('subject/<uuid:subject_pk>/create/', views.RuleCreateView.as_view(), name='create'),
+    path('subject/<uuid:subject_pk>/compile/', views.RuleCompileAllView.as_view(), name='compile_all'),
+    path('subject/<uuid:subject_pk>/compile/status/', views.RuleCompileStatusView.as_view(), name='compile_status'),
     path('<uuid:pk>/edit/', views.RuleUpdateView.as_view(), name='update'),
     path('<uuid:pk>/delete/', views.RuleDeleteView.as_view(), name='delete'),
 ]
@@ -1,13 +1,16 @@
 """Views for rule management."""
+from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.shortcuts import get_object_or_404
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect
 
 from apps.subjects.models import Subject
 from .models import ClassificationRule
 from .forms import RuleForm
+from .tasks import queue_rule_compilation, queue_subject_compilation
 
 
 class RuleListView(LoginRequiredMixin, ListView):
@@ -26,6 +29,14 @@ class RuleListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['subject'] = self.subject
+        context['compiling'] = any(
+            rule.compile_status in (
+                ClassificationRule.CompileStatus.PENDING,
+                ClassificationRule.CompileStatus.COMPILING,
+            )
+            for rule in context['rules']
+        )
+        context['create_url'] = reverse_lazy('rules:create', kwargs={'subject_pk': self.subject.pk})
         return context
 
 
@@ -52,8 +63,10 @@ class RuleCreateView(LoginRequiredMixin, CreateView):
     
     def form_valid(self, form):
         form.instance.subject = self.subject
-        messages.success(self.request, f'Rule "{form.instance.name}" created!')
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        queue_rule_compilation(self.object)
+        messages.success(self.request, f'Rule "{form.instance.name}" created! Compiling in the background.')
+        return response
 
 
 class RuleUpdateView(LoginRequiredMixin, UpdateView):
@@ -75,11 +88,17 @@ class RuleUpdateView(LoginRequiredMixin, UpdateView):
         return reverse_lazy('rules:list', kwargs={'subject_pk': self.object.subject.pk})
     
     def form_valid(self, form):
-        # Reset validation when rule is updated
-        form.instance.is_validated = False
-        form.instance.compiled_code = ''
+        recompile = bool({'natural_language', 'rule_type'} & set(form.changed_data))
+        if recompile:
+            # Reset validation when the rule definition changes
+            form.instance.is_validated = False
+            form.instance.compiled_code = ''
+            form.instance.compile_status = ClassificationRule.CompileStatus.PENDING
+        response = super().form_valid(form)
+        if recompile:
+            queue_rule_compilation(self.object)
         messages.success(self.request, f'Rule "{form.instance.name}" updated!')
-        return super().form_valid(form)
+        return response
 
 
 class RuleDeleteView(LoginRequiredMixin, DeleteView):
@@ -97,3 +116,46 @@ class RuleDeleteView(LoginRequiredMixin, DeleteView):
     def form_valid(self, form):
         messages.success(self.request, f'Rule "{self.object.name}" deleted.')
         return super().form_valid(form)
+
+
+class RuleCompileAllView(LoginRequiredMixin, View):
+    """Queue background compilation of every uncompiled rule of a subject."""
+    
+    def post(self, request, subject_pk):
+        subject = get_object_or_404(Subject, pk=subject_pk, user=request.user)
+        
+        rules = ClassificationRule.objects.filter(subject=subject).exclude(
+            compile_status=ClassificationRule.CompileStatus.COMPILED
+        )
+        count = rules.update(compile_status=ClassificationRule.CompileStatus.PENDING)
+        if count:
+            queue_subject_compilation(subject)
+            messages.success(request, f'Compiling {count} rule(s) in the background.')
+        else:
+            messages.info(request, 'All rules are already compiled.')
+        
+        return redirect('rules:list', subject_pk=subject.pk)
+
+
+class RuleCompileStatusView(LoginRequiredMixin, View):
+    """Compile status of a subject's rules (for HTMX polling)."""
+    
+    def get(self, request, subject_pk):
+        subject = get_object_or_404(Subject, pk=subject_pk, user=request.user)
+        
+        rules = list(
+            ClassificationRule.objects.filter(subject=subject).values(
+                'id', 'name', 'compile_status', 'is_validated', 'validation_error'
+            )
+        )
+        for rule in rules:
+            rule['id'] = str(rule['id'])
+        
+        in_progress = (
+            ClassificationRule.CompileStatus.PENDING,
+            ClassificationRule.CompileStatus.COMPILING,
+        )
+        return JsonResponse({
+            'rules': rules,
+            'done': not any(rule['compile_status'] in in_progress for rule in rules),
+        })
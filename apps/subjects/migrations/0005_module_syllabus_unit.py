@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subjects", "0004_add_university_type_and_public_access"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="module",
+            name="syllabus_embedding",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="syllabus_text",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="subject",
+            name="syllabus_hash",
+            field=models.CharField(
+                blank=True,
+                help_text="SHA-256 of the syllabus file the modules were built from",
+                max_length=64,
+            ),
+        ),
+    ]
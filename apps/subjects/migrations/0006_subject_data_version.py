@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subjects", "0005_module_syllabus_unit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subject",
+            name="data_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="subject",
+            name="data_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
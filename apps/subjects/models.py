@@ -43,6 +43,11 @@ class Subject(SoftDeleteModel):
         blank=True,
         help_text='Extracted syllabus text for semantic matching'
     )
+    syllabus_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text='SHA-256 of the syllabus file the modules were built from'
+    )
     
     # Additional metadata
     university = models.CharField(max_length=255, blank=True)
@@ -52,6 +57,11 @@ class Subject(SoftDeleteModel):
     # Settings stored as JSON
     settings = models.JSONField(default=dict, blank=True)
     
+    # Bumped whenever the subject's questions or topic clusters change;
+    # analytics caches and ETags are keyed by it
+    data_version = models.PositiveIntegerField(default=0)
+    data_updated_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         verbose_name = 'Subject'
         verbose_name_plural = 'Subjects'
@@ -93,6 +103,10 @@ class Module(SoftDeleteModel):
     keywords = models.JSONField(default=list, blank=True)
     # Example: ["keyword1", "keyword2"]
     
+    # Syllabus unit for this module and its embedding (for AI classification)
+    syllabus_text = models.TextField(blank=True)
+    syllabus_embedding = models.JSONField(null=True, blank=True)
+    
     # Weightage (for analysis)
     weightage = models.DecimalField(
         max_digits=5,
@@ -7,11 +7,32 @@ from django.urls import reverse_lazy
 from django.contrib import messages
 from django.shortcuts import get_object_or_404
 
+from apps.analytics.versioning import bump_data_version
 from apps.core.mixins import OwnerRequiredMixin, HTMXResponseMixin
 from .models import Subject, Module
 from .forms import SubjectForm, ModuleForm
 
 
+def refresh_syllabus(request, subject):
+    """
+    Drop the syllabus units stored on the modules and, if the subject still
+    has a syllabus, queue it to be parsed and embedded again.
+    """
+    subject.modules.update(syllabus_text='', syllabus_embedding=None)
+    bump_data_version(subject.pk)  # Queryset updates send no signals
+    subject.syllabus_hash = ''
+    if not subject.syllabus_file:
+        subject.syllabus_text = ''
+    subject.save(update_fields=['syllabus_hash', 'syllabus_text', 'updated_at'])
+    
+    if subject.syllabus_file:
+        try:
+            from apps.analysis.tasks import queue_syllabus_processing
+            queue_syllabus_processing(subject)
+        except Exception as e:
+            messages.warning(request, f'Syllabus could not be queued for processing: {str(e)}')
+
+
 class SubjectListView(LoginRequiredMixin, ListView):
     """List all subjects for the current user."""
     
@@ -45,6 +66,16 @@ class SubjectDetailView(OwnerRequiredMixin, DetailView):
         context['questions_count'] = sum(p.get_question_count() for p in papers)
         # Check if any papers are being processed
         context['has_processing'] = context['papers_pending'] > 0 or context['papers_processing'] > 0
+        if context['has_processing']:
+            # Polled through AnalysisStatusView when EventSource is unavailable
+            from apps.analysis.models import AnalysisJob
+            context['active_job_ids'] = [
+                str(job_id) for job_id in AnalysisJob.objects.filter(
+                    paper__subject=self.object
+                ).exclude(
+                    status__in=[AnalysisJob.Status.COMPLETED, AnalysisJob.Status.FAILED]
+                ).values_list('id', flat=True)
+            ]
         return context
 
 
@@ -61,7 +92,10 @@ class SubjectCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.user = self.request.user
         messages.success(self.request, f'Subject "{form.instance.name}" created successfully!')
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if self.object.syllabus_file:
+            refresh_syllabus(self.request, self.object)
+        return response
 
 
 class SubjectUpdateView(OwnerRequiredMixin, UpdateView):
@@ -79,7 +113,10 @@ class SubjectUpdateView(OwnerRequiredMixin, UpdateView):
     
     def form_valid(self, form):
         messages.success(self.request, f'Subject "{form.instance.name}" updated successfully!')
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if 'syllabus_file' in form.changed_data:
+            refresh_syllabus(self.request, self.object)
+        return response
 
 
 class SubjectDeleteView(OwnerRequiredMixin, DeleteView):
@@ -139,13 +139,41 @@ Q_CLUSTER = {
     'cpu_affinity': 1,
     'label': 'Django Q2',
     'orm': 'default',
+    'daemonize_workers': False,  # Lets OCR use a process pool inside workers
 }
 
+# Analysis progress stream (server-sent events)
+ANALYSIS_STREAM_POLL_INTERVAL = 1.0  # Seconds between event lookups
+ANALYSIS_STREAM_MAX_DURATION = 25  # Close and let the browser resume after this
+ANALYSIS_STREAM_HEARTBEAT = 10  # Keep-alive comment interval
+ANALYSIS_EVENT_RETENTION = 3600  # Seconds finished jobs' events are kept
+
+# Load the embedding model when a Django-Q worker spawns instead of on first task
+ANALYSIS_WARM_EMBEDDINGS = True
+
+# OCR for scanned papers (pages without a text layer)
+ANALYSIS_OCR_LANGUAGE = 'eng'
+ANALYSIS_OCR_WORKERS = None  # Process pool size per Django-Q worker, defaults to cores / Q_CLUSTER workers
+ANALYSIS_OCR_MIN_PAGE_CHARS = 20  # Pages with less text than this are OCRed
+ANALYSIS_OCR_MIN_DPI = 150
+ANALYSIS_OCR_MAX_DPI = 300
+
+# Cache (process-local; FileBasedCache also works without extra services)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pyq-analyzer',
+    }
+}
+ANALYTICS_CACHE_TIMEOUT = 24 * 60 * 60  # Keys include the subject data version
+REPORTS_RENDER_TIMEOUT = 10 * 60  # Seconds before an unfinished module report render is queued again
+
 # Ollama Configuration (Local LLM)
 OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
 OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'llama3.2:3b')
 # Supported models: tinyllama, llama3.2:3b, llama3.1:3b, phi3
 OLLAMA_TIMEOUT = int(os.environ.get('OLLAMA_TIMEOUT', '120'))
+RULES_COMPILE_CONCURRENCY = 2  # Concurrent LLM requests when compiling rules in bulk
 
 # Embedding Model Configuration
 EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
@@ -162,7 +190,9 @@ UNIVERSAL_EXAM_ANALYZER = {
 }
 
 # File Upload Settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB for PDFs
+# Uploads stream to a temp file on disk and are hashed on the way in
+FILE_UPLOAD_HANDLERS = ['apps.papers.upload_handlers.HashingTemporaryFileUploadHandler']
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB, Django default (no PDF is kept in memory)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
 
 # Logging Configuration
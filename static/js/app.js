@@ -38,6 +38,121 @@ document.body.addEventListener('htmx:configRequest', function(evt) {
     }
 });
 
+// Live analysis progress over server-sent events, falling back to polling
+// each job's status. statusUrl is the status URL of a placeholder job id.
+const JOB_ID_PLACEHOLDER = '00000000-0000-0000-0000-000000000000';
+
+function analysisProgressStream(url, statusUrl, jobIds = [], pollInterval = 5000) {
+    return {
+        source: null,
+        refreshInterval: null,
+        jobIds: new Set(jobIds),
+        message: 'Waiting for progress updates...',
+
+        start() {
+            if (!window.EventSource) {
+                this.poll();
+                return;
+            }
+            this.source = new EventSource(url);
+            this.source.addEventListener('progress', (e) => {
+                const job = JSON.parse(e.data);
+                this.jobIds.add(job.job_id);
+                this.showJob(job);
+            });
+            this.source.addEventListener('done', () => {
+                this.source.close();
+                window.location.reload();
+            });
+            this.source.onerror = () => {
+                // EventSource retries on its own; only give up once it has closed
+                if (this.source.readyState === EventSource.CLOSED) {
+                    this.poll();
+                }
+            };
+        },
+
+        showJob(job) {
+            this.message = `${job.paper_title}: ${job.status_display} (${job.progress}%)`;
+        },
+
+        poll() {
+            this.message = `Checking progress every ${pollInterval / 1000} seconds...`;
+            this.refreshInterval = setInterval(() => this.checkJobs(), pollInterval);
+        },
+
+        async checkJobs() {
+            // Jobs are created by the queued task; reload to pick them up
+            if (!this.jobIds.size) {
+                window.location.reload();
+                return;
+            }
+            const jobs = await Promise.all([...this.jobIds].map((id) =>
+                fetch(statusUrl.replace(JOB_ID_PLACEHOLDER, id))
+                    .then((response) => response.ok ? response.json() : null)
+                    .catch(() => null)
+            ));
+            const running = jobs.filter((job) => job && job.status !== 'completed' && job.status !== 'failed');
+            if (running.length) {
+                this.showJob(running[0]);
+            } else {
+                this.stop();
+                window.location.reload();
+            }
+        },
+
+        stop() {
+            if (this.source) {
+                this.source.close();
+            }
+            clearInterval(this.refreshInterval);
+        }
+    };
+}
+
+// Compile status of a subject's rules, polled while any are still compiling
+const RULE_COMPILE_LABELS = {
+    pending: 'Pending',
+    compiling: 'Compiling',
+    compiled: 'Compiled',
+    failed: 'Failed'
+};
+
+function ruleCompileStatus(statusUrl, compiling = false, pollInterval = 3000) {
+    return {
+        refreshInterval: null,
+        compiling: compiling,
+        rules: {},
+
+        start() {
+            if (this.compiling) {
+                this.refreshInterval = setInterval(() => this.check(), pollInterval);
+            }
+        },
+
+        async check() {
+            const response = await fetch(statusUrl).catch(() => null);
+            if (!response || !response.ok) {
+                return;
+            }
+            const data = await response.json();
+            this.rules = Object.fromEntries(data.rules.map((rule) => [rule.id, rule]));
+            if (data.done) {
+                this.compiling = false;
+                clearInterval(this.refreshInterval);
+            }
+        },
+
+        status(id, initial) {
+            return this.rules[id] ? this.rules[id].compile_status : initial;
+        },
+
+        label(id, initial) {
+            return RULE_COMPILE_LABELS[this.status(id, initial)];
+        }
+    };
+}
+
 // Configuration constants
 const SCROLL_REVEAL_CONFIG = {
     threshold: 0.1,